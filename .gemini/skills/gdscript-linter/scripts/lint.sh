@@ -7,22 +7,14 @@ if [ -z "$FILE_PATH" ]; then
   exit 1
 fi
 
-# Resolve res://
-if [[ "$FILE_PATH" == res://* ]]; then
-  FILE_PATH="${FILE_PATH#res://}"
-fi
-
-if [ ! -f "$FILE_PATH" ]; then
-  # Try looking in subdirs
-  if [ -f "godot-gemini-plugin/$FILE_PATH" ]; then
-    FILE_PATH="godot-gemini-plugin/$FILE_PATH"
-  elif [ -f "../$FILE_PATH" ]; then
-     FILE_PATH="../$FILE_PATH"
-  else
-     echo "Error: File $FILE_PATH not found."
-     exit 1
-  fi
+# Resolve res:// and uid:// (also looks in the project root and the godot-gemini-plugin/ checkout)
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+RESOLVED="$(python3 "$SCRIPT_DIR/../../godot-project-manager/scripts/project_paths.py" resolve "$FILE_PATH" 2>/dev/null)"
+if [ $? -ne 0 ] || [ ! -f "$RESOLVED" ]; then
+  echo "Error: File $FILE_PATH not found."
+  exit 1
 fi
+FILE_PATH="$RESOLVED"
 
 # Check for gdlint
 if command -v gdlint &> /dev/null; then
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Godot Export Reachability - What an export actually needs, and what it ships for nothing.
+
+Usage:
+  export_reachability.py [--project <dir>] [--keep GLOB ...] [--top N] [--json]
+  export_reachability.py --exclude-filter [--preset NAME] [--project <dir>] [--keep GLOB ...]
+
+Starts from every res:// and uid:// path in project.godot (run/main_scene, the
+autoloads, the icon, themes, translations, ...) and follows references:
+[ext_resource]s, preload()/load() and shader #includes from resource_graph.py's
+index; every "res://..." string in scenes, resources, scripts and shaders, so
+change_scene_to_file() targets and exported path properties count too; and
+class_name identifiers used by scripts. Paths built at runtime
+("res://levels/%d.tscn") and directory paths become globs over the project's
+files. Anything loaded in ways this can't see has to be kept with --keep.
+
+Sizes are export sizes: for imported assets, the files under .godot/imported/
+(when the project has been imported), otherwise the file itself. Scenes are
+ranked by retained size, the bytes that would leave the export together with
+the scene because nothing else reaches them (its dominator subtree).
+
+--exclude-filter prints an exclude_filter for export_presets.cfg that covers the
+unused assets, collapsing directories with nothing reachable into "dir/*". With
+--preset it is written into that preset instead, together with the preset's own
+filters, except those that match a reachable file.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-project-manager', 'scripts'))
+import project_paths  # noqa: E402
+import skill_trace  # noqa: E402
+import variant  # noqa: E402
+from manage_project import ProjectDocument  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-scene-inspector', 'scripts'))
+from resource_graph import ResourceGraph, from_res_path, normalize_ref  # noqa: E402
+
+PRESETS_FILENAME = 'export_presets.cfg'
+# Loaded by the engine without being named in project.godot
+DEFAULT_BUS_LAYOUT = 'res://default_bus_layout.tres'
+# Exported by the "all_resources" filter besides imported assets (those with a .import file)
+RESOURCE_EXTENSIONS = ('.tscn', '.scn', '.tres', '.res', '.gd', '.gdshader', '.gdshaderinc')
+TEXT_EXTENSIONS = ('.tscn', '.tres', '.gd', '.gdshader', '.gdshaderinc')
+SCENE_EXTENSIONS = ('.tscn', '.scn')
+
+PATH_STRING = re.compile(rb'"((?:res|uid)://[^"\n]*)"')
+CLASS_NAME = re.compile(rb'^\s*class_name\s+(\w+)', re.MULTILINE)
+IDENTIFIER = re.compile(rb'[A-Za-z_]\w*')
+DEST_FILES = re.compile(r'^dest_files\s*=\s*(.+)$', re.MULTILINE)
+# Parts of a path filled in at runtime: "%s"/"%02d" formats and "{name}" placeholders
+PLACEHOLDER = re.compile(r'%[-+ #0-9.]*[a-zA-Z]|\{[^}]*\}')
+
+
+def _strings(value):
+    """Every string inside a decoded Variant value."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+    elif isinstance(value, dict):
+        for pair in value.items():
+            yield from _strings(pair)
+    elif isinstance(value, variant.PackedArray):
+        yield from _strings(value.values)
+    elif isinstance(value, variant.Call):
+        yield from _strings(value.args)
+    elif isinstance(value, variant.GodotObject):
+        yield from _strings(value.properties)
+
+
+def project_roots(doc):
+    """[(setting, res:// or uid:// path)] for every path in the project's settings."""
+    roots = []
+    for key in doc.keys():
+        raw = doc.get_raw(key)
+        if 'res://' not in raw and 'uid://' not in raw:
+            continue
+        try:
+            value = doc.get_value(key)
+        except variant.VariantError:
+            continue
+        for text in _strings(value):
+            text = text.lstrip('*')  # autoload singletons
+            if text.startswith(('res://', 'uid://')):
+                roots.append((key, text))
+    return roots
+
+
+def glob_pattern(glob):
+    """Compiled matcher for a Godot filter glob ('*' and '?', any case, '*' spans '/')."""
+    return re.compile('.*'.join('.'.join(re.escape(p) for p in part.split('?'))
+                                for part in glob.split('*')), re.IGNORECASE)
+
+
+def filter_matches(pattern, res_path):
+    """Whether an export filter matches a file, tried like Godot: with and without res://."""
+    return bool(pattern.fullmatch(res_path) or pattern.fullmatch(res_path[len('res://'):]))
+
+
+def retained_sizes(roots, edges, sizes):
+    """
+    {file: bytes} of each file plus every file only reachable through it, from
+    the dominator tree of the graph below `roots` (Cooper, Harvey & Kennedy).
+    """
+    top = ''  # a virtual root above the real ones
+    order = []
+    visited = {top}
+    stack = [(top, iter(roots))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if child not in visited:
+                visited.add(child)
+                stack.append((child, iter(edges.get(child, ()))))
+                break
+        else:
+            stack.pop()
+            order.append(node)
+    order.reverse()
+    rank = {node: i for i, node in enumerate(order)}
+    preds = {node: [] for node in order}
+    for node in order:
+        for child in (roots if node == top else edges.get(node, ())):
+            preds[child].append(node)
+
+    idom = {top: top}
+    changed = True
+    while changed:
+        changed = False
+        for node in order[1:]:
+            new = None
+            for pred in preds[node]:
+                if pred in idom:
+                    new = pred if new is None else _intersect(pred, new, idom, rank)
+            if idom.get(node) != new:
+                idom[node] = new
+                changed = True
+
+    retained = {node: sizes.get(node, 0) for node in order[1:]}
+    for node in reversed(order[1:]):
+        if idom[node] != top:
+            retained[idom[node]] += retained[node]
+    return retained
+
+
+def _intersect(a, b, idom, rank):
+    while a != b:
+        while rank[a] > rank[b]:
+            a = idom[a]
+        while rank[b] > rank[a]:
+            b = idom[b]
+    return a
+
+
+class ExportReachability:
+    """The files a project's export reaches from project.godot, with their sizes."""
+
+    def __init__(self, root, keep=(), jobs=None):
+        self.root = root
+        self.keep = list(keep)
+        self.jobs = jobs
+        self.paths = project_paths.ProjectPaths(root)
+        self.graph = None
+        self.roots = []       # (setting, path as written)
+        self.root_files = []  # res paths the roots resolve to
+        self.reachable = []   # res paths, in the order they were reached
+        self.edges = {}       # res path -> reachable res paths it references
+        self.sizes = {}       # res path -> export bytes
+        self._class_names = None
+        self._dirs = None
+        self._globs = {}
+
+    def run(self):
+        with skill_trace.span('read') as s:
+            self.graph = ResourceGraph.load(self.root)
+            rescanned = self.graph.refresh(self.jobs)
+            self.graph.save()
+            s.set(files=len(self.graph.files), rescanned=rescanned)
+        with skill_trace.span('transform') as s:
+            self._walk()
+            self.sizes = {path: self.export_size(path) for path in self.reachable}
+            s.set(reachable=len(self.reachable))
+        return self
+
+    # -- Walk -------------------------------------------------------------------------
+
+    def _walk(self):
+        doc = ProjectDocument.load(os.path.join(self.root, 'project.godot'))
+        self.roots = project_roots(doc)
+        if DEFAULT_BUS_LAYOUT in self.paths.files:
+            self.roots.append(('audio/buses/default_bus_layout', DEFAULT_BUS_LAYOUT))
+        self.roots.extend(('--keep', glob if glob.startswith(('res://', 'uid://')) else 'res://' + glob)
+                          for glob in self.keep)
+
+        seen = set()
+        queue = deque()
+
+        def reach(targets):
+            for target in targets:
+                if target not in seen:
+                    seen.add(target)
+                    self.reachable.append(target)
+                    queue.append(target)
+
+        for _, ref in self.roots:
+            reach(self.resolve(ref))
+        self.root_files = list(self.reachable)
+        while queue:
+            path = queue.popleft()
+            targets = []
+            for ref in self.references(path):
+                targets.extend(t for t in self.resolve(ref) if t != path)
+            self.edges[path] = list(dict.fromkeys(targets))
+            reach(targets)
+
+    def references(self, res_path):
+        """Paths referenced by a project file, as written (normalized to res:// where relative)."""
+        refs = self.graph.deps(res_path)
+        if res_path.endswith(TEXT_EXTENSIONS):
+            try:
+                with open(from_res_path(self.root, res_path), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                return refs
+            refs.extend(normalize_ref(ref.decode('utf-8', 'replace'), res_path)
+                        for ref in PATH_STRING.findall(data))
+            if res_path.endswith('.gd'):
+                class_names = self.class_names()
+                refs.extend(class_names[name] for name in set(IDENTIFIER.findall(data))
+                            if name in class_names)
+        return refs
+
+    def resolve(self, ref):
+        """Project files a reference can mean: none, one, or every match of a glob."""
+        if ref.startswith(project_paths.UID_PREFIX):
+            ref = self.paths.uid_path(ref)
+            if ref is None:
+                return []
+        if ref in self.paths.files:
+            return [ref]
+        ref = PLACEHOLDER.sub('*', ref)
+        if '*' not in ref and '?' not in ref:
+            res_path = self.paths.res_path(ref)
+            if res_path is None:
+                return []
+            if res_path in self.paths.files:
+                return [res_path]
+            if res_path == 'res://' or res_path.rstrip('/') not in self.dirs():
+                return []
+            ref = res_path.rstrip('/') + '/*'  # a directory, probably listed at runtime
+        pattern = self._globs.get(ref)
+        if pattern is None:
+            pattern = self._globs[ref] = glob_pattern(ref)
+        return sorted(path for path in self.paths.files if pattern.fullmatch(path))
+
+    def class_names(self):
+        """{class_name (bytes): script res path} over every script of the project."""
+        if self._class_names is None:
+            self._class_names = {}
+            for path in self.paths.files:
+                if path.endswith('.gd'):
+                    try:
+                        with open(from_res_path(self.root, path), 'rb') as f:
+                            match = CLASS_NAME.search(f.read())
+                    except OSError:
+                        continue
+                    if match:
+                        self._class_names[match.group(1)] = path
+        return self._class_names
+
+    def dirs(self):
+        if self._dirs is None:
+            self._dirs = set()
+            for path in self.paths.files:
+                path = path.rsplit('/', 1)[0]
+                while path not in self._dirs and path != 'res:/':
+                    self._dirs.add(path)
+                    path = path.rsplit('/', 1)[0]
+        return self._dirs
+
+    # -- Reports ----------------------------------------------------------------------
+
+    def export_size(self, res_path):
+        """Bytes the file adds to an export: its imported files if there are any, else itself."""
+        filepath = from_res_path(self.root, res_path)
+        if res_path + '.import' in self.paths.files:
+            try:
+                with open(filepath + '.import', 'r', encoding='utf-8', errors='replace') as f:
+                    match = DEST_FILES.search(f.read())
+                dest_files = variant.loads(match.group(1)) if match else []
+            except (OSError, variant.VariantError):
+                dest_files = []
+            total = None
+            for dest in dest_files:
+                try:
+                    total = (total or 0) + os.path.getsize(from_res_path(self.root, dest))
+                except OSError:
+                    continue
+            if total is not None:
+                return total
+        try:
+            return os.path.getsize(filepath)
+        except OSError:
+            return 0
+
+    def assets(self):
+        """Project files the default "all_resources" export would include."""
+        files = self.paths.files
+        ignored = tuple(path[:-len('.gdignore')] for path in files if path.endswith('/.gdignore'))
+        return {path for path in files
+                if (path.endswith(RESOURCE_EXTENSIONS) or path + '.import' in files)
+                and not (ignored and path.startswith(ignored))}
+
+    def unused(self):
+        """{res path: export bytes} of the assets nothing reaches."""
+        reachable = set(self.reachable)
+        return {path: self.export_size(path) for path in self.assets() if path not in reachable}
+
+    def scenes(self):
+        """[(scene, own bytes, retained bytes)], largest retained first."""
+        retained = retained_sizes(self.root_files, self.edges, self.sizes)
+        scenes = [(path, self.sizes[path], retained[path]) for path in self.reachable
+                  if path.endswith(SCENE_EXTENSIONS)]
+        return sorted(scenes, key=lambda scene: (-scene[2], scene[0]))
+
+    def exclude_filter(self, unused):
+        """
+        ([filter globs], [(path, reason)] not covered) for the unused assets. A
+        directory becomes 'dir/*' when nothing reachable is below it.
+        """
+        used = set()
+        for path in self.reachable:
+            while '/' in path[len('res://'):]:
+                path = path.rsplit('/', 1)[0]
+                used.add(path)
+        patterns = {}
+        skipped = []
+        for path in sorted(unused):
+            if ',' in path:
+                skipped.append((path, 'comma in path'))
+                continue
+            glob = path[len('res://'):]
+            parts = glob.split('/')
+            for depth in range(1, len(parts)):
+                directory = 'res://' + '/'.join(parts[:depth])
+                if directory not in used:
+                    glob = '/'.join(parts[:depth]) + '/*'
+                    break
+            if glob not in patterns:
+                pattern = glob_pattern(glob)
+                if any(filter_matches(pattern, r) for r in self.reachable):
+                    skipped.append((path, 'wildcard characters in path'))  # would also drop a reachable file
+                    continue
+                patterns[glob] = pattern
+        return list(patterns), skipped
+
+    def apply_to_preset(self, presets_path, preset, globs):
+        """
+        Writes `globs` into the preset's exclude_filter, keeping its existing
+        filters unless they match a reachable file. Returns the dropped filters.
+        """
+        doc = ProjectDocument.load(presets_path)
+        section = next((key.split('/', 1)[0] for key in doc.keys()
+                        if re.fullmatch(r'preset\.\d+/name', key) and doc.get(key) == preset), None)
+        if section is None:
+            raise KeyError(preset)
+        current = (doc.get(f"{section}/exclude_filter") or '').split(',')
+        kept = []
+        dropped = []
+        for glob in (g.strip() for g in current):
+            if not glob:
+                continue
+            pattern = glob_pattern(glob)
+            if any(filter_matches(pattern, path) for path in self.reachable):
+                dropped.append(glob)
+            else:
+                kept.append(glob)
+        merged = list(dict.fromkeys(kept + globs))
+        doc.set(f"{section}/exclude_filter", variant.dumps(', '.join(merged)))
+        doc.save(presets_path)
+        return dropped
+
+
+def format_size(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def _limit(items, top):
+    return items[:top] if top else items
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report what a Godot export reaches and which assets it does not need')
+    parser.add_argument('--project', help='Project directory (default: search upwards from the CWD)')
+    parser.add_argument('--keep', action='append', default=[], metavar='GLOB',
+                        help='Extra root(s) for files loaded in ways the scan cannot see, e.g. "levels/*.tscn"')
+    parser.add_argument('--top', type=int, default=20, help='Rows per list in the text report (0 for all)')
+    parser.add_argument('--json', action='store_true', help='Output the full report as JSON')
+    parser.add_argument('--exclude-filter', action='store_true',
+                        help='Print an exclude_filter for export_presets.cfg covering the unused assets')
+    parser.add_argument('--preset', help='With --exclude-filter: write it into this preset of export_presets.cfg')
+    parser.add_argument('--jobs', type=int, help='Worker processes for scanning (default: all cores)')
+    skill_trace.add_arguments(parser)
+    args = parser.parse_args()
+    skill_trace.setup('export_reachability', args)
+    if args.preset and not args.exclude_filter:
+        parser.error('--preset requires --exclude-filter')
+
+    root = project_paths.find_root(args.project)
+    if root is None:
+        print("Error: project.godot not found.")
+        sys.exit(1)
+
+    report = ExportReachability(root, args.keep, args.jobs).run()
+    unused = report.unused()
+
+    if args.exclude_filter:
+        globs, skipped = report.exclude_filter(unused)
+        for path, reason in skipped:
+            print(f"Warning: {path} can't be excluded by a filter ({reason}).", file=sys.stderr)
+        if not args.preset:
+            print(', '.join(globs))
+            return
+        presets_path = os.path.join(root, PRESETS_FILENAME)
+        try:
+            with skill_trace.span('write', filters=len(globs)):
+                dropped = report.apply_to_preset(presets_path, args.preset, globs)
+        except OSError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        except KeyError:
+            print(f"Error: no preset named '{args.preset}' in {presets_path}.")
+            sys.exit(1)
+        for glob in dropped:
+            print(f"Dropped filter '{glob}': it matches a reachable file.", file=sys.stderr)
+        print(f"exclude_filter of '{args.preset}': {len(globs)} filters for {len(unused)} unused assets "
+              f"({format_size(sum(unused.values()))}).")
+        return
+
+    with skill_trace.span('render'):
+        scenes = report.scenes()
+        unused_list = sorted(unused.items(), key=lambda item: (-item[1], item[0]))
+        reachable_bytes = sum(report.sizes.values())
+        unused_bytes = sum(unused.values())
+        if args.json:
+            print(json.dumps({
+                'roots': [{'setting': setting, 'path': path} for setting, path in report.roots],
+                'reachable': [{'path': path, 'bytes': report.sizes[path]} for path in report.reachable],
+                'scenes': [{'path': path, 'bytes': size, 'retained': retained}
+                           for path, size, retained in scenes],
+                'unused': [{'path': path, 'bytes': size} for path, size in unused_list],
+                'totals': {'reachable_files': len(report.reachable), 'reachable_bytes': reachable_bytes,
+                           'unused_files': len(unused), 'unused_bytes': unused_bytes},
+            }, indent=2))
+            return
+
+        print("Roots:")
+        for setting, path in report.roots:
+            print(f"  {setting} = {path}")
+        print(f"Reachable: {len(report.reachable)} files, {format_size(reachable_bytes)}")
+        print(f"Unused:    {len(unused)} files, {format_size(unused_bytes)}")
+        if scenes:
+            print("\nScenes by retained size:")
+            for path, size, retained in _limit(scenes, args.top):
+                print(f"  {format_size(retained):>10}  {path} (file {format_size(size)})")
+        if unused_list:
+            print("\nUnused assets:")
+            for path, size in _limit(unused_list, args.top):
+                print(f"  {format_size(size):>10}  {path}")
+        if args.top and len(unused_list) > args.top:
+            print(f"  ... {len(unused_list) - args.top} more (--top 0 for all)")
+
+
+if __name__ == "__main__":
+    main()
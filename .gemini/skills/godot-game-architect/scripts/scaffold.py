@@ -8,6 +8,10 @@ import argparse
 import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-project-manager', 'scripts'))
+import skill_trace  # noqa: E402
+
 COMMON_DIRS = [
     "scenes",
     "scripts/autoloads",
@@ -107,10 +111,14 @@ def main():
     parser.add_argument('--type', required=True, choices=['platformer', 'topdown', 'fps', 'puzzle'],
                        help='Game type')
     parser.add_argument('--name', default='My Game', help='Game name')
+    skill_trace.add_arguments(parser)
     args = parser.parse_args()
+    skill_trace.setup('scaffold', args)
 
     print(f"🎮 Scaffolding '{args.name}' ({args.type})...\n")
-    create_project(args.project, args.type, args.name)
+    with skill_trace.span('write', dirs=len(COMMON_DIRS + GAME_TYPE_DIRS.get(args.type, [])),
+                          files=len(AUTOLOAD_STUBS) + len(COMPONENT_STUBS)):
+        create_project(args.project, args.type, args.name)
 
 
 if __name__ == "__main__":
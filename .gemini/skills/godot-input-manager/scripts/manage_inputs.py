@@ -8,13 +8,26 @@ Usage:
   manage_inputs.py add --project <path> --action <name> --joyaxis <axis:direction>
   manage_inputs.py add --project <path> --action <name> --mouse <button>
   manage_inputs.py list --project <path>
+  manage_inputs.py conflicts --project <path> [--json]
+  manage_inputs.py where --project <path> <Binding> [--json]
+  manage_inputs.py export --project <path> [--output <file>]
   manage_inputs.py preset --project <path> --type <preset_name>
+  manage_inputs.py batch --project <path> --manifest <actions.json|->
 """
 
 import argparse
+import json
 import os
 import sys
 import re
+from collections import namedtuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-project-manager', 'scripts'))
+import skill_trace  # noqa: E402
+import variant  # noqa: E402
+from project_io import commit_project_file, read_text  # noqa: E402
+from variant import Call, GodotObject, ValueScanner  # noqa: E402
 
 
 # Physical keycode mapping (Godot 4's physical_keycode values)
@@ -40,6 +53,17 @@ MOUSE_MAP = {
     'MouseMiddle': 3,
 }
 
+KEY_NAMES = {code: name for name, code in KEY_MAP.items()}
+MOUSE_NAMES = {index: name for name, index in MOUSE_MAP.items()}
+
+# InputEventWithModifiers flags, in the order they're written in binding labels
+MODIFIERS = (('ctrl_pressed', 'Ctrl'), ('shift_pressed', 'Shift'), ('alt_pressed', 'Alt'),
+             ('meta_pressed', 'Meta'))
+
+# One indexed event. `code` is the keycode, button index or (axis, direction);
+# device -1 means all devices.
+Binding = namedtuple('Binding', ['action', 'kind', 'code', 'modifiers', 'device', 'label'])
+
 # Presets for common game types
 PRESETS = {
     'platformer': {
@@ -86,79 +110,74 @@ PRESETS = {
 }
 
 
+def _event(event_type, properties):
+    """An InputEvent object with the properties every event starts with."""
+    return GodotObject(event_type, dict({'resource_local_to_scene': False, 'resource_name': '', 'device': -1},
+                                        **properties, script=None))
+
+
 def make_key_event(key_name):
-    """Generate a Godot InputEventKey object string."""
+    """Generate a Godot InputEventKey object."""
     if key_name not in KEY_MAP:
         print(f"Warning: Unknown key '{key_name}'. Using keycode 0.", file=sys.stderr)
         keycode = 0
     else:
         keycode = KEY_MAP[key_name]
 
-    return (
-        f'Object(InputEventKey,"resource_local_to_scene":false,"resource_name":"",'
-        f'"device":-1,"window_id":0,"alt_pressed":false,"shift_pressed":false,'
-        f'"ctrl_pressed":false,"meta_pressed":false,"pressed":false,"keycode":0,'
-        f'"physical_keycode":{keycode},"key_label":0,"unicode":0,"location":0,'
-        f'"echo":false,"script":null)'
-    )
+    return _event('InputEventKey', {
+        'window_id': 0, 'alt_pressed': False, 'shift_pressed': False, 'ctrl_pressed': False,
+        'meta_pressed': False, 'pressed': False, 'keycode': 0, 'physical_keycode': keycode,
+        'key_label': 0, 'unicode': 0, 'location': 0, 'echo': False,
+    })
 
 
 def make_mouse_event(button_name):
-    """Generate a Godot InputEventMouseButton object string."""
+    """Generate a Godot InputEventMouseButton object."""
     if button_name not in MOUSE_MAP:
         print(f"Warning: Unknown mouse button '{button_name}'.", file=sys.stderr)
         button_idx = 1
     else:
         button_idx = MOUSE_MAP[button_name]
 
-    return (
-        f'Object(InputEventMouseButton,"resource_local_to_scene":false,"resource_name":"",'
-        f'"device":-1,"window_id":0,"alt_pressed":false,"shift_pressed":false,'
-        f'"ctrl_pressed":false,"meta_pressed":false,"button_mask":0,'
-        f'"position":Vector2(0, 0),"global_position":Vector2(0, 0),'
-        f'"factor":1.0,"button_index":{button_idx},"canceled":false,'
-        f'"pressed":false,"double_click":false,"script":null)'
-    )
+    return _event('InputEventMouseButton', {
+        'window_id': 0, 'alt_pressed': False, 'shift_pressed': False, 'ctrl_pressed': False,
+        'meta_pressed': False, 'button_mask': 0, 'position': Call('Vector2', (0, 0)),
+        'global_position': Call('Vector2', (0, 0)), 'factor': 1.0, 'button_index': button_idx,
+        'canceled': False, 'pressed': False, 'double_click': False,
+    })
 
 
 def make_joybutton_event(button_index):
-    """Generate a Godot InputEventJoypadButton object string."""
-    return (
-        f'Object(InputEventJoypadButton,"resource_local_to_scene":false,"resource_name":"",'
-        f'"device":-1,"button_index":{button_index},"pressure":0.0,'
-        f'"pressed":false,"script":null)'
-    )
+    """Generate a Godot InputEventJoypadButton object."""
+    return _event('InputEventJoypadButton', {'button_index': button_index, 'pressure': 0.0, 'pressed': False})
 
 
 def make_joyaxis_event(axis_spec):
-    """Generate a Godot InputEventJoypadMotion object string.
+    """Generate a Godot InputEventJoypadMotion object.
     axis_spec format: 'axis:direction' e.g. '0:-1' for left stick left
     """
     parts = axis_spec.split(":")
     axis = int(parts[0])
     direction = float(parts[1])
-    return (
-        f'Object(InputEventJoypadMotion,"resource_local_to_scene":false,"resource_name":"",'
-        f'"device":-1,"axis":{axis},"axis_value":{direction},"script":null)'
-    )
-
+    return _event('InputEventJoypadMotion', {'axis': axis, 'axis_value': direction})
 
-def make_action_value(events_list):
-    """Create the full value string for an input action."""
-    events_str = ", ".join(events_list)
-    return f'{{\n"deadzone": 0.2,\n"events": [{events_str}\n]\n}}'
 
+def make_event(btype, bvalue):
+    """Generate an event object from a (type, value) binding."""
+    if btype == 'key':
+        return make_key_event(bvalue)
+    elif btype == 'mouse':
+        return make_mouse_event(bvalue)
+    elif btype == 'joybutton':
+        return make_joybutton_event(int(bvalue))
+    elif btype == 'joyaxis':
+        return make_joyaxis_event(bvalue)
+    raise ValueError(f"Unknown binding type '{btype}'")
 
-def read_project_file(filepath):
-    """Read the project.godot file."""
-    with open(filepath, 'r') as f:
-        return f.read()
 
-
-def write_project_file(filepath, content):
-    """Write the project.godot file."""
-    with open(filepath, 'w') as f:
-        f.write(content)
+def make_action_value(events_list, deadzone=0.2):
+    """Create the full value string for an input action, formatted like the Godot editor does."""
+    return variant.dumps({'deadzone': float(deadzone), 'events': list(events_list)})
 
 
 def ensure_input_section(content):
@@ -168,64 +187,383 @@ def ensure_input_section(content):
     return content
 
 
-def add_action(filepath, action_name, events):
-    """Add or update an input action."""
-    content = read_project_file(filepath)
-    content = ensure_input_section(content)
+class InputMapTransaction:
+    """
+    Loads the [input] section of project.godot once and edits actions in memory.
 
-    # Check if action already exists
-    pattern = re.compile(rf'^{re.escape(action_name)}\s*=\s*\{{.*?\}}', re.MULTILINE | re.DOTALL)
-    match = pattern.search(content)
+    Every action is parsed into its own block, so adding or replacing an action is
+    a dict update rather than a regex pass over the file. `commit()` renders the
+    section and writes the file once, atomically and under the project lock.
+    """
 
-    action_value = make_action_value(events)
-    action_line = f'{action_name}={action_value}\n'
+    def __init__(self, filepath, content=None):
+        self.filepath = filepath
+        self.base = read_text(filepath) if content is None else content
+        self.ops = []  # set_action calls, replayed if the file changed under us
+        with skill_trace.span('parse', bytes=len(self.base)) as s:
+            self._parse(ensure_input_section(self.base))
+            s.set(actions=len(self.actions))
+
+    def _parse(self, content):
+        header = re.search(r'^\[input\][ \t\r]*$', content, re.MULTILINE)
+        newline = content.find('\n', header.end())
+        body_start = newline + 1 if newline != -1 else len(content)
+        self.head = content[:body_start]
+        self.blocks = []    # action names or raw lines (blank lines, comments)
+        self.actions = {}   # action name -> full 'name=value' text
+        self.added = []     # new actions, inserted at the top of the section
+
+        lines = content[body_start:].splitlines(keepends=True)
+        i = 0
+        pending = None
+        while i < len(lines):
+            line = lines[i]
+            if pending is not None:
+                pending[1].append(line)
+                if not pending[2].feed(line).is_open:
+                    self._load_action(pending[0], ''.join(pending[1]))
+                    pending = None
+            elif line.startswith('['):
+                break
+            else:
+                m = re.match(r'^([^=\s;#]+)\s*=(.*)', line, re.DOTALL)
+                if m:
+                    scanner = ValueScanner().feed(m.group(2))
+                    if scanner.is_open:
+                        pending = [m.group(1), [line], scanner]
+                    else:
+                        self._load_action(m.group(1), line)
+                else:
+                    self.blocks.append(line)
+            i += 1
+        if pending is not None:
+            self._load_action(pending[0], ''.join(pending[1]))
+        self.tail = ''.join(lines[i:])
+
+    def _load_action(self, name, text):
+        self.blocks.append(name)
+        self.actions[name] = text
+
+    def __contains__(self, action_name):
+        return action_name in self.actions
+
+    def get_action(self, action_name):
+        """The action decoded with variant.loads(): {'deadzone': ..., 'events': [GodotObject, ...]}."""
+        text = self.actions.get(action_name)
+        return None if text is None else variant.loads(text.split('=', 1)[1])
+
+    def set_action(self, action_name, events, deadzone=0.2):
+        """Add or replace an action. Returns True if it already existed."""
+        self.ops.append((action_name, events, deadzone))
+        existed = action_name in self.actions
+        text = f'{action_name}={make_action_value(events, deadzone)}\n'
+        if existed and not self.actions[action_name].endswith('\n'):
+            text = text[:-1]
+        self.actions[action_name] = text
+        if not existed:
+            self.added.append(action_name)
+        return existed
+
+    def render(self):
+        # New actions go after the blank lines that follow the [input] header
+        leading = 0
+        while leading < len(self.blocks) and self.blocks[leading] not in self.actions \
+                and not self.blocks[leading].strip():
+            leading += 1
+        if leading == 0 and self.added and not self.head.endswith('\n'):
+            self.head += '\n'
+        parts = [self.head]
+        parts.extend(self.blocks[:leading])
+        parts.extend(self.actions[name] for name in self.added)
+        for block in self.blocks[leading:]:
+            parts.append(self.actions.get(block, block))
+        parts.append(self.tail)
+        return ''.join(parts)
+
+    def commit(self):
+        with skill_trace.span('render') as s:
+            rendered = self.render()
+            s.set(bytes=len(rendered))
+        commit_project_file(self.filepath, self.base, rendered, replay=self._replay)
+
+    def _replay(self, text):
+        txn = InputMapTransaction(self.filepath, text)
+        for action_name, events, deadzone in self.ops:
+            txn.set_action(action_name, events, deadzone)
+        return txn.render()
+
+
+def _key_name(code):
+    if code in KEY_NAMES:
+        return KEY_NAMES[code]
+    if 32 < code < 127:
+        return chr(code).upper()
+    return f'Key{code}'
+
+
+def binding_label(kind, code, modifiers=()):
+    """'Ctrl+S', 'MouseLeft', 'joybutton:0' or 'joyaxis:0:-1'; parse_binding() reads it back."""
+    if kind == 'key':
+        name = _key_name(code)
+    elif kind == 'mouse':
+        name = MOUSE_NAMES.get(code, f'Mouse{code}')
+    elif kind == 'joybutton':
+        return f'joybutton:{code}'
+    else:
+        return f'joyaxis:{code[0]}:{code[1]}'
+    return '+'.join(modifiers + (name,))
 
-    if match:
-        # Replace existing
-        content = content[:match.start()] + action_line + content[match.end():]
+
+def parse_binding(text):
+    """
+    Parse a binding label into (kind, code, modifiers). Modifiers are None when
+    the label has none, so 'S' matches S with or without Ctrl.
+    """
+    parts = text.split(':')
+    if parts[0] == 'joybutton' and len(parts) == 2:
+        return 'joybutton', int(parts[1]), None
+    if parts[0] == 'joyaxis' and len(parts) == 3:
+        return 'joyaxis', (int(parts[1]), -1 if float(parts[2]) < 0 else 1), None
+
+    *prefix, name = text.split('+')
+    names = dict((label.lower(), label) for _, label in MODIFIERS)
+    names['control'] = 'Ctrl'
+    try:
+        given = {names[m.strip().lower()] for m in prefix}
+    except KeyError as e:
+        raise ValueError(f"Unknown modifier {e} in '{text}'") from None
+    modifiers = tuple(label for _, label in MODIFIERS if label in given) if prefix else None
+    if name in MOUSE_MAP:
+        return 'mouse', MOUSE_MAP[name], modifiers
+    if name in KEY_MAP:
+        return 'key', KEY_MAP[name], modifiers
+    if len(name) == 1 and 32 < ord(name.upper()) < 127:
+        return 'key', ord(name.upper()), modifiers
+    raise ValueError(f"Unknown binding '{text}'")
+
+
+def event_binding(action_name, event):
+    """The Binding for a decoded InputEvent, or None for event types that aren't indexed."""
+    if not isinstance(event, GodotObject):
+        return None
+    get = event.get
+    if event.type in ('InputEventKey', 'InputEventMouseButton'):
+        modifiers = tuple(label for prop, label in MODIFIERS if get(prop)
+                          or (label == 'Ctrl' and get('command_or_control_autoremap')))
+    else:
+        modifiers = ()
+    if event.type == 'InputEventKey':
+        # Physical, logical and label bindings share Godot's Key values
+        kind, code = 'key', get('physical_keycode') or get('keycode') or get('key_label') or 0
+    elif event.type == 'InputEventMouseButton':
+        kind, code = 'mouse', get('button_index', 0)
+    elif event.type == 'InputEventJoypadButton':
+        kind, code = 'joybutton', get('button_index', 0)
+    elif event.type == 'InputEventJoypadMotion':
+        kind, code = 'joyaxis', (get('axis', 0), -1 if get('axis_value', 0) < 0 else 1)
+    else:
+        return None
+    return Binding(action_name, kind, code, modifiers, get('device', -1),
+                   binding_label(kind, code, modifiers))
+
+
+def _shared_by(bindings):
+    """Actions among same-event bindings that can fire together (device -1 overlaps every device)."""
+    everywhere = {b.action for b in bindings if b.device == -1}
+    by_device = {}
+    for b in bindings:
+        if b.device != -1:
+            by_device.setdefault(b.device, set()).add(b.action)
+    shared = set(everywhere) if len(everywhere) > 1 else set()
+    for actions in by_device.values():
+        actions |= everywhere
+        if len(actions) > 1:
+            shared |= actions
+    return shared
+
+
+class InputMap:
+    """
+    The decoded actions of an [input] section, with a reverse index from events
+    to the actions bound to them.
+
+    The index is built in one pass over all events and keyed by (kind, code), so
+    conflicts() and where() stay linear in the number of bindings.
+    """
+
+    def __init__(self, actions=None):
+        self.actions = {}   # action name -> (deadzone, [event, ...])
+        self.index = {}     # (kind, code) -> [Binding, ...], in file order
+        for action_name, value in (actions or {}).items():
+            self.add(action_name, value)
+
+    @classmethod
+    def from_transaction(cls, txn):
+        input_map = cls()
+        with skill_trace.span('transform') as s:
+            for action_name in txn.actions:
+                try:
+                    value = txn.get_action(action_name)
+                except variant.VariantError as e:
+                    print(f"Warning: Can't parse action '{action_name}': {e}", file=sys.stderr)
+                    continue
+                input_map.add(action_name, value)
+            s.set(actions=len(input_map.actions), bindings=input_map.binding_count())
+        return input_map
+
+    @classmethod
+    def load(cls, filepath):
+        return cls.from_transaction(InputMapTransaction(filepath))
+
+    def add(self, action_name, value):
+        """Add one action from its decoded value ({'deadzone': ..., 'events': [...]})."""
+        if not isinstance(value, dict):
+            value = {}
+        events = value.get('events') or []
+        self.actions[action_name] = (value.get('deadzone', 0.5), events)
+        for event in events:
+            binding = event_binding(action_name, event)
+            if binding is not None:
+                self.index.setdefault((binding.kind, binding.code), []).append(binding)
+
+    def binding_count(self):
+        return sum(len(bindings) for bindings in self.index.values())
+
+    def bindings(self, action_name):
+        """The indexed bindings of one action."""
+        _, events = self.actions[action_name]
+        return [b for b in (event_binding(action_name, e) for e in events) if b is not None]
+
+    def where(self, binding):
+        """Bindings matching a parse_binding() label, e.g. 'Space', 'Ctrl+S' or 'joybutton:0'."""
+        kind, code, modifiers = parse_binding(binding)
+        return [b for b in self.index.get((kind, code), ())
+                if modifiers is None or b.modifiers == modifiers]
+
+    def conflicts(self):
+        """
+        [(label, [action, ...])] for every input that triggers more than one action.
+
+        Godot matches an event whose modifiers are a superset of a binding's, so
+        pressing Ctrl+S also fires an action bound to plain S, and Ctrl+Shift+S
+        fires actions on both Ctrl+S and Shift+S. Every modifier combination that
+        is a binding's or a union of bindings' (at most 16, for 4 modifiers) is
+        checked against the bindings whose modifiers it includes.
+        """
+        order = {name: i for i, name in enumerate(self.actions)}
+        found = []
+        for (kind, code), bindings in self.index.items():
+            if len(bindings) < 2:
+                continue
+            combos = list(dict.fromkeys(frozenset(b.modifiers) for b in bindings))
+            for held in combos:
+                for other in combos:
+                    union = held | other
+                    if union not in combos:
+                        combos.append(union)
+            for held in combos:
+                shared = _shared_by([b for b in bindings if held.issuperset(b.modifiers)])
+                if shared:
+                    modifiers = tuple(label for _, label in MODIFIERS if label in held)
+                    found.append((binding_label(kind, code, modifiers), sorted(shared, key=order.get)))
+        return found
+
+    def to_json(self):
+        """The whole map as plain JSON: actions with their events, the reverse index and conflicts."""
+        actions = {}
+        for action_name, (deadzone, events) in self.actions.items():
+            records = []
+            for event in events:
+                binding = event_binding(action_name, event)
+                if binding is None:
+                    records.append({'type': getattr(event, 'type', None)})
+                    continue
+                records.append({'type': event.type, 'kind': binding.kind, 'binding': binding.label,
+                                'code': list(binding.code) if binding.kind == 'joyaxis' else binding.code,
+                                'modifiers': list(binding.modifiers), 'device': binding.device})
+            actions[action_name] = {'deadzone': deadzone, 'events': records}
+        index = {}
+        for bindings in self.index.values():
+            for b in bindings:
+                names = index.setdefault(b.label, [])
+                if b.action not in names:
+                    names.append(b.action)
+        return {'actions': actions, 'bindings': index,
+                'conflicts': [{'binding': label, 'actions': names} for label, names in self.conflicts()]}
+
+
+def add_action(filepath, action_name, events):
+    """Add or update an input action."""
+    txn = InputMapTransaction(filepath)
+    with skill_trace.span('transform', actions=1):
+        existed = txn.set_action(action_name, events)
+    if existed:
         print(f"Updated action: {action_name}")
     else:
-        # Add after [input] section header
-        input_idx = content.index('[input]')
-        # Find end of the section header line
-        newline_after = content.index('\n', input_idx)
-        # Insert after the blank line following [input]
-        insert_pos = newline_after + 1
-        # Skip any blank lines right after [input]
-        while insert_pos < len(content) and content[insert_pos] == '\n':
-            insert_pos += 1
-        content = content[:insert_pos] + action_line + content[insert_pos:]
         print(f"Added action: {action_name}")
-
-    write_project_file(filepath, content)
+    txn.commit()
 
 
 def list_actions(filepath):
-    """List all input actions."""
-    content = read_project_file(filepath)
-    if '[input]' not in content:
+    """List all input actions with their bindings."""
+    txn = InputMapTransaction(filepath)
+    if not re.search(r'^\[input\]', txn.base, re.MULTILINE):
         print("No [input] section found.")
         return
 
-    # Extract the [input] section
-    input_start = content.index('[input]')
-    # Find the next section or end of file
-    next_section = re.search(r'\n\[(?!input\])', content[input_start + 7:])
-    if next_section:
-        input_section = content[input_start:input_start + 7 + next_section.start()]
-    else:
-        input_section = content[input_start:]
-
-    # Find action names
-    actions = re.findall(r'^(\w+)\s*=', input_section, re.MULTILINE)
-    if actions:
+    input_map = InputMap.from_transaction(txn)
+    if input_map.actions:
         print("Input Actions:")
-        for a in actions:
-            print(f"  - {a}")
+        for a in input_map.actions:
+            labels = ', '.join(b.label for b in input_map.bindings(a))
+            print(f"  - {a} ({labels})" if labels else f"  - {a}")
     else:
         print("No input actions defined.")
 
 
+def print_conflicts(filepath, as_json=False):
+    """Print events bound to more than one action. Returns the number of conflicts."""
+    conflicts = InputMap.load(filepath).conflicts()
+    with skill_trace.span('render', conflicts=len(conflicts)):
+        if as_json:
+            print(json.dumps([{'binding': label, 'actions': names} for label, names in conflicts], indent=2))
+        elif conflicts:
+            print("Conflicting bindings:")
+            for label, names in conflicts:
+                print(f"  {label}: {', '.join(names)}")
+        else:
+            print("No conflicting bindings.")
+    return len(conflicts)
+
+
+def print_where(filepath, binding, as_json=False):
+    """Print the actions bound to one binding. Returns the number of matches."""
+    matches = InputMap.load(filepath).where(binding)
+    with skill_trace.span('render', bindings=len(matches)):
+        if as_json:
+            print(json.dumps([{'action': b.action, 'binding': b.label, 'device': b.device}
+                              for b in matches], indent=2))
+        elif matches:
+            for b in matches:
+                device = 'all devices' if b.device == -1 else f'device {b.device}'
+                print(f"  {b.action}: {b.label} ({device})")
+        else:
+            print(f"No action is bound to {binding}.")
+    return len(matches)
+
+
+def export_input_map(filepath, output=None):
+    """Write the parsed input map as JSON to `output`, or stdout."""
+    data = InputMap.load(filepath).to_json()
+    with skill_trace.span('write' if output else 'render', actions=len(data['actions'])):
+        text = json.dumps(data, indent=2) + '\n'
+        if output:
+            with open(output, 'w') as f:
+                f.write(text)
+        else:
+            sys.stdout.write(text)
+
+
 def apply_preset(filepath, preset_name):
     """Apply a preset input configuration."""
     if preset_name not in PRESETS:
@@ -235,18 +573,61 @@ def apply_preset(filepath, preset_name):
     preset = PRESETS[preset_name]
     print(f"Applying preset: {preset_name}")
 
-    for action_name, bindings in preset.items():
-        events = []
-        for btype, bvalue in bindings:
-            if btype == 'key':
-                events.append(make_key_event(bvalue))
-            elif btype == 'mouse':
-                events.append(make_mouse_event(bvalue))
-            elif btype == 'joybutton':
-                events.append(make_joybutton_event(int(bvalue)))
-            elif btype == 'joyaxis':
-                events.append(make_joyaxis_event(bvalue))
-        add_action(filepath, action_name, events)
+    txn = InputMapTransaction(filepath)
+    with skill_trace.span('transform', actions=len(preset)):
+        for action_name, bindings in preset.items():
+            events = [make_event(btype, bvalue) for btype, bvalue in bindings]
+            if txn.set_action(action_name, events):
+                print(f"Updated action: {action_name}")
+            else:
+                print(f"Added action: {action_name}")
+    txn.commit()
+
+
+def parse_manifest_bindings(action_name, spec):
+    """
+    Normalize one manifest entry into (events, deadzone).
+
+    An entry is either a list of bindings or {"deadzone": 0.5, "bindings": [...]}.
+    A binding is a ["key", "A"] pair (as in PRESETS) or a {"key": "A"} object.
+    """
+    deadzone = 0.2
+    if isinstance(spec, dict):
+        deadzone = spec.get('deadzone', deadzone)
+        spec = spec.get('bindings', [])
+    events = []
+    for binding in spec:
+        if isinstance(binding, dict):
+            if len(binding) != 1:
+                raise ValueError(f"{action_name}: binding objects need exactly one key, got {binding}")
+            (btype, bvalue), = binding.items()
+        else:
+            btype, bvalue = binding
+        events.append(make_event(btype, bvalue))
+    return events, deadzone
+
+
+def apply_manifest(filepath, manifest):
+    """
+    Apply a batch of actions in a single transaction.
+
+    `manifest` maps action names to bindings (see parse_manifest_bindings), or is
+    {"actions": {...}}. Returns (added, updated) counts.
+    """
+    if not isinstance(manifest, dict):
+        raise ValueError("manifest must be a JSON object")
+    actions = manifest.get('actions', manifest)
+    txn = InputMapTransaction(filepath)
+    added = updated = 0
+    with skill_trace.span('transform', actions=len(actions)):
+        for action_name, spec in actions.items():
+            events, deadzone = parse_manifest_bindings(action_name, spec)
+            if txn.set_action(action_name, events, deadzone):
+                updated += 1
+            else:
+                added += 1
+    txn.commit()
+    return added, updated
 
 
 def main():
@@ -266,12 +647,38 @@ def main():
     list_parser = subparsers.add_parser('list', help='List input actions')
     list_parser.add_argument('--project', required=True, help='Path to project.godot')
 
+    # Conflicts command
+    conflicts_parser = subparsers.add_parser('conflicts', help='List events bound to more than one action')
+    conflicts_parser.add_argument('--project', required=True, help='Path to project.godot')
+    conflicts_parser.add_argument('--json', action='store_true', help='Output JSON')
+
+    # Where command
+    where_parser = subparsers.add_parser('where', help='List the actions bound to a key, button or axis')
+    where_parser.add_argument('--project', required=True, help='Path to project.godot')
+    where_parser.add_argument('binding', help='e.g. Space, Ctrl+S, MouseLeft, joybutton:0, joyaxis:0:-1')
+    where_parser.add_argument('--json', action='store_true', help='Output JSON')
+
+    # Export command
+    export_parser = subparsers.add_parser('export', help='Export actions, bindings and conflicts as JSON')
+    export_parser.add_argument('--project', required=True, help='Path to project.godot')
+    export_parser.add_argument('--output', help='Output file (default: stdout)')
+
     # Preset command
     preset_parser = subparsers.add_parser('preset', help='Apply input preset')
     preset_parser.add_argument('--project', required=True, help='Path to project.godot')
     preset_parser.add_argument('--type', required=True, help='Preset type: platformer, topdown, fps, menu')
 
+    # Batch command
+    batch_parser = subparsers.add_parser('batch', help='Apply actions from a JSON manifest in one write')
+    batch_parser.add_argument('--project', required=True, help='Path to project.godot')
+    batch_parser.add_argument('--manifest', required=True, help='JSON manifest file, or - for stdin')
+
+    for sub in (add_parser, list_parser, conflicts_parser, where_parser, export_parser,
+                preset_parser, batch_parser):
+        skill_trace.add_arguments(sub)
+
     args = parser.parse_args()
+    skill_trace.setup('manage_inputs', args)
 
     if not args.command:
         parser.print_help()
@@ -279,8 +686,33 @@ def main():
 
     if args.command == 'list':
         list_actions(args.project)
+    elif args.command == 'conflicts':
+        if print_conflicts(args.project, args.json):
+            sys.exit(1)
+    elif args.command == 'where':
+        try:
+            found = print_where(args.project, args.binding, args.json)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        if not found:
+            sys.exit(1)
+    elif args.command == 'export':
+        export_input_map(args.project, args.output)
     elif args.command == 'preset':
         apply_preset(args.project, args.type)
+    elif args.command == 'batch':
+        if args.manifest == '-':
+            manifest = json.load(sys.stdin)
+        else:
+            with open(args.manifest, 'r') as f:
+                manifest = json.load(f)
+        try:
+            added, updated = apply_manifest(args.project, manifest)
+        except (ValueError, TypeError) as e:
+            print(f"Error: Invalid manifest: {e}")
+            sys.exit(1)
+        print(f"Added {added} and updated {updated} actions in {args.project}")
     elif args.command == 'add':
         events = []
         if args.key:
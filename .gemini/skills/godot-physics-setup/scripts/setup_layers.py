@@ -5,6 +5,11 @@ import argparse
 import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-project-manager', 'scripts'))
+import skill_trace  # noqa: E402
+from project_io import update_project_file  # noqa: E402
+
 LAYER_NAMES_2D = {
     "2d_physics/layer_1": "World",
     "2d_physics/layer_2": "Player",
@@ -32,12 +37,8 @@ LAYER_NAMES_3D = {
 }
 
 
-def setup_layers(project_path, game_type):
-    with open(project_path, 'r') as f:
-        content = f.read()
-
-    layers = LAYER_NAMES_2D if game_type == "2d" else LAYER_NAMES_3D
-
+def add_layer_names(content, layers):
+    """Returns (content, added lines) with any missing layer names inserted."""
     # Check if [layer_names] section exists
     if "[layer_names]" not in content:
         content = content.rstrip() + "\n\n[layer_names]\n\n"
@@ -57,10 +58,23 @@ def setup_layers(project_path, game_type):
     if lines:
         block = "\n".join(lines) + "\n"
         content = content[:insert_pos] + "\n" + block + content[insert_pos:]
+    return content, lines
+
 
-        with open(project_path, 'w') as f:
-            f.write(content)
-        print(f"Added {len(lines)} layer names to {project_path}")
+def setup_layers(project_path, game_type):
+    layers = LAYER_NAMES_2D if game_type == "2d" else LAYER_NAMES_3D
+    added = []
+
+    def transform(content):
+        # May run again under the lock if another process edited the file meanwhile
+        with skill_trace.span('transform') as s:
+            content, added[:] = add_layer_names(content, layers)
+            s.set(layers=len(added))
+        return content
+
+    update_project_file(project_path, transform)
+    if added:
+        print(f"Added {len(added)} layer names to {project_path}")
     else:
         print("All layer names already present.")
 
@@ -69,7 +83,9 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--project', required=True)
     parser.add_argument('--type', required=True, choices=['2d', '3d'])
+    skill_trace.add_arguments(parser)
     args = parser.parse_args()
+    skill_trace.setup('setup_layers', args)
 
     if not os.path.exists(args.project):
         print(f"Error: {args.project} not found.")
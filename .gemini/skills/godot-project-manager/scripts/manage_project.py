@@ -1,111 +1,385 @@
-import sys
+#!/usr/bin/env python3
+"""
+Godot Project Manager - Reads and writes settings in project.godot.
+
+Usage:
+  manage_project.py get <key>
+  manage_project.py set <key> <value> [--raw]
+  manage_project.py get-many <key> [<key> ...] [--from FILE|-]
+  manage_project.py set-many --from FILE|-
+  manage_project.py dump [--json]
+
+All commands accept --project <path> (default: auto-detect project.godot).
+"""
+
+import argparse
+import json
 import os
-import re
+import sys
+
+import skill_trace
+import variant
+from project_io import commit_project_file, read_text
+
+
+class Property:
+    """A single `key=value` entry; `raw` holds its exact text, including line endings."""
+
+    __slots__ = ('key', 'raw')
+
+    def __init__(self, key, raw):
+        self.key = key
+        self.raw = raw
+
+    @property
+    def value(self):
+        """The raw value text, without the key and surrounding whitespace."""
+        return self.raw.split('=', 1)[1].strip()
+
+
+class Section:
+    """A `[section]` header and the lines that follow it, in file order."""
+
+    def __init__(self, name, header):
+        self.name = name
+        self.header = header
+        self.blocks = []  # Property objects or raw strings (comments, blank lines)
+
+    def render(self):
+        parts = [self.header]
+        for block in self.blocks:
+            parts.append(block.raw if isinstance(block, Property) else block)
+        return ''.join(parts)
+
 
-def parse_project_file(filepath):
+class ProjectDocument:
     """
-    Parses project.godot preserving line structure for safe editing.
-    Returns a list of lines.
+    Parsed project.godot.
+
+    The file is parsed once into sections and properties with a full-key index
+    (e.g. 'display/window/size/viewport_width'), so lookups and edits are O(1).
+    Untouched lines are rendered back byte-for-byte, keeping comments and ordering.
     """
-    with open(filepath, 'r') as f:
-        return f.readlines()
 
-def find_key_location(lines, full_key):
+    def __init__(self, text):
+        self.original = text
+        self.ops = []  # (full_key, value, raw) edits, replayed if the file changed under us
+        self.newline = '\r\n' if '\r\n' in text else '\n'
+        self.sections = [Section('', '')]  # the unnamed leading section (config_version=...)
+        self.index = {}  # full key -> (Section, Property)
+        self._by_name = {'': self.sections[0]}
+        with skill_trace.span('parse', bytes=len(text)) as s:
+            self._parse(text)
+            s.set(keys=len(self.index))
+
+    @classmethod
+    def load(cls, filepath):
+        return cls(read_text(filepath))
+
+    def save(self, filepath):
+        """
+        Writes the document atomically under the project lock. If another process
+        changed the file since it was loaded, its edits are kept: different sections
+        are merged, and otherwise this document's edits are replayed on top.
+        """
+        with skill_trace.span('render') as s:
+            rendered = self.render()
+            s.set(bytes=len(rendered))
+        written = commit_project_file(filepath, self.original, rendered, replay=self._replay)
+        if written != rendered:
+            ops = self.ops
+            self.__init__(written)
+            self.ops = ops
+        self.original = written
+
+    def _replay(self, text):
+        doc = ProjectDocument(text)
+        for full_key, value, raw in self.ops:
+            doc.set(full_key, value, raw)
+        return doc.render()
+
+    def _parse(self, text):
+        section = self.sections[0]
+        pending = None  # [key, raw parts, ValueScanner] for a multi-line value
+
+        for line in text.splitlines(keepends=True):
+            if pending is not None:
+                pending[1].append(line)
+                if not pending[2].feed(line).is_open:
+                    self._add_property(section, pending[0], ''.join(pending[1]))
+                    pending = None
+                continue
+
+            stripped = line.strip()
+            if stripped.startswith('[') and stripped.endswith(']'):
+                section = Section(stripped[1:-1], line)
+                self.sections.append(section)
+                self._by_name.setdefault(section.name, section)
+            elif '=' in stripped and not stripped.startswith((';', '#')):
+                key, value = line.split('=', 1)
+                scanner = variant.ValueScanner().feed(value)
+                if scanner.is_open:
+                    pending = [key.strip(), [line], scanner]
+                else:
+                    self._add_property(section, key.strip(), line)
+            else:
+                section.blocks.append(line)
+
+        if pending is not None:
+            # Unterminated value at EOF: keep the text as-is
+            self._add_property(section, pending[0], ''.join(pending[1]))
+
+    def _add_property(self, section, key, raw):
+        prop = Property(key, raw)
+        section.blocks.append(prop)
+        self.index[self.full_key(section.name, key)] = (section, prop)
+        return prop
+
+    @staticmethod
+    def full_key(section_name, key):
+        return f"{section_name}/{key}" if section_name else key
+
+    @staticmethod
+    def split_key(full_key):
+        """Splits a new full key into (section, key) the way Godot groups settings."""
+        if '/' not in full_key:
+            return '', full_key
+        return tuple(full_key.split('/', 1))
+
+    def keys(self):
+        return list(self.index.keys())
+
+    def get(self, full_key):
+        """The value as text: strings are unquoted and unescaped, anything else is returned raw."""
+        entry = self.index.get(full_key)
+        if entry is None:
+            return None
+        raw = entry[1].value
+        if raw.startswith('"'):
+            if '\\' not in raw and raw.count('"') == 2 and raw.endswith('"'):
+                return raw[1:-1]  # plain string, nothing to unescape
+            try:
+                value = variant.loads(raw)
+            except variant.VariantError:
+                return raw.strip('"')
+            if isinstance(value, str):
+                return value
+        return raw
+
+    def get_value(self, full_key, default=None):
+        """The value decoded with variant.loads() (dicts, lists, Call(...), ...)."""
+        entry = self.index.get(full_key)
+        if entry is None:
+            return default
+        return variant.loads(entry[1].value)
+
+    def get_raw(self, full_key):
+        entry = self.index.get(full_key)
+        return entry[1].value if entry else None
+
+    def set(self, full_key, value, raw=False):
+        """
+        Sets a value, adding the key (and its section) if it does not exist.
+        Returns True if the key already existed. See format_value() for `raw`.
+        """
+        formatted = format_value(value, raw)
+        self.ops.append((full_key, value, raw))
+        entry = self.index.get(full_key)
+        if entry is not None:
+            prop = entry[1]
+            key_part = prop.raw.split('=', 1)[0]
+            prop.raw = f"{key_part}={formatted}{self.newline}"
+            return True
+
+        section_name, key = self.split_key(full_key)
+        section = self._by_name.get(section_name)
+        if section is None:
+            section = self._add_section(section_name)
+
+        # Insert after the section's last non-blank line, keeping the blank separator
+        insert_at = len(section.blocks)
+        while insert_at > 0 and isinstance(section.blocks[insert_at - 1], str) \
+                and not section.blocks[insert_at - 1].strip():
+            insert_at -= 1
+        if insert_at == 0 and section.blocks:
+            insert_at = 1  # keep the blank line after the header
+        previous = section.blocks[insert_at - 1] if insert_at else None
+        if isinstance(previous, Property) and not previous.raw.endswith('\n'):
+            previous.raw += self.newline
+        prop = Property(key, f"{key}={formatted}{self.newline}")
+        section.blocks.insert(insert_at, prop)
+        self.index[full_key] = (section, prop)
+        return False
+
+    def _add_section(self, name):
+        last = self.sections[-1]
+        tail = last.render()
+        if tail and not tail.endswith(self.newline):
+            last.blocks.append(self.newline)
+        if tail.strip():
+            last.blocks.append(self.newline)
+        section = Section(name, f"[{name}]{self.newline}")
+        section.blocks.append(self.newline)
+        self.sections.append(section)
+        self._by_name[name] = section
+        return section
+
+    def to_dict(self):
+        return {k: self.get(k) for k in self.index}
+
+    def render(self):
+        return ''.join(s.render() for s in self.sections)
+
+
+# Loads documents that main() only reads (get, get-many, dump). skill_server.py swaps
+# in its warm cache; commands that write always start from a fresh load.
+read_document = ProjectDocument.load
+
+
+def format_value(value, raw=False):
     """
-    Finds the line index where the key is defined.
-    The key might be split between section and property.
-    e.g. full_key='display/window/size/viewport_width'
-    could be under [display] as window/size/viewport_width=...
+    Converts a Python/CLI value to project.godot syntax. Strings that already are
+    Variant text (numbers, true, null, "quoted", Vector2(1, 2), [..], {..}) are
+    written as-is, ignoring surrounding whitespace; other strings are quoted.
+    With `raw`, the string is written as-is without being validated.
+    JSON lists and objects become Arrays and Dictionaries.
     """
-    current_section = ""
-
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if line.startswith("[") and line.endswith("]"):
-            current_section = line[1:-1]
-        elif "=" in line:
-            key_part, _ = line.split("=", 1)
-            key_part = key_part.strip()
-
-            # Construct candidate full keys
-            # 1. section/key_part
-            candidate1 = f"{current_section}/{key_part}" if current_section else key_part
-
-            # Handle cases where section might be empty or key_part has slashes
-            if candidate1 == full_key:
-                return i
-
-            # Godot 4 quirk: sometimes sections have slashes like [dotnet/project]
-
-    return -1
-
-def get_value(lines, full_key):
-    idx = find_key_location(lines, full_key)
-    if idx != -1:
-        line = lines[idx]
-        _, value = line.split("=", 1)
-        return value.strip().strip('"')
+    if isinstance(value, str):
+        text = value.strip()
+        if raw or variant.is_value(text):
+            return text
+        return variant.dumps(value)
+    try:
+        return variant.dumps(value)
+    except variant.VariantError as e:
+        raise ValueError(str(e)) from None
+
+
+def find_project_file():
+    """Looks for project.godot in the usual locations relative to the CWD."""
+    for candidate in ("project.godot", "../project.godot", "godot-gemini-plugin/project.godot"):
+        if os.path.exists(candidate):
+            return candidate
     return None
 
-def set_value(lines, full_key, new_value):
-    idx = find_key_location(lines, full_key)
-    if idx != -1:
-        line = lines[idx]
-        key_part, _ = line.split("=", 1)
-        # Preserve indentation if any? Usually none in project.godot
-        # Reconstruct line
-        # Check if we need quotes for the value
-        # existing value might guide us, or we just quote strings
-        if isinstance(new_value, str) and not new_value.startswith('"') and not new_value in ['true', 'false', 'null'] and not new_value.isdigit():
-             new_value = f'"{new_value}"'
-
-        lines[idx] = f"{key_part}={new_value}\n"
-        return True, lines
-    return False, lines
+
+def read_json_source(source):
+    """Reads JSON from a file path or '-' for stdin."""
+    if source == '-':
+        return json.load(sys.stdin)
+    with open(source, 'r') as f:
+        return json.load(f)
+
+
+def read_keys_source(source):
+    """Reads keys from a JSON array or newline-separated text (file path or '-')."""
+    if source == '-':
+        text = sys.stdin.read()
+    else:
+        with open(source, 'r') as f:
+            text = f.read()
+    stripped = text.strip()
+    if stripped.startswith('['):
+        return json.loads(stripped)
+    return [line.strip() for line in stripped.splitlines() if line.strip()]
+
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: manage_project.py [get|set] [key] [value]")
-        sys.exit(1)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--project', help='Path to project.godot (default: auto-detect)')
+    skill_trace.add_arguments(common)
+
+    parser = argparse.ArgumentParser(description='Read and write Godot project settings')
+    subparsers = parser.add_subparsers(dest='command')
+
+    get_parser = subparsers.add_parser('get', parents=[common], help='Print a single setting')
+    get_parser.add_argument('key')
+
+    set_parser = subparsers.add_parser('set', parents=[common], help='Set (or add) a single setting')
+    set_parser.add_argument('key')
+    set_parser.add_argument('value')
+    set_parser.add_argument('--raw', action='store_true',
+                            help='Write the value verbatim, without checking that it is Variant text')
 
-    project_file = "project.godot"
-    # Try to find project.godot
-    if not os.path.exists(project_file):
-        # check parent
-        if os.path.exists("../project.godot"):
-            project_file = "../project.godot"
-        elif os.path.exists("godot-gemini-plugin/project.godot"):
-            project_file = "godot-gemini-plugin/project.godot"
+    get_many_parser = subparsers.add_parser('get-many', parents=[common], help='Print several settings as JSON')
+    get_many_parser.add_argument('keys', nargs='*')
+    get_many_parser.add_argument('--from', dest='source',
+                                 help='JSON array or newline-separated keys (file or - for stdin)')
 
-    if not os.path.exists(project_file):
+    set_many_parser = subparsers.add_parser('set-many', parents=[common], help='Apply a JSON object of settings in one write')
+    set_many_parser.add_argument('--from', dest='source', required=True,
+                                 help='JSON object {"key": value} (file or - for stdin)')
+
+    dump_parser = subparsers.add_parser('dump', parents=[common], help='Print all settings')
+    dump_parser.add_argument('--json', action='store_true', help='Output as a JSON object')
+
+    args = parser.parse_args()
+    skill_trace.setup('manage_project', args)
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    project_file = args.project or find_project_file()
+    if not project_file or not os.path.exists(project_file):
         print("Error: project.godot not found.")
         sys.exit(1)
 
-    lines = parse_project_file(project_file)
-    action = sys.argv[1]
-    key = sys.argv[2]
+    if args.command in ('get', 'get-many', 'dump'):
+        doc = read_document(project_file)
+    else:
+        doc = ProjectDocument.load(project_file)
 
-    if action == 'get':
-        val = get_value(lines, key)
+    if args.command == 'get':
+        val = doc.get(args.key)
         if val is not None:
             print(val)
         else:
-            print(f"Key '{key}' not found.")
+            print(f"Key '{args.key}' not found.")
             sys.exit(1)
 
-    elif action == 'set':
-        if len(sys.argv) < 4:
-            print("Usage: set [key] [value]")
+    elif args.command == 'set':
+        with skill_trace.span('transform', keys=1):
+            existed = doc.set(args.key, args.value, args.raw)
+        doc.save(project_file)
+        print(f"Updated {args.key}" if existed else f"Added {args.key}")
+
+    elif args.command == 'get-many':
+        keys = list(args.keys)
+        if args.source:
+            keys.extend(read_keys_source(args.source))
+        result = {k: doc.get(k) for k in keys}
+        print(json.dumps(result, indent=2))
+        if any(v is None for v in result.values()):
             sys.exit(1)
-        value = sys.argv[3]
-        success, new_lines = set_value(lines, key, value)
-        if success:
-            with open(project_file, 'w') as f:
-                f.writelines(new_lines)
-            print(f"Updated {key}")
-        else:
-            print(f"Key '{key}' not found. Adding new keys is not supported in this version.")
+
+    elif args.command == 'set-many':
+        settings = read_json_source(args.source)
+        if not isinstance(settings, dict):
+            print("Error: set-many expects a JSON object of key/value pairs.")
             sys.exit(1)
+        updated = added = 0
+        with skill_trace.span('transform', keys=len(settings)):
+            for key, value in settings.items():
+                try:
+                    existed = doc.set(key, value)
+                except ValueError as e:
+                    print(f"Error: {key}: {e}")
+                    sys.exit(1)
+                if existed:
+                    updated += 1
+                else:
+                    added += 1
+        doc.save(project_file)
+        print(f"Updated {updated} and added {added} settings in {project_file}")
+
+    elif args.command == 'dump':
+        if args.json:
+            print(json.dumps(doc.to_dict(), indent=2))
+        else:
+            for key in doc.keys():
+                print(f"{key}={doc.get_raw(key)}")
+
 
 if __name__ == "__main__":
     main()
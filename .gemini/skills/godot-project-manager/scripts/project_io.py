@@ -0,0 +1,201 @@
+"""
+Concurrency-safe read-modify-write of project.godot.
+
+Several tools (manage_project.py, manage_inputs.py, setup_layers.py) edit the
+same project.godot, possibly from parallel agents. Edits are computed without a
+lock (optimistically) and committed under an exclusive file lock with an atomic
+rename. If the file changed in the meantime, edits to different sections are
+merged; edits to the same section are re-applied on top of the current file.
+
+Other skills import this module by adding this directory to sys.path.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+from skill_trace import span
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class MergeConflict(Exception):
+    """Raised when concurrent edits touch the same section and can't be replayed."""
+
+
+def lock_path(filepath):
+    directory, name = os.path.split(os.path.abspath(filepath))
+    return os.path.join(directory, f".{name}.lock")
+
+
+@contextmanager
+def locked(filepath):
+    """Holds an exclusive inter-process lock for `filepath` (released on exit or process death)."""
+    fd = os.open(lock_path(filepath), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+
+def read_text(filepath):
+    """Reads the file exactly (line endings untouched); a missing file reads as ''."""
+    with span('read') as s:
+        try:
+            with open(filepath, 'r', newline='', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            text = ''
+        s.set(bytes=len(text))
+    return text
+
+
+def atomic_write(filepath, content):
+    """Writes via a temp file in the same directory + fsync + rename; readers never see partial files."""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(filepath)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(filepath):
+            os.chmod(tmp_path, os.stat(filepath).st_mode & 0o7777)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def split_sections(text):
+    """
+    Splits project.godot text into [(key, text)] chunks, one per section, where
+    key is (section name, occurrence). The leading chunk before any header has
+    name ''. Joining the chunks gives back the exact text.
+    """
+    chunks = []
+    current_name = ''
+    current = []
+    depth = 0
+    in_string = False
+    seen = {}
+
+    def flush():
+        n = seen.get(current_name, 0)
+        seen[current_name] = n + 1
+        chunks.append(((current_name, n), ''.join(current)))
+
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if depth <= 0 and not in_string and stripped.startswith('[') and stripped.endswith(']'):
+            flush()
+            current_name = stripped[1:-1]
+            current = [line]
+            continue
+        current.append(line)
+        # Track multi-line values so '[' lines inside them aren't taken as headers
+        escaped = False
+        for ch in line:
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == '\\':
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch in '{[(':
+                depth += 1
+            elif ch in '}])':
+                depth -= 1
+    flush()
+    return chunks
+
+
+def merge_sections(base, ours, theirs):
+    """
+    Three-way merge at section granularity. Returns the merged text, or None if
+    both sides changed the same section differently.
+    """
+    base_map = dict(split_sections(base))
+    ours_chunks = split_sections(ours)
+    ours_map = dict(ours_chunks)
+    theirs_chunks = split_sections(theirs)
+    theirs_map = dict(theirs_chunks)
+
+    ours_changed = {k: v for k, v in ours_map.items() if base_map.get(k) != v}
+    ours_changed.update({k: None for k in base_map if k not in ours_map})
+    theirs_changed = {k: v for k, v in theirs_map.items() if base_map.get(k) != v}
+    theirs_changed.update({k: None for k in base_map if k not in theirs_map})
+
+    for key in ours_changed.keys() & theirs_changed.keys():
+        if ours_changed[key] != theirs_changed[key]:
+            return None
+
+    merged = []
+    for key, chunk in theirs_chunks:
+        if key in ours_changed:
+            chunk = ours_changed[key]
+            if chunk is None:
+                continue
+        merged.append(chunk)
+    for key, chunk in ours_chunks:
+        if key in ours_changed and key not in theirs_map and chunk is not None:
+            if merged and merged[-1] and not merged[-1].endswith('\n\n'):
+                merged.append('\n' if merged[-1].endswith('\n') else '\n\n')
+            merged.append(chunk)
+    return ''.join(merged)
+
+
+def commit_project_file(filepath, base, new, replay=None):
+    """
+    Atomically replaces `filepath` with `new`, which the caller derived from `base`.
+
+    Under the lock, if the file still equals `base` it is simply replaced. Otherwise
+    another process committed in between: non-overlapping section edits are merged,
+    and overlapping ones are redone with `replay(current_text)` when given.
+    Returns the text that was written (or the current text if nothing changed).
+    """
+    with span('write') as s, locked(filepath):
+        current = read_text(filepath)
+        outcome = 'direct'
+        if current != base:
+            outcome = 'merged'
+            result = merge_sections(base, new, current)
+            if result is None:
+                if replay is None:
+                    raise MergeConflict(f"{filepath} was modified concurrently in the same section.")
+                outcome = 'replayed'
+                result = replay(current)
+        else:
+            result = new
+        if result != current:
+            atomic_write(filepath, result)
+        else:
+            outcome = 'unchanged'
+        s.set(bytes=len(result), outcome=outcome)
+        return result
+
+
+def update_project_file(filepath, transform):
+    """
+    Optimistic read-modify-write: `transform(text) -> new_text` runs without the
+    lock, then the result is committed (and merged or replayed if needed).
+    """
+    base = read_text(filepath)
+    return commit_project_file(filepath, base, transform(base), replay=transform)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+res:// and uid:// resolution shared by the skill scripts.
+
+Usage:
+  project_paths.py resolve <path> [--project <dir>]   prints the file of a res://, uid:// or plain path
+  project_paths.py uid <res://path | uid://id> [--project <dir>]   prints the other side
+
+  paths = project_for()                  # the project around the CWD, or None
+  paths.to_file('uid://cecaux1sm7mo0')   # -> absolute path
+  paths.uid_of('res://player.gd')        # -> 'uid://...' or None
+  paths.exists('res://icon.svg')         # set lookup, no stat
+
+The project root is located once per process: the working directory or one of
+its parents, or else the godot-gemini-plugin/ checkout below it. Each project
+has one ProjectPaths for the process lifetime, whose tables are built on
+first use: the uid <-> res:// map from .godot/uid_cache.bin (written by the
+editor), and the set of files from one walk of the project. The walk also
+finds the *.uid sidecar files next to scripts and shaders (Godot 4.4+); they
+are read the first time the cache doesn't know a uid. After that, every lookup
+is a dict or set access. clear_cache() forgets everything, for long-running
+processes that see files come and go.
+"""
+
+import argparse
+import os
+import posixpath
+import struct
+import sys
+
+LEGACY_PROJECT_DIR = 'godot-gemini-plugin'
+UID_CACHE = os.path.join('.godot', 'uid_cache.bin')
+UID_SIDECAR = '.uid'
+
+# ResourceUID's text form: base 34, 'a'-'y' then '0'-'8', most significant first
+UID_CHARS = 'abcdefghijklmnopqrstuvwxy012345678'
+UID_DIGITS = {c: i for i, c in enumerate(UID_CHARS)}
+UID_DIGITS.update({'z': 25, '9': 34})  # outside the alphabet, but accepted by Godot's parser
+UID_PREFIX = 'uid://'
+
+_roots = {}     # start directory -> project root or None
+_projects = {}  # project root -> ProjectPaths
+
+
+def uid_to_text(uid):
+    """'uid://...' for a numeric ResourceUID id."""
+    if uid < 0:
+        return UID_PREFIX + '<invalid>'
+    digits = []
+    while True:
+        uid, c = divmod(uid, len(UID_CHARS))
+        digits.append(UID_CHARS[c])
+        if not uid:
+            break
+    return UID_PREFIX + ''.join(reversed(digits))
+
+
+def text_to_uid(text):
+    """The numeric id of a 'uid://...' string, or None if it isn't one."""
+    if not text.startswith(UID_PREFIX) or len(text) == len(UID_PREFIX):
+        return None
+    uid = 0
+    for c in text[len(UID_PREFIX):]:
+        digit = UID_DIGITS.get(c)
+        if digit is None:
+            return None
+        uid = uid * len(UID_CHARS) + digit
+    return uid & 0x7FFFFFFFFFFFFFFF
+
+
+def read_uid_cache(path):
+    """{uid text: res path} from a .godot/uid_cache.bin; {} if it's missing or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return {}
+    uids = {}
+    try:
+        count, = struct.unpack_from('<I', data, 0)
+        pos = 4
+        for _ in range(count):
+            uid, size = struct.unpack_from('<QI', data, pos)
+            pos += 12
+            uids[uid_to_text(uid & 0x7FFFFFFFFFFFFFFF)] = data[pos:pos + size].decode('utf-8', 'replace')
+            pos += size
+    except struct.error:
+        pass  # truncated: keep what was read
+    return uids
+
+
+def find_root(start=None):
+    """Directory of the project.godot that `start` (default: the CWD) is in, or None. Cached."""
+    start = os.path.abspath(start or os.getcwd())
+    if start in _roots:
+        return _roots[start]
+    root = None
+    current = start
+    while True:
+        if os.path.isfile(os.path.join(current, 'project.godot')):
+            root = current
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    if root is None and os.path.isfile(os.path.join(start, LEGACY_PROJECT_DIR, 'project.godot')):
+        root = os.path.join(start, LEGACY_PROJECT_DIR)
+    _roots[start] = root
+    return root
+
+
+def project_for(start=None):
+    """The ProjectPaths of the project around `start` (default: the CWD), or None."""
+    root = find_root(start)
+    if root is None:
+        return None
+    paths = _projects.get(root)
+    if paths is None:
+        paths = _projects[root] = ProjectPaths(root)
+    return paths
+
+
+def clear_cache():
+    _roots.clear()
+    _projects.clear()
+
+
+def resolve(path, start=None):
+    """
+    Filesystem path for a path given on the command line: res:// and uid://
+    paths map into the project, plain paths are taken as they are unless they
+    only exist relative to the project root. Returns None for an unknown uid.
+    """
+    paths = project_for(start)
+    if path.startswith(UID_PREFIX):
+        return paths.to_file(path) if paths is not None else None
+    if path.startswith('res://'):
+        return paths.to_file(path) if paths is not None else path[len('res://'):]
+    if paths is not None and not os.path.exists(path):
+        candidate = os.path.join(paths.root, path)
+        if os.path.exists(candidate):
+            return candidate
+    return path
+
+
+class ProjectPaths:
+    """Path tables of one project, each built on first use."""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._uids = None      # uid text -> res path
+        self._uid_of = None    # res path -> uid text
+        self._files = None     # res paths of every file outside hidden directories
+        self._sidecars = None  # res paths of the *.uid files
+        self._sidecars_read = False
+
+    def load(self):
+        """Builds every table now, e.g. before the object is pickled to worker processes."""
+        self._scan()
+        self._lookup('_uids', None)
+        if not self._sidecars_read:
+            self._read_sidecars()
+        return self
+
+    def to_res(self, filepath):
+        return 'res://' + os.path.relpath(os.path.abspath(filepath), self.root).replace(os.sep, '/')
+
+    def res_path(self, path):
+        """The res:// path of a res:// or uid:// path (normalized), or None for an unknown uid."""
+        if path.startswith(UID_PREFIX):
+            return self.uid_path(path)
+        if path.startswith('res://'):
+            rel = posixpath.normpath(path[len('res://'):])
+            return 'res://' if rel == '.' else 'res://' + rel
+        return None
+
+    def to_file(self, path):
+        """Absolute filesystem path of a res:// or uid:// path (not checked for existence), or None."""
+        res_path = self.res_path(path)
+        if res_path is None:
+            return None
+        return os.path.join(self.root, res_path[len('res://'):].replace('/', os.sep))
+
+    def uid_path(self, uid):
+        """res:// path of a 'uid://...' string, or None."""
+        return self._lookup('_uids', uid)
+
+    def uid_of(self, path):
+        """'uid://...' of a res:// path, or None."""
+        return self._lookup('_uid_of', self.res_path(path) or path)
+
+    def exists(self, path):
+        """Whether a res:// or uid:// path names an existing project file, from the file table."""
+        res_path = self.res_path(path)
+        if res_path is None:
+            return False
+        if '/.' in res_path[len('res:/'):]:
+            # Hidden directories (.godot/imported, ...) aren't indexed
+            return os.path.isfile(self.to_file(res_path))
+        return res_path in self.files
+
+    def _lookup(self, table, key):
+        # The editor's cache usually knows every uid; sidecars are only read
+        # (and then take precedence, as in Godot) when it doesn't
+        if self._uids is None:
+            self._uids = read_uid_cache(os.path.join(self.root, UID_CACHE))
+            self._uid_of = {path: uid for uid, path in self._uids.items()}
+        found = getattr(self, table).get(key)
+        if found is None and not self._sidecars_read:
+            self._read_sidecars()
+            found = getattr(self, table).get(key)
+        return found
+
+    def _read_sidecars(self):
+        self._sidecars_read = True
+        for sidecar in self._scan()[1]:
+            try:
+                with open(self.to_file(sidecar), 'r', encoding='utf-8') as f:
+                    uid = f.read().strip()
+            except (OSError, UnicodeDecodeError):
+                continue
+            if uid.startswith(UID_PREFIX):
+                path = sidecar[:-len(UID_SIDECAR)]
+                self._uids[uid] = path
+                self._uid_of[path] = uid
+
+    @property
+    def files(self):
+        return self._scan()[0]
+
+    def _scan(self):
+        if self._files is None:
+            files = set()
+            sidecars = []
+            for dirpath, dirnames, filenames in os.walk(self.root):
+                dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+                rel = os.path.relpath(dirpath, self.root).replace(os.sep, '/')
+                prefix = 'res://' if rel == '.' else f'res://{rel}/'
+                for filename in filenames:
+                    files.add(prefix + filename)
+                    if filename.endswith(UID_SIDECAR):
+                        sidecars.append(prefix + filename)
+            self._files = files
+            self._sidecars = sidecars
+        return self._files, self._sidecars
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resolve res:// and uid:// paths of a Godot project')
+    subparsers = parser.add_subparsers(dest='command')
+    resolve_parser = subparsers.add_parser('resolve', help='Print the file a path refers to')
+    resolve_parser.add_argument('path')
+    uid_parser = subparsers.add_parser('uid', help='Print the uid:// of a res:// path, or the reverse')
+    uid_parser.add_argument('path')
+    for sub in (resolve_parser, uid_parser):
+        sub.add_argument('--project', help='Project directory (default: search upwards from the CWD)')
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    if args.command == 'resolve':
+        filepath = resolve(args.path, args.project)
+        if filepath is None or not os.path.exists(filepath):
+            print(f"Error: {args.path} not found.", file=sys.stderr)
+            sys.exit(1)
+        print(filepath)
+        return
+
+    paths = project_for(args.project)
+    if paths is None:
+        print("Error: project.godot not found.", file=sys.stderr)
+        sys.exit(1)
+    other = paths.uid_path(args.path) if args.path.startswith(UID_PREFIX) else paths.uid_of(args.path)
+    if other is None:
+        print(f"Error: no uid known for {args.path}.", file=sys.stderr)
+        sys.exit(1)
+    print(other)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Opt-in per-phase timing and profiling for the skill scripts.
+
+Every script accepts:
+  --timings [FILE]   JSON-line spans to FILE (appended) or, without FILE, to stderr
+  --profile [FILE]   cProfile the run; binary pstats to FILE, or a top-25 table on stderr
+
+GODOT_SKILLS_TRACE=1 (or =stderr, or =/path/to/file) enables --timings for every
+run, e.g. a whole agent pipeline. Each span is one line:
+
+  {"ts": 1730000000.123, "pid": 4242, "script": "manage_project", "phase": "parse",
+   "ms": 0.41, "bytes": 5120, "keys": 120}
+
+Phases are read, parse, transform, render and write; each run ends with a
+"total" span. Lines are written with a single append each, so many processes can
+share one trace file. When tracing is off, span() returns a shared no-op object
+and costs one global lookup and a call.
+
+Other skills import this module by adding this directory to sys.path.
+"""
+
+import atexit
+import json
+import os
+import sys
+import time
+
+ENV_VAR = 'GODOT_SKILLS_TRACE'
+
+_sink = None      # open file (or sys.stderr) while tracing
+_owns_sink = False
+_script = None
+_started = None
+_profiler = None
+_profile_target = None
+_atexit_registered = False
+
+
+class Span:
+    """Times a `with` block and writes it as one JSON line; counts can be added with set()."""
+
+    __slots__ = ('phase', 'counts', 'start')
+
+    def __init__(self, phase, counts):
+        self.phase = phase
+        self.counts = counts
+
+    def set(self, **counts):
+        self.counts.update(counts)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.counts['error'] = exc_type.__name__
+        emit(self.phase, (time.perf_counter() - self.start) * 1000, **self.counts)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **counts):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+def enabled():
+    return _sink is not None
+
+
+def span(phase, **counts):
+    """`with span('parse', bytes=n) as s: ...; s.set(nodes=k)`. A no-op unless tracing."""
+    if _sink is None:
+        return NULL_SPAN
+    return Span(phase, counts)
+
+
+def emit(phase, ms, **counts):
+    if _sink is None:
+        return
+    record = {'ts': round(time.time(), 6), 'pid': os.getpid(), 'script': _script,
+              'phase': phase, 'ms': round(ms, 3)}
+    record.update(counts)
+    try:
+        _sink.write(json.dumps(record, separators=(',', ':')) + '\n')
+    except (OSError, ValueError):
+        pass  # tracing must never break the script
+
+
+def add_arguments(parser):
+    """Adds --timings/--profile to an argparse parser (or a subcommand's parser)."""
+    parser.add_argument('--timings', nargs='?', const='stderr', metavar='FILE',
+                        help=f'Write per-phase timings as JSON lines to FILE or stderr (also ${ENV_VAR})')
+    parser.add_argument('--profile', nargs='?', const='stderr', metavar='FILE',
+                        help='Profile with cProfile; write pstats to FILE or a summary to stderr')
+
+
+def setup(script, args=None):
+    """Configures tracing for this run from parsed args and the environment."""
+    global _sink, _owns_sink, _script, _started, _profiler, _profile_target, _atexit_registered
+    finish()
+    _script = script
+    _started = time.perf_counter()
+
+    target = getattr(args, 'timings', None) or os.environ.get(ENV_VAR) or None
+    if target and target not in ('0', 'false'):
+        if target in ('1', 'true', 'stderr'):
+            _sink = sys.stderr
+        else:
+            try:
+                # Line-buffered append: each span is a single write(), so agents can share a file
+                _sink = open(target, 'a', buffering=1, encoding='utf-8')
+                _owns_sink = True
+            except OSError as e:
+                print(f"Warning: can't open trace file {target}: {e}", file=sys.stderr)
+
+    _profile_target = getattr(args, 'profile', None)
+    if _profile_target:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+    if not _atexit_registered and (_sink is not None or _profiler is not None):
+        atexit.register(finish)
+        _atexit_registered = True
+
+
+def finish():
+    """
+    Ends the run: writes the "total" span, dumps the profile and closes the trace
+    file. Runs at exit; in-process hosts (skill_server.py) call it after each run.
+    """
+    global _sink, _owns_sink, _started, _profiler
+    if _sink is not None and _started is not None:
+        emit('total', (time.perf_counter() - _started) * 1000)
+    _started = None
+    if _profiler is not None:
+        _profiler.disable()
+        if _profile_target == 'stderr':
+            import pstats
+            pstats.Stats(_profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(25)
+        else:
+            _profiler.dump_stats(_profile_target)
+        _profiler = None
+    if _owns_sink:
+        _sink.close()
+    _sink = None
+    _owns_sink = False
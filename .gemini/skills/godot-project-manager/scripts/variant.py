@@ -0,0 +1,502 @@
+"""
+Parser and serializer for Godot's text Variant syntax, as used in project.godot,
+.tscn and .tres files.
+
+  loads('{"deadzone": 0.5, "events": [Object(InputEventKey,"keycode":65)]}')
+  dumps({'deadzone': 0.5, 'events': [GodotObject('InputEventKey', {'keycode': 65})]})
+
+Values map to Python as follows:
+
+  null, true, 1, 1.5, "s"     None, bool, int, float, str
+  &"name"                     StringName (a str subclass)
+  [1, 2], {"k": v}            list, dict (insertion-ordered, like Godot's)
+  Array[int]([1]), Dictionary[String, int]({...})
+                              TypedArray / TypedDictionary (list / dict with `type_spec`)
+  Vector2(1, 2), Color(...), NodePath("a/b"), ExtResource("1_x"), SubResource("y")
+                              Call(name, args)
+  Object(InputEventKey,"k":v) GodotObject(type, properties)
+  PackedFloat32Array(1, 2)    PackedArray(type, raw); decoded on first access
+
+dumps() writes what Godot's VariantWriter writes (multi-line dictionaries,
+Objects followed by a newline, integral vector components without ".0"), so
+loads(dumps(v)) == v and untouched values re-render the way the editor would.
+
+The text is split into tokens by a single regex findall() and assembled with an
+explicit stack, so deeply nested values can't hit the recursion limit. A packed
+array is one token: the regex skips its body in C and the raw text is kept,
+which is also what dumps() writes back unless the array was built from values.
+Megabytes of tile data thus cost one regex scan instead of millions of tokens.
+
+ValueScanner follows a value across lines (bracket depth and string state)
+for the line-based readers of project.godot and .tscn files.
+
+Other skills import this module by adding this directory to sys.path.
+"""
+
+import base64
+import math
+import re
+
+# One token per match, without groups, so loads() can tokenize with a single findall()
+TOKEN_PATTERN = re.compile(r'''
+    "[^"\\]*(?:\\.[^"\\]*)*"                                  # string
+  | Packed\w*Array\s*\((?:[^")]+|"[^"\\]*(?:\\.[^"\\]*)*")*\)  # a whole packed array
+  | [&^]"[^"\\]*(?:\\.[^"\\]*)*"                              # &"StringName" or ^"NodePath"
+  | [A-Za-z_]\w*(?:\s*\[[^\]]*\])?\s*\(?                     # identifier, Call( or Array[type](
+  | -inf\b
+  | [-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?                 # number
+  | [{}\[\](),:]
+  | \S                                                        # anything else is an error
+''', re.VERBOSE)
+STRING_PATTERN = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"', re.DOTALL)
+STRING_BODY_PATTERN = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'a': '\a', 'v': '\v',
+           '"': '"', "'": "'", '\\': '\\', '0': '\0'}
+ESCAPE_PATTERN = re.compile(r'\\(u[0-9a-fA-F]{4}|U[0-9a-fA-F]{6}|.)', re.DOTALL)
+
+PACKED_WIDTHS = {'PackedVector2Array': 2, 'PackedVector3Array': 3, 'PackedVector4Array': 4,
+                 'PackedColorArray': 4}
+PACKED_INTS = {'PackedByteArray', 'PackedInt32Array', 'PackedInt64Array'}
+CONSTANTS = {'true': True, 'false': False, 'null': None, 'nil': None,
+             'inf': math.inf, 'inf_neg': -math.inf, 'nan': math.nan}
+
+
+class VariantError(ValueError):
+    """Raised for text that isn't a valid Variant value."""
+
+
+class StringName(str):
+    """A StringName literal, written as &"name"."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return f'StringName({str.__repr__(self)})'
+
+
+class TypedArray(list):
+    """Array[type]([...]); `type_spec` is the text between the brackets, e.g. 'int'."""
+
+    def __init__(self, type_spec, values=()):
+        super().__init__(values)
+        self.type_spec = type_spec
+
+    def __eq__(self, other):
+        return list.__eq__(self, other) and getattr(other, 'type_spec', None) == self.type_spec
+
+    __hash__ = None
+
+
+class TypedDictionary(dict):
+    """Dictionary[key, value]({...}); `type_spec` is e.g. 'String, int'."""
+
+    def __init__(self, type_spec, values=()):
+        super().__init__(values)
+        self.type_spec = type_spec
+
+    def __eq__(self, other):
+        return dict.__eq__(self, other) and getattr(other, 'type_spec', None) == self.type_spec
+
+    __hash__ = None
+
+
+class Call:
+    """A constructor-style value: Vector2(1, 2), NodePath("a"), ExtResource("1_abc"), ..."""
+
+    __slots__ = ('name', 'args')
+
+    def __init__(self, name, args=()):
+        self.name = name
+        self.args = tuple(args)
+
+    def __eq__(self, other):
+        return isinstance(other, Call) and other.name == self.name and other.args == self.args
+
+    def __hash__(self):
+        return hash((self.name, self.args))
+
+    def __repr__(self):
+        return f'Call({self.name!r}, {self.args!r})'
+
+
+class GodotObject:
+    """An inline Object(Type,"property":value,...), e.g. an InputEvent in the input map."""
+
+    __slots__ = ('type', 'properties')
+
+    def __init__(self, type, properties=None):
+        self.type = type
+        self.properties = dict(properties or {})
+
+    def get(self, key, default=None):
+        return self.properties.get(key, default)
+
+    def __eq__(self, other):
+        return isinstance(other, GodotObject) and other.type == self.type \
+            and other.properties == self.properties
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'GodotObject({self.type!r}, {self.properties!r})'
+
+
+class PackedArray:
+    """
+    A Packed*Array kept as its raw text until its elements are needed.
+
+    len(), iteration and indexing decode the elements once (vectors and colors as
+    tuples); dumps() writes the raw text back untouched.
+    """
+
+    __slots__ = ('type', 'raw', '_values')
+
+    def __init__(self, type, raw):
+        self.type = type
+        self.raw = raw
+        self._values = None
+
+    @classmethod
+    def from_values(cls, type, values):
+        array = cls(type, None)
+        array._values = list(values)
+        array.raw = _encode_packed(type, array._values)
+        return array
+
+    @property
+    def values(self):
+        if self._values is None:
+            self._values = _decode_packed(self.type, self.raw)
+        return self._values
+
+    @property
+    def is_decoded(self):
+        return self._values is not None
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedArray) or other.type != self.type:
+            return False
+        return other.raw == self.raw or other.values == self.values
+
+    __hash__ = None
+
+    def __repr__(self):
+        state = f'{len(self._values)} values' if self._values is not None else f'{len(self.raw)} chars'
+        return f'<PackedArray {self.type} ({state})>'
+
+
+def _unescape(text):
+    def replace(m):
+        code = m.group(1)
+        if len(code) > 1:
+            return chr(int(code[1:], 16))
+        return ESCAPES.get(code, code)
+    return ESCAPE_PATTERN.sub(replace, text)
+
+
+def _decode_packed(type, raw):
+    raw = raw.strip()
+    if not raw:
+        return []
+    if type == 'PackedStringArray':
+        return [_unescape(v) if '\\' in v else v for v in STRING_PATTERN.findall(raw)]
+    if type == 'PackedByteArray' and raw[0] == '"':
+        return list(base64.b64decode(STRING_PATTERN.match(raw).group(1)))
+    try:
+        if type in PACKED_INTS:
+            return [int(x) for x in raw.split(',')]
+        numbers = [float(x) for x in raw.split(',')]
+    except ValueError as e:
+        raise VariantError(f"Invalid {type} data: {e}") from None
+    width = PACKED_WIDTHS.get(type)
+    if width:
+        return [tuple(numbers[i:i + width]) for i in range(0, len(numbers), width)]
+    return numbers
+
+
+def _encode_packed(type, values):
+    if type == 'PackedStringArray':
+        return ', '.join(_string(v) for v in values)
+    if type in PACKED_INTS:
+        return ', '.join(str(int(v)) for v in values)
+    if type in PACKED_WIDTHS:
+        return ', '.join(_component(c) for v in values for c in v)
+    return ', '.join(_component(v) for v in values)
+
+
+# Frame kinds and states of the parser stack
+_DICT, _LIST, _CALL, _OBJECT, _TYPED = range(5)
+_VALUE, _SEP, _KEY, _COLON, _TYPE, _CLOSE = range(6)
+_CLOSERS = {_DICT: '}', _LIST: ']', _CALL: ')', _OBJECT: ')', _TYPED: ')'}
+_CLOSABLE = {_DICT: (_KEY, _SEP), _LIST: (_VALUE, _SEP), _CALL: (_VALUE, _SEP), _OBJECT: (_SEP,),
+             _TYPED: (_CLOSE,)}
+_NUMBER_START = frozenset('0123456789-+.')
+
+
+def _fail(tokens, i, message):
+    near = ' '.join(t if len(t) <= 40 else t[:37] + '...' for t in tokens[max(0, i - 3):i + 1])
+    raise VariantError(f"{message} (near {near!r})" if near else message)
+
+
+def loads(text):
+    """Parses one Variant value; raises VariantError if the text isn't exactly one value."""
+    tokens = TOKEN_PATTERN.findall(text)
+    stack = []  # [kind, container, state, pending key, extra] per open bracket
+    i = -1
+    for i, token in enumerate(tokens):
+        c = token[0]
+        if c == '"':
+            if len(token) == 1:
+                _fail(tokens, i, "Unterminated string")
+            value = token[1:-1]
+            if '\\' in value:
+                value = _unescape(value)
+        elif c in ',:}])':
+            if not stack:
+                _fail(tokens, i, f"Unexpected '{c}'")
+            frame = stack[-1]
+            kind, state = frame[0], frame[2]
+            if c == ',':
+                if state != _SEP:
+                    _fail(tokens, i, "Unexpected ','")
+                frame[2] = _KEY if kind == _DICT or kind == _OBJECT else _VALUE
+                continue
+            if c == ':':
+                if state != _COLON:
+                    _fail(tokens, i, "Unexpected ':'")
+                frame[2] = _VALUE
+                continue
+            if c != _CLOSERS[kind] or state not in _CLOSABLE[kind]:
+                _fail(tokens, i, f"Unexpected '{c}'")
+            stack.pop()
+            if kind == _CALL:
+                value = Call(frame[4], frame[1])
+            elif kind == _TYPED:
+                name, type_spec = frame[4]
+                if name == 'Array':
+                    if not isinstance(frame[1], list):
+                        _fail(tokens, i, "Expected an array")
+                    value = TypedArray(type_spec, frame[1])
+                else:
+                    if not isinstance(frame[1], dict):
+                        _fail(tokens, i, "Expected a dictionary")
+                    value = TypedDictionary(type_spec, frame[1])
+            else:
+                value = frame[1]
+        elif c == '{':
+            stack.append([_DICT, {}, _KEY, None, None])
+            continue
+        elif c == '[':
+            stack.append([_LIST, [], _VALUE, None, None])
+            continue
+        elif c in _NUMBER_START:
+            if token == '-inf':
+                value = -math.inf
+            elif '.' in token or 'e' in token or 'E' in token:
+                value = float(token)
+            else:
+                try:
+                    value = int(token)
+                except ValueError:
+                    _fail(tokens, i, "Invalid number")
+        elif c == '&' or c == '^':
+            if len(token) == 1:
+                _fail(tokens, i, f"Unexpected '{c}'")
+            value = token[2:-1]
+            if '\\' in value:
+                value = _unescape(value)
+            value = StringName(value) if c == '&' else Call('NodePath', (value,))
+        elif c.isalpha() or c == '_':
+            last = token[-1]
+            if last == ')':
+                # A whole Packed*Array: kept raw, decoded on first access
+                paren = token.index('(')
+                value = PackedArray(token[:paren].rstrip(), token[paren + 1:-1].strip())
+            elif last == '(':
+                name = token[:-1].rstrip()
+                if '[' in name:
+                    name, _, type_spec = name.partition('[')
+                    name = name.rstrip()
+                    if name not in ('Array', 'Dictionary'):
+                        _fail(tokens, i, f"Invalid typed collection '{name}'")
+                    stack.append([_TYPED, None, _VALUE, None, (name, type_spec.rstrip()[:-1].strip())])
+                elif name == 'Object':
+                    stack.append([_OBJECT, None, _TYPE, None, None])
+                elif name.startswith('Packed') and name.endswith('Array'):
+                    _fail(tokens, i, f"Unterminated {name}")
+                else:
+                    stack.append([_CALL, [], _VALUE, None, name])
+                continue
+            elif stack and stack[-1][2] == _TYPE:
+                stack[-1][1] = GodotObject(token)
+                stack[-1][2] = _SEP
+                continue
+            elif token in CONSTANTS:
+                value = CONSTANTS[token]
+            else:
+                _fail(tokens, i, f"Unknown identifier '{token}'")
+        else:
+            _fail(tokens, i, f"Unexpected '{c}'")
+
+        # A complete value: the result, or the next item of the innermost container
+        if not stack:
+            if i != len(tokens) - 1:
+                _fail(tokens, i + 1, "Unexpected text after value")
+            return value
+        frame = stack[-1]
+        state = frame[2]
+        if state == _VALUE:
+            kind = frame[0]
+            if kind == _LIST or kind == _CALL:
+                frame[1].append(value)
+            elif kind == _DICT:
+                try:
+                    frame[1][frame[3]] = value
+                except TypeError:
+                    _fail(tokens, i, "Unhashable dictionary key")
+            elif kind == _OBJECT:
+                frame[1].properties[frame[3]] = value
+            else:
+                frame[1] = value
+                frame[2] = _CLOSE
+                continue
+            frame[2] = _SEP
+        elif state == _KEY and (frame[0] == _DICT or isinstance(value, str)):
+            frame[3] = value
+            frame[2] = _COLON
+        else:
+            _fail(tokens, i, "Expected ',' or a closing bracket")
+    _fail(tokens, i, "Unexpected end of value")
+
+
+def _string(s):
+    if '\\' in s:
+        s = s.replace('\\', '\\\\')
+    if '"' in s:
+        s = s.replace('"', '\\"')
+    return f'"{s}"'
+
+
+def _float(x):
+    if x != x:
+        return 'nan'
+    if x in (math.inf, -math.inf):
+        return 'inf' if x > 0 else 'inf_neg'
+    text = repr(x)
+    return text if ('.' in text or 'e' in text) else text + '.0'
+
+
+def _component(x):
+    """Numbers inside constructors and packed arrays: integral floats drop the '.0'."""
+    if isinstance(x, float):
+        if x.is_integer() and abs(x) < 1e16:
+            return str(int(x))
+        return _float(x)
+    return _write(x)
+
+
+def _write(value):
+    # Most common types first; bool before int since bool is an int
+    if isinstance(value, str):
+        if isinstance(value, StringName):
+            return '&' + _string(value)
+        return _string(value)
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return _float(value)
+    if isinstance(value, dict):
+        body = '{}' if not value else \
+            '{\n' + ',\n'.join(f'{_write(k)}: {_write(v)}' for k, v in value.items()) + '\n}'
+        if isinstance(value, TypedDictionary):
+            return f'Dictionary[{value.type_spec}]({body})'
+        return body
+    if isinstance(value, (list, tuple)):
+        body = '[' + ', '.join(_write(v) for v in value) + ']'
+        if isinstance(value, TypedArray):
+            return f'Array[{value.type_spec}]({body})'
+        return body
+    if isinstance(value, Call):
+        return f"{value.name}({', '.join(_component(a) for a in value.args)})"
+    if isinstance(value, GodotObject):
+        props = ''.join(f',{_string(k)}:{_write(v)}' for k, v in value.properties.items())
+        return f'Object({value.type}{props})\n'
+    if isinstance(value, PackedArray):
+        return f'{value.type}({value.raw})'
+    raise VariantError(f"Can't serialize {type(value).__name__} as a Variant")
+
+
+def dumps(value):
+    """Serializes a value the way Godot writes it (see the module docstring)."""
+    return _write(value).rstrip('\n')
+
+
+def is_value(text):
+    """True if `text` parses as exactly one Variant value."""
+    try:
+        loads(text)
+    except VariantError:
+        return False
+    return True
+
+
+class ValueScanner:
+    """
+    Follows a property value across pieces/lines by tracking bracket depth and
+    string state. Strings are skipped whole by a regex and brackets are counted
+    with str.count, so no Python code runs per character.
+    """
+
+    __slots__ = ('depth', 'in_string', 'skip_at')
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.skip_at = -1  # index of a character escaped by a preceding backslash
+
+    def feed(self, text):
+        start = 0
+        if self.in_string:
+            m = STRING_BODY_PATTERN.match(text, 1 if self.skip_at == 0 else 0)
+            start = m.end()
+            if start == len(text) or text[start] != '"':
+                # Still inside the string; a lone backslash at the end escapes the next piece's first char
+                self.skip_at = 0 if start < len(text) else -1
+                return self
+            self.in_string = False
+            start += 1
+        code = text[start:] if start else text
+        if '"' in code:
+            # Complete strings are cut out in one regex pass; a quote left over opens a string
+            code = STRING_PATTERN.sub('', code)
+            quote = code.find('"')
+            if quote != -1:
+                tail = code[quote + 1:]
+                code = code[:quote]
+                self.in_string = True
+                self.skip_at = 0 if STRING_BODY_PATTERN.match(tail).end() < len(tail) else -1
+        self.depth += code.count('[') + code.count('{') + code.count('(')
+        self.depth -= code.count(']') + code.count('}') + code.count(')')
+        if not self.in_string:
+            self.skip_at = -1
+        return self
+
+    @property
+    def is_open(self):
+        return self.depth > 0 or self.in_string
@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Godot Class Reference - Exact API lookups from the godot-docs class reference.
+
+Usage:
+  class_reference.py build [--docs docs/godot-docs] [--db PATH]
+  class_reference.py class CharacterBody2D [--json]
+  class_reference.py members CharacterBody2D [--kind signal] [--inherited] [--json]
+  class_reference.py lookup Node2D move_and_slide [--kind method] [--json]
+
+`build` compiles `classes/class_*.rst` into a symbol table: every class with its
+parent, and its methods, properties, signals, constants, enums, annotations and
+theme items with their signatures and one-line descriptions. The table is a
+SQLite file (default `<docs>/.rag_index/classes.sqlite`) that is rebuilt
+automatically when the .rst files change.
+
+Lookups resolve through inheritance: `lookup CharacterBody2D position` finds
+Node2D.position. `lookup` exits with 1 when the member doesn't exist, so it can
+answer "does X have Y" in scripts.
+
+Other skills import ClassReference / open_default() to validate node types and
+signal names; open_default() returns None when no class reference is available,
+so validation is skipped rather than failing.
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from doc_index import INDEX_DIRNAME, default_docs_path
+
+SCHEMA_VERSION = 1
+DB_FILENAME = 'classes.sqlite'
+ENV_VAR = 'GODOT_CLASS_DB'
+
+KINDS = ('method', 'property', 'signal', 'constant', 'enum', 'annotation', 'theme_item',
+         'constructor', 'operator')
+
+ANCHOR_PATTERN = re.compile(r'^\.\. _(class|enum)_(.+):\s*$')
+MEMBER_PATTERN = re.compile(
+    r'^(method|private_method|property|signal|constant|annotation|constructor|operator'
+    r'|theme_(?:color|constant|font_size|font|icon|style))_(.+)$'
+)
+PARENT_PATTERN = re.compile(r':ref:`[^`<]*<class_([^>`]+)>`')
+LINK_PATTERN = re.compile(r'\s*:ref:`🔗<[^`]*>`')
+ROLE_PATTERN = re.compile(r':\w+:`([^`<]*?)\s*(?:<[^`>]*>)?`')
+SUBSTITUTION_PATTERN = re.compile(r'\|(\w+)\|')
+DESCRIPTION_LIMIT = 400
+
+
+def clean(text):
+    """reStructuredText markup of a signature or description line -> plain text."""
+    text = LINK_PATTERN.sub('', text)
+    text = ROLE_PATTERN.sub(r'\1', text)
+    text = SUBSTITUTION_PATTERN.sub(lambda m: '...' if m.group(1) == 'vararg' else m.group(1), text)
+    text = text.replace('\\ ', '').replace('\\', '').replace('**', '').replace('``', '')
+    return ' '.join(text.split())
+
+
+def _paragraphs(lines):
+    para = []
+    for line in lines:
+        if line.strip():
+            para.append(line)
+        elif para:
+            yield para
+            para = []
+    if para:
+        yield para
+
+
+def _is_underline(line):
+    stripped = line.strip()
+    return len(stripped) >= 3 and stripped == stripped[0] * len(stripped) and stripped[0] in '=-~^*#'
+
+
+def _first_text(paragraphs, skip=()):
+    """First paragraph of plain text: not a directive, list, separator, heading or indented block."""
+    for para in paragraphs:
+        first = para[0]
+        if (first.startswith(('..', '-', '|', ' ', '\t', '+') + tuple(skip))
+                or _is_underline(para[-1])):
+            continue
+        text = clean(' '.join(line.strip() for line in para))
+        return text if len(text) <= DESCRIPTION_LIMIT else text[:DESCRIPTION_LIMIT - 3].rstrip() + '...'
+    return ''
+
+
+def _signature(paragraphs):
+    """The member's declaration line: the first paragraph that isn't a directive."""
+    for i, para in enumerate(paragraphs):
+        if not para[0].startswith('..'):
+            return clean(' '.join(line.strip() for line in para)).rstrip(':').rstrip(), paragraphs[i + 1:]
+    return '', []
+
+
+def parse_class_file(text):
+    """
+    Parses one `classes/class_*.rst` file. Returns (class info, members):
+    ({'name', 'inherits', 'brief'}, [(kind, name, signature, description)]),
+    or None if the file has no class anchor.
+    """
+    lines = text.splitlines()
+    anchors = []  # (line index, kind, name)
+    class_name = None
+    for i, line in enumerate(lines):
+        if not line.startswith('.. _'):
+            continue
+        m = ANCHOR_PATTERN.match(line)
+        if not m:
+            continue
+        group, target = m.groups()
+        if class_name is None:
+            if group != 'class':
+                continue
+            class_name = target
+            anchors.append((i, 'class', target))
+        elif group == 'enum':
+            prefix = class_name + '_'
+            if target.startswith(prefix):
+                anchors.append((i, 'enum', target[len(prefix):]))
+        elif target.startswith(class_name + '_'):
+            mm = MEMBER_PATTERN.match(target[len(class_name) + 1:])
+            if mm:
+                kind, name = mm.groups()
+                if kind == 'private_method':
+                    kind = 'method'
+                elif kind.startswith('theme_'):
+                    kind = 'theme_item'
+                anchors.append((i, kind, name))
+    if class_name is None:
+        return None
+
+    info = {'name': class_name, 'inherits': None, 'brief': ''}
+    members = []
+    for n, (start, kind, name) in enumerate(anchors):
+        end = anchors[n + 1][0] if n + 1 < len(anchors) else len(lines)
+        block = lines[start + 1:end]
+        if kind == 'class':
+            for line in block:
+                if line.startswith('**Inherits:**'):
+                    m = PARENT_PATTERN.search(line)
+                    info['inherits'] = m.group(1) if m else None
+                    break
+            info['brief'] = _first_text(_paragraphs(block), skip=('**Inherit', ':'))
+            continue
+        signature, rest = _signature(list(_paragraphs(block)))
+        members.append((kind, name, signature, _first_text(rest)))
+    return info, members
+
+
+def iter_class_files(docs_root):
+    classes_dir = os.path.join(docs_root, 'classes')
+    try:
+        entries = sorted(os.scandir(classes_dir), key=lambda e: e.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith('class_') and entry.name.endswith('.rst') and entry.is_file():
+            yield entry
+
+
+def source_fingerprint(docs_root):
+    """(file count, newest mtime_ns, total size) of the class reference; changes with any edit."""
+    count = newest = total = 0
+    for entry in iter_class_files(docs_root):
+        st = entry.stat()
+        count += 1
+        newest = max(newest, st.st_mtime_ns)
+        total += st.st_size
+    return f'{count}:{newest}:{total}'
+
+
+def default_db_path(docs_root):
+    return os.path.join(docs_root, INDEX_DIRNAME, DB_FILENAME)
+
+
+def build(docs_root, db_path, verbose=True):
+    """Compiles the class reference into a new SQLite file at `db_path`. Returns the class count."""
+    start = time.perf_counter()
+    fingerprint = source_fingerprint(docs_root)
+    classes = []
+    members = []
+    for entry in iter_class_files(docs_root):
+        with open(entry.path, 'r', encoding='utf-8', errors='replace') as f:
+            parsed = parse_class_file(f.read())
+        if parsed is None:
+            continue
+        info, class_members = parsed
+        classes.append((info['name'], info['inherits'], info['brief']))
+        members.extend((info['name'],) + member for member in class_members)
+
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    tmp_path = f'{db_path}.{os.getpid()}.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("CREATE TABLE classes (name TEXT PRIMARY KEY, inherits TEXT, brief TEXT)")
+        conn.execute("CREATE TABLE members (class TEXT, kind TEXT, name TEXT, signature TEXT, description TEXT)")
+        conn.executemany("INSERT OR REPLACE INTO classes VALUES (?, ?, ?)", classes)
+        conn.executemany("INSERT INTO members VALUES (?, ?, ?, ?, ?)", members)
+        # Created after the bulk insert, which is faster than maintaining it row by row
+        conn.execute("CREATE INDEX members_by_class ON members (class, kind, name)")
+        conn.execute("CREATE INDEX members_by_name ON members (name)")
+        conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                         [('source', fingerprint), ('docs', os.path.abspath(docs_root))])
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    if verbose:
+        print(f"Compiled {len(classes)} classes, {len(members)} members in "
+              f"{time.perf_counter() - start:.2f}s -> {db_path}", file=sys.stderr)
+    return len(classes)
+
+
+def ensure(docs_root, db_path=None, verbose=True):
+    """Builds the symbol table if it's missing, outdated or from an older version. Returns its path."""
+    db_path = db_path or default_db_path(docs_root)
+    try:
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        finally:
+            conn.close()
+        if version == SCHEMA_VERSION and row and row[0] == source_fingerprint(docs_root):
+            return db_path
+    except sqlite3.Error:
+        pass
+    build(docs_root, db_path, verbose)
+    return db_path
+
+
+class ClassReference:
+    """
+    Read-only view of a compiled symbol table.
+
+    Class records are loaded up front (about a thousand rows). Member names are
+    loaded per class and kind on first use and merged with the parent's, so
+    has_member() is a single set lookup after that.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True, check_same_thread=False)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.close()
+            raise ValueError(f"{db_path} was built by another version; rebuild it")
+        self.classes = {name: (inherits, brief) for name, inherits, brief
+                        in self.conn.execute("SELECT name, inherits, brief FROM classes")}
+        self._names = {}  # (class, kind) -> frozenset of member names, inherited ones included
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def has_class(self, name):
+        return name in self.classes
+
+    def ancestors(self, name):
+        """[name, parent, grandparent, ...] for a known class; [] otherwise."""
+        chain = []
+        while name in self.classes and name not in chain:
+            chain.append(name)
+            name = self.classes[name][0]
+        return chain
+
+    def is_a(self, name, base):
+        return base in self.ancestors(name)
+
+    def member_names(self, class_name, kind):
+        key = (class_name, kind)
+        names = self._names.get(key)
+        if names is None:
+            own = {row[0] for row in self.conn.execute(
+                "SELECT name FROM members WHERE class = ? AND kind = ?", key)}
+            parent = self.classes.get(class_name, (None,))[0]
+            if parent and parent != class_name:
+                own |= self.member_names(parent, kind)
+            names = self._names[key] = frozenset(own)
+        return names
+
+    def has_member(self, class_name, kind, name):
+        return name in self.member_names(class_name, kind)
+
+    def has_signal(self, class_name, name):
+        return name in self.member_names(class_name, 'signal')
+
+    def members(self, class_name, kind=None, inherited=False):
+        """[{'class', 'kind', 'name', 'signature', 'description'}] in declaration order."""
+        owners = self.ancestors(class_name) if inherited else [class_name]
+        results = []
+        for owner in owners:
+            query = "SELECT class, kind, name, signature, description FROM members WHERE class = ?"
+            params = [owner]
+            if kind:
+                query += " AND kind = ?"
+                params.append(kind)
+            results.extend(self._record(row) for row in self.conn.execute(query + " ORDER BY rowid", params))
+        return results
+
+    def lookup(self, class_name, name, kind=None):
+        """Every declaration of `name` on the nearest class in the inheritance chain that has it."""
+        for owner in self.ancestors(class_name):
+            query = "SELECT class, kind, name, signature, description FROM members WHERE class = ? AND name = ?"
+            params = [owner, name]
+            if kind:
+                query += " AND kind = ?"
+                params.append(kind)
+            rows = self.conn.execute(query + " ORDER BY rowid", params).fetchall()
+            if rows:
+                return [self._record(row) for row in rows]
+        return []
+
+    def describe(self, class_name):
+        inherits, brief = self.classes[class_name]
+        counts = dict(self.conn.execute(
+            "SELECT kind, COUNT(*) FROM members WHERE class = ? GROUP BY kind", (class_name,)))
+        return {'name': class_name, 'inherits': inherits, 'ancestors': self.ancestors(class_name)[1:],
+                'brief': brief, 'members': counts}
+
+    @staticmethod
+    def _record(row):
+        return dict(zip(('class', 'kind', 'name', 'signature', 'description'), row))
+
+
+def find_db(search_from=None, build_missing=True):
+    """
+    Locates the symbol table: $GODOT_CLASS_DB, else the docs checkout next to the
+    current directory or to `search_from` (a path inside a project). Compiles it
+    from the docs when needed and `build_missing` is set. Returns a path or None.
+    """
+    env_path = os.environ.get(ENV_VAR)
+    if env_path:
+        return env_path if os.path.exists(env_path) else None
+    bases = ['.']
+    if search_from:
+        current = os.path.dirname(os.path.abspath(search_from))
+        while True:
+            bases.append(current)
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+    for base in bases:
+        for candidate in ('docs/godot-docs', 'godot-gemini-plugin/docs/godot-docs'):
+            docs_root = os.path.join(base, candidate)
+            db_path = default_db_path(docs_root)
+            if os.path.isdir(os.path.join(docs_root, 'classes')):
+                if build_missing:
+                    try:
+                        return ensure(docs_root, db_path)
+                    except (OSError, sqlite3.Error):
+                        return None
+                return db_path if os.path.exists(db_path) else None
+            if os.path.exists(db_path):
+                return db_path
+    return None
+
+
+def open_default(search_from=None, db_path=None):
+    """A ClassReference for `db_path` or find_db(search_from), or None if unavailable."""
+    db_path = db_path or find_db(search_from)
+    if not db_path:
+        return None
+    try:
+        return ClassReference(db_path)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Warning: class reference {db_path} unusable ({e}).", file=sys.stderr)
+        return None
+
+
+SCRIPT_SIGNAL_PATTERN = re.compile(r'^\s*signal\s+(\w+)', re.MULTILINE)
+SCRIPT_EXTENDS_PATTERN = re.compile(r'^\s*extends\s+(?:"([^"]+)"|\'([^\']+)\'|([\w.]+))', re.MULTILINE)
+
+
+def script_signals(reference, script_path, resolve_path, _seen=None):
+    """
+    Signals a GDScript declares, including those of the scripts and engine class
+    it extends. Returns None when that can't be known (unreadable script, or a
+    base class that is neither an engine class nor a script path).
+    """
+    _seen = _seen if _seen is not None else set()
+    path = resolve_path(script_path)
+    if not path or path in _seen:
+        return None
+    _seen.add(path)
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            source = f.read()
+    except OSError:
+        return None
+    signals = set(SCRIPT_SIGNAL_PATTERN.findall(source))
+    m = SCRIPT_EXTENDS_PATTERN.search(source)
+    if m:
+        base_path = m.group(1) or m.group(2)
+        if base_path:
+            inherited = script_signals(reference, base_path, resolve_path, _seen)
+            if inherited is None:
+                return None
+            signals |= inherited
+        elif reference.has_class(m.group(3)):
+            signals |= reference.member_names(m.group(3), 'signal')
+        else:
+            return None  # a class_name script: not resolved here
+    return signals
+
+
+def validate_scene(reference, nodes, connections, resolve_path=None):
+    """
+    Checks a scene against the class reference. `nodes` are (path, type, script)
+    with type None for instanced scenes; `connections` are (signal, from path).
+    Signals declared by a node's script (resolved with `resolve_path(res_path)`)
+    count as well. Returns a list of problem messages.
+    """
+    problems = []
+    by_path = {}
+    for path, node_type, script in nodes:
+        by_path[path] = (node_type, script)
+        if node_type is None:
+            continue
+        if not reference.has_class(node_type):
+            problems.append(f"node '{path}': unknown type '{node_type}'")
+        elif not reference.is_a(node_type, 'Node'):
+            problems.append(f"node '{path}': '{node_type}' is not a Node type")
+
+    script_cache = {}
+    for signal, from_path in connections:
+        node_type, script = by_path.get(from_path, (None, None))
+        if node_type is None or not reference.has_class(node_type):
+            continue  # instanced, unknown or reported above
+        if reference.has_signal(node_type, signal):
+            continue
+        if script:
+            if script not in script_cache:
+                script_cache[script] = (script_signals(reference, script, resolve_path)
+                                        if resolve_path else None)
+            declared = script_cache[script]
+            if declared is None or signal in declared:
+                continue
+        problems.append(f"connection from '{from_path}': {node_type} has no signal '{signal}'")
+    return problems
+
+
+def print_members(members, show_owner=False):
+    for m in members:
+        owner = f"  [{m['class']}]" if show_owner else ''
+        print(f"{m['kind']:<11} {m['signature'] or m['name']}{owner}")
+        if m['description']:
+            print(f"            {m['description']}")
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--docs', help='Path to the godot-docs checkout (default: docs/godot-docs)')
+    common.add_argument('--db', help=f'Symbol table file (default: <docs>/{INDEX_DIRNAME}/{DB_FILENAME})')
+
+    parser = argparse.ArgumentParser(description='Exact lookups in the Godot class reference')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('build', parents=[common], help='Compile the class reference')
+    class_parser = subparsers.add_parser('class', parents=[common], help='Show a class and its ancestors')
+    class_parser.add_argument('name')
+    class_parser.add_argument('--json', action='store_true', help='Output JSON')
+    members_parser = subparsers.add_parser('members', parents=[common], help='List the members of a class')
+    members_parser.add_argument('name')
+    members_parser.add_argument('--kind', choices=KINDS)
+    members_parser.add_argument('--inherited', action='store_true', help='Include inherited members')
+    members_parser.add_argument('--json', action='store_true', help='Output JSON')
+    lookup_parser = subparsers.add_parser('lookup', parents=[common],
+                                          help='Find a member through the inheritance chain (exit 1 if missing)')
+    lookup_parser.add_argument('name')
+    lookup_parser.add_argument('member')
+    lookup_parser.add_argument('--kind', choices=KINDS)
+    lookup_parser.add_argument('--json', action='store_true', help='Output JSON')
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    docs_root = args.docs or default_docs_path()
+    db_path = args.db or default_db_path(docs_root)
+    if os.path.isdir(os.path.join(docs_root, 'classes')):
+        if args.command == 'build':
+            build(docs_root, db_path)
+            return
+        ensure(docs_root, db_path)
+    elif not os.path.exists(db_path):
+        print(f"Error: no class reference in {docs_root}/classes and no symbol table at {db_path}.")
+        sys.exit(1)
+    elif args.command == 'build':
+        print(f"Error: docs directory {docs_root}/classes not found.")
+        sys.exit(1)
+
+    with ClassReference(db_path) as reference:
+        if not reference.has_class(args.name):
+            print(f"Error: unknown class '{args.name}'.")
+            sys.exit(1)
+
+        if args.command == 'class':
+            info = reference.describe(args.name)
+            if args.json:
+                print(json.dumps(info, indent=2))
+                return
+            print(' < '.join([info['name']] + info['ancestors']))
+            if info['brief']:
+                print(info['brief'])
+            print(', '.join(f"{kind}: {count}" for kind, count in sorted(info['members'].items())) or 'No members.')
+        elif args.command == 'members':
+            members = reference.members(args.name, args.kind, args.inherited)
+            if args.json:
+                print(json.dumps(members, indent=2))
+            else:
+                print_members(members, show_owner=args.inherited)
+        else:
+            found = reference.lookup(args.name, args.member, args.kind)
+            if args.json:
+                print(json.dumps(found, indent=2))
+            elif found:
+                print_members(found, show_owner=True)
+            else:
+                kind = args.kind or 'member'
+                print(f"{args.name} has no {kind} '{args.member}'.")
+            if not found:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
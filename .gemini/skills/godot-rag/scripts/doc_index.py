@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Godot Docs Index - Ranked full-text search over the godot-docs .rst corpus.
+
+Usage:
+  doc_index.py build [--docs docs/godot-docs] [--index DIR]
+  doc_index.py search "query" [--docs docs/godot-docs] [-n 20] [--json] [--refresh]
+
+`build` splits every .rst file into sections (at reStructuredText headings),
+tokenizes them and writes an inverted index. Rebuilds are incremental: only files
+whose mtime or size changed are re-tokenized. `search` ranks sections with BM25
+(section titles count extra) and prints the best ones with a snippet. Before
+that, it stats the .rst files and compares their paths, mtimes and sizes with
+the ones the index was built from; if any file was added, removed or changed,
+it updates the index first.
+
+The index is a single file of flat uint32 arrays (sorted term table, postings,
+section lengths and metadata) read through mmap, so a query only touches the
+pages of the terms it looks up.
+"""
+
+import argparse
+import heapq
+import json
+import math
+import mmap
+import os
+import hashlib
+import re
+import struct
+import sys
+import time
+from array import array
+
+INDEX_VERSION = 1
+INDEX_DIRNAME = '.rag_index'
+INDEX_FILENAME = 'index.bin'
+FORWARD_FILENAME = 'files.json'  # per-file token counts, private to build()
+STAMP_FILENAME = 'files.stamp'   # digest of the (path, mtime, size) list the index was built from
+SKIPPED_DIRS = {'_static', '_build', '_templates'}
+
+MAGIC = b'GRAG'
+# magic, version, terms, sections, avgdl, then offsets of the 7 regions (see write_index)
+HEADER = struct.Struct('<4sIIId7Q')
+
+TITLE_WEIGHT = 3  # a title occurrence counts like this many body occurrences
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9_]+')
+HEADING_CHARS = set('=-~^*"#+\'`:.')
+STOPWORDS = frozenset(
+    'a an and are as at be by can for from has have how if in into is it its of on or '
+    'that the then this to was will with you your'.split()
+)
+
+
+def tokenize(text):
+    """Lowercased word tokens; snake_case identifiers also yield their parts."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(token)
+        if '_' in token:
+            tokens.extend(part for part in token.split('_') if part and part not in STOPWORDS)
+    return tokens
+
+
+def _is_underline(line, title):
+    stripped = line.rstrip()
+    return (len(stripped) >= max(3, len(title.strip())) and stripped[0] in HEADING_CHARS
+            and stripped == stripped[0] * len(stripped))
+
+
+def split_sections(text):
+    """Splits .rst text into [(title, first line number, body lines)] at headings."""
+    lines = text.splitlines()
+    sections = []
+    title, start, body = '', 1, []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        nxt = lines[i + 1] if i + 1 < len(lines) else ''
+        if line.strip() and not _is_underline(line, line) and nxt and _is_underline(nxt, line):
+            # "Title" followed by "=====" (an overline before it was already taken as body; drop it)
+            if body and _is_underline(body[-1], line):
+                body.pop()
+            if title or any(b.strip() for b in body):
+                sections.append((title, start, body))
+            title, start, body = line.strip(), i + 1, []
+            i += 2
+            continue
+        body.append(line)
+        i += 1
+    if title or any(b.strip() for b in body):
+        sections.append((title, start, body))
+    return sections
+
+
+def index_file(filepath):
+    """Returns [(title, line, line_count, {term: tf}, length)] for one .rst file."""
+    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    result = []
+    for title, line, body in split_sections(text):
+        counts = {}
+        for token in tokenize('\n'.join(body)):
+            counts[token] = counts.get(token, 0) + 1
+        for token in tokenize(title):
+            counts[token] = counts.get(token, 0) + TITLE_WEIGHT
+        if not counts:
+            continue
+        line_count = len(body) + (2 if title else 0)  # title and underline lines
+        result.append((title, line, line_count, counts, sum(counts.values())))
+    return result
+
+
+def iter_rst_files(docs_root):
+    for dirpath, dirnames, filenames in os.walk(docs_root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d not in SKIPPED_DIRS)
+        for filename in sorted(filenames):
+            if filename.endswith('.rst'):
+                yield os.path.join(dirpath, filename)
+
+
+def _u32(values):
+    arr = array('I', values)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def write_index(path, forward):
+    """
+    Builds the inverted index from the per-file forward data and writes it
+    atomically. Regions, in order: term offsets (n+1), posting offsets (n+1),
+    term blob (sorted UTF-8), postings as (section, tf) pairs, section lengths,
+    section metadata offsets (s+1), section metadata blob (JSON per section).
+    """
+    postings = {}
+    lengths = []
+    meta = []
+    for relpath in sorted(forward):
+        for title, line, line_count, counts, length in forward[relpath]['sections']:
+            section_id = len(lengths)
+            lengths.append(length)
+            meta.append(json.dumps([relpath, title, line, line_count], separators=(',', ':')).encode('utf-8'))
+            for term, tf in counts.items():
+                postings.setdefault(term, []).extend((section_id, tf))
+
+    terms = sorted(postings, key=lambda t: t.encode('utf-8'))
+    term_offsets = [0]
+    post_offsets = [0]
+    blob = bytearray()
+    flat = array('I')
+    for term in terms:
+        blob += term.encode('utf-8')
+        term_offsets.append(len(blob))
+        flat.extend(postings[term])
+        post_offsets.append(len(flat) // 2)
+    if sys.byteorder != 'little':
+        flat.byteswap()
+    meta_offsets = [0]
+    meta_blob = bytearray()
+    for m in meta:
+        meta_blob += m
+        meta_offsets.append(len(meta_blob))
+
+    regions = [_u32(term_offsets), _u32(post_offsets), bytes(blob), flat.tobytes(),
+               _u32(lengths), _u32(meta_offsets), bytes(meta_blob)]
+    avgdl = sum(lengths) / len(lengths) if lengths else 0.0
+    offsets = []
+    position = HEADER.size
+    for region in regions:
+        position += -position % 4  # keep uint32 arrays aligned
+        offsets.append(position)
+        position += len(region)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, INDEX_VERSION, len(terms), len(lengths), avgdl, *offsets))
+        for offset, region in zip(offsets, regions):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(region)
+    os.replace(tmp_path, path)
+    return len(terms), len(lengths)
+
+
+class DocIndex:
+    """Read-only view of index.bin through mmap."""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.n_terms, self.n_sections, self.avgdl, *offsets = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} docs index")
+        view = memoryview(self.map)
+        n, s = self.n_terms, self.n_sections
+        o_terms, o_posts, o_blob, o_postings, o_lengths, o_meta, o_meta_blob = offsets
+        self.term_offsets = view[o_terms:o_terms + 4 * (n + 1)].cast('I')
+        self.post_offsets = view[o_posts:o_posts + 4 * (n + 1)].cast('I')
+        self.term_blob = view[o_blob:o_blob + self.term_offsets[n]] if n else view[0:0]
+        self.postings = view[o_postings:o_postings + 8 * self.post_offsets[n]].cast('I') if n else None
+        self.lengths = view[o_lengths:o_lengths + 4 * s].cast('I')
+        self.meta_offsets = view[o_meta:o_meta + 4 * (s + 1)].cast('I')
+        self.meta_blob = view[o_meta_blob:o_meta_blob + self.meta_offsets[s]] if s else view[0:0]
+        self._views = [self.term_offsets, self.post_offsets, self.term_blob, self.postings,
+                       self.lengths, self.meta_offsets, self.meta_blob, view]
+
+    def close(self):
+        for v in getattr(self, '_views', []):
+            if v is not None:
+                v.release()
+        self._views = []
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _term_id(self, term):
+        """Binary search over the sorted term table."""
+        key = term.encode('utf-8')
+        lo, hi = 0, self.n_terms
+        offsets, blob = self.term_offsets, self.term_blob
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = bytes(blob[offsets[mid]:offsets[mid + 1]])
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def postings_for(self, term):
+        """[(section id, tf), ...] for a term (empty if unknown)."""
+        term_id = self._term_id(term)
+        if term_id is None:
+            return []
+        start, end = self.post_offsets[term_id], self.post_offsets[term_id + 1]
+        flat = self.postings[2 * start:2 * end].tolist()
+        if sys.byteorder != 'little':
+            flat = array('I', flat)
+            flat.byteswap()
+            flat = flat.tolist()
+        return list(zip(flat[0::2], flat[1::2]))
+
+    def section(self, section_id):
+        """(relpath, title, line, line_count) of a section."""
+        start, end = self.meta_offsets[section_id], self.meta_offsets[section_id + 1]
+        return tuple(json.loads(bytes(self.meta_blob[start:end])))
+
+    def search(self, query, limit=20):
+        """Returns [(score, section id)] ranked by BM25."""
+        n = self.n_sections
+        avgdl = self.avgdl or 1.0
+        lengths = self.lengths
+        norms = {}  # section id -> BM25 length normalization, computed on first use
+        scores = {}
+        get = scores.get
+        for term in dict.fromkeys(tokenize(query)):
+            postings = self.postings_for(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            weight = idf * (BM25_K1 + 1)
+            for section_id, tf in postings:
+                norm = norms.get(section_id)
+                if norm is None:
+                    norm = norms[section_id] = BM25_K1 * (1 - BM25_B + BM25_B * lengths[section_id] / avgdl)
+                scores[section_id] = get(section_id, 0.0) + weight * tf / (tf + norm)
+        ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(score, section_id) for section_id, score in ranked]
+
+
+def _file_stats(docs_root):
+    """[(relpath, mtime_ns, size)] of every .rst file, in walk order."""
+    stats = []
+    for filepath in iter_rst_files(docs_root):
+        st = os.stat(filepath)
+        stats.append((os.path.relpath(filepath, docs_root).replace(os.sep, '/'), st.st_mtime_ns, st.st_size))
+    return stats
+
+
+def _stamp(stats):
+    return hashlib.blake2b(json.dumps(stats).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def is_current(docs_root, index_dir):
+    """Whether the index was built from the .rst files as they are now (a stat per file, nothing parsed)."""
+    try:
+        with open(os.path.join(index_dir, STAMP_FILENAME), 'r') as f:
+            stamp = f.read().strip()
+    except OSError:
+        return False
+    return stamp == _stamp(_file_stats(docs_root)) and os.path.exists(os.path.join(index_dir, INDEX_FILENAME))
+
+
+def _write_atomic(path, text):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def default_docs_path():
+    for candidate in ('docs/godot-docs', '../docs/godot-docs', 'godot-gemini-plugin/docs/godot-docs'):
+        if os.path.isdir(candidate):
+            return candidate
+    return 'docs/godot-docs'
+
+
+def build(docs_root, index_dir, verbose=True):
+    """Incrementally (re)builds the index. Returns (files re-tokenized, total files)."""
+    os.makedirs(index_dir, exist_ok=True)
+    forward_path = os.path.join(index_dir, FORWARD_FILENAME)
+    forward = {}
+    try:
+        with open(forward_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and data.get('version') == INDEX_VERSION and isinstance(data.get('files'), dict):
+            forward = data['files']
+    except (OSError, ValueError):
+        pass
+
+    start = time.perf_counter()
+    current = {}
+    changed = 0
+    stats = _file_stats(docs_root)
+    for relpath, mtime_ns, size in stats:
+        entry = forward.get(relpath)
+        if not isinstance(entry, dict) or entry.get('mtime_ns') != mtime_ns or entry.get('size') != size:
+            entry = {'mtime_ns': mtime_ns, 'size': size,
+                     'sections': index_file(os.path.join(docs_root, relpath))}
+            changed += 1
+        current[relpath] = entry
+
+    index_path = os.path.join(index_dir, INDEX_FILENAME)
+    if changed or len(current) != len(forward) or not os.path.exists(index_path):
+        n_terms, n_sections = write_index(index_path, current)
+        _write_atomic(forward_path, json.dumps({'version': INDEX_VERSION, 'files': current},
+                                               separators=(',', ':')))
+        _write_atomic(os.path.join(index_dir, STAMP_FILENAME), _stamp(stats))
+        if verbose:
+            print(f"Indexed {len(current)} files ({changed} re-tokenized), {n_sections} sections, "
+                  f"{n_terms} terms in {time.perf_counter() - start:.2f}s -> {index_path}", file=sys.stderr)
+    else:
+        _write_atomic(os.path.join(index_dir, STAMP_FILENAME), _stamp(stats))
+        if verbose:
+            print(f"Index up to date ({len(current)} files).", file=sys.stderr)
+    return changed, len(current)
+
+
+def snippet(docs_root, relpath, line, line_count, terms, titled=True, width=3):
+    """The `width` body lines of a section, starting at the one that mentions the most query terms."""
+    try:
+        with open(os.path.join(docs_root, relpath), 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()[line - 1:line - 1 + line_count]
+    except OSError:
+        return ''
+    if titled:
+        lines = lines[2:]  # the title is shown separately
+    lines = [t for t in lines if t.strip() and not _is_underline(t, t)]
+    terms = set(terms)
+    best, best_hits = 0, -1
+    for i, text in enumerate(lines):
+        hits = len(terms.intersection(tokenize(text)))
+        if hits > best_hits:
+            best, best_hits = i, hits
+    return ' '.join(t.strip() for t in lines[best:best + width])[:300]
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--docs', help='Path to the godot-docs checkout (default: docs/godot-docs)')
+    common.add_argument('--index', help=f'Index directory (default: <docs>/{INDEX_DIRNAME})')
+
+    parser = argparse.ArgumentParser(description='Indexed, ranked search over the Godot docs')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('build', parents=[common], help='Build or incrementally update the index')
+    search_parser = subparsers.add_parser('search', parents=[common], help='Ranked search')
+    search_parser.add_argument('query')
+    search_parser.add_argument('-n', '--limit', type=int, default=20, help='Number of results (default: 20)')
+    search_parser.add_argument('--json', action='store_true', help='Output JSON')
+    search_parser.add_argument('--refresh', action='store_true',
+                               help='Re-read the per-file cache and re-index changed files first')
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    docs_root = args.docs or default_docs_path()
+    if not os.path.isdir(docs_root):
+        print(f"Error: docs directory {docs_root} not found.")
+        sys.exit(1)
+    index_dir = args.index or os.path.join(docs_root, INDEX_DIRNAME)
+    index_path = os.path.join(index_dir, INDEX_FILENAME)
+
+    if args.command == 'build':
+        build(docs_root, index_dir)
+        return
+
+    if args.refresh or not is_current(docs_root, index_dir):
+        build(docs_root, index_dir)
+    try:
+        index = DocIndex(index_path)
+    except ValueError:
+        build(docs_root, index_dir)  # older format: rebuild
+        index = DocIndex(index_path)
+
+    with index:
+        ranked = index.search(args.query, args.limit)
+        terms = tokenize(args.query)
+        results = []
+        for score, section_id in ranked:
+            relpath, title, line, line_count = index.section(section_id)
+            results.append({
+                'file': os.path.join(docs_root, relpath),
+                'line': line,
+                'title': title,
+                'score': round(score, 3),
+                'snippet': snippet(docs_root, relpath, line, line_count, terms, bool(title)),
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    if not results:
+        print("No results.")
+        sys.exit(1)
+    for r in results:
+        print(f"{r['file']}:{r['line']}: [{r['score']:.2f}] {r['title'] or '(untitled)'}")
+        if r['snippet']:
+            print(f"    {r['snippet']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,23 @@
 
 # Search the Godot documentation for a query.
 # Usage: ./search_docs.sh "query" [path_to_docs]
+#
+# Results are ranked by doc_index.py (BM25 over an index built on first use).
+# Falls back to grep when python3 is not available.
 
 QUERY=$1
 DOCS_PATH=${2:-"docs/godot-docs"}
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
 if [ -z "$QUERY" ]; then
     echo "Usage: $0 "query" [path_to_docs]"
     exit 1
 fi
 
+if command -v python3 >/dev/null 2>&1; then
+    exec python3 "$SCRIPT_DIR/doc_index.py" search "$QUERY" --docs "$DOCS_PATH" -n 20
+fi
+
 # Search for the query in .rst files, ignoring some common directories
 # Limit results to 20 matches to avoid context overflow
 grep -rniE "$QUERY" "$DOCS_PATH" --include="*.rst" --exclude-dir={_static,_build,_templates} | head -n 20
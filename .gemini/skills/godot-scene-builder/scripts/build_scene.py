@@ -10,28 +10,65 @@ Usage:
     --scripts "NodeName=res://script.gd" \
     --resources "NodeName.property=res://resource.tres:ResourceType" \
     --subresources "SubResType:prop1=val1,prop2=val2" \
-    --connections "FromNode:signal_name:ToNode:method_name"
+    --connections "FromNode:signal_name:ToNode:method_name" \
+    --validate
+
+  python3 build_scene.py --manifest scenes.json   # or - for stdin (JSON or NDJSON)
 """
 
 import argparse
+import hashlib
+import json
 import os
 import sys
 import random
 import string
-
-
-def generate_id(prefix=""):
-    """Generate a unique resource ID like '1_abcde'."""
-    suffix = ''.join(random.choices(string.ascii_lowercase, k=5))
-    return f"{prefix}_{suffix}" if prefix else suffix
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-project-manager', 'scripts'))
+import project_paths  # noqa: E402
+import skill_trace  # noqa: E402
+
+# class_reference (and with it sqlite3 and doc_index) is imported where --validate needs it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-rag', 'scripts'))
+
+
+class SceneSpecError(ValueError):
+    """Raised for malformed node/script/connection/sub-resource specs."""
+
+
+def generate_id(prefix="", seed=None, used=None):
+    """
+    Generate a resource ID like '1_abcde'.
+
+    With a `seed` (e.g. the resource type and path) the suffix is derived from it,
+    so rebuilding an identical scene yields identical IDs. IDs already in `used`
+    are skipped by re-hashing with a counter; the new ID is added to `used`.
+    """
+    attempt = 0
+    while True:
+        if seed is None:
+            suffix = ''.join(random.choices(string.ascii_lowercase, k=5))
+        else:
+            digest = hashlib.blake2b(f"{seed}#{attempt}".encode('utf-8'), digest_size=5).digest()
+            suffix = ''.join(string.ascii_lowercase[b % 26] for b in digest)
+        rid = f"{prefix}_{suffix}" if prefix else suffix
+        if used is None or rid not in used:
+            break
+        attempt += 1
+    if used is not None:
+        used.add(rid)
+    return rid
 
 
 def parse_node_spec(spec):
     """Parse 'Name:Type:Parent' into a dict."""
     parts = spec.split(":")
     if len(parts) < 2:
-        print(f"Error: Invalid node spec '{spec}'. Expected 'Name:Type' or 'Name:Type:Parent'.")
-        sys.exit(1)
+        raise SceneSpecError(f"Invalid node spec '{spec}'. Expected 'Name:Type' or 'Name:Type:Parent'.")
     return {
         'name': parts[0],
         'type': parts[1],
@@ -43,8 +80,7 @@ def parse_script_spec(spec):
     """Parse 'NodeName=res://path.gd' into a tuple."""
     parts = spec.split("=", 1)
     if len(parts) != 2:
-        print(f"Error: Invalid script spec '{spec}'. Expected 'NodeName=res://path.gd'.")
-        sys.exit(1)
+        raise SceneSpecError(f"Invalid script spec '{spec}'. Expected 'NodeName=res://path.gd'.")
     return parts[0], parts[1]
 
 
@@ -52,8 +88,7 @@ def parse_connection_spec(spec):
     """Parse 'FromNode:signal:ToNode:method' into a dict."""
     parts = spec.split(":")
     if len(parts) != 4:
-        print(f"Error: Invalid connection spec '{spec}'. Expected 'From:signal:To:method'.")
-        sys.exit(1)
+        raise SceneSpecError(f"Invalid connection spec '{spec}'. Expected 'From:signal:To:method'.")
     return {
         'from': parts[0],
         'signal': parts[1],
@@ -69,6 +104,8 @@ def parse_subresource_spec(spec):
     props = {}
     if len(parts) > 1 and parts[1]:
         for pair in parts[1].split(","):
+            if "=" not in pair:
+                raise SceneSpecError(f"Invalid sub-resource spec '{spec}'. Expected 'Type:prop=val,prop2=val2'.")
             k, v = pair.split("=", 1)
             props[k.strip()] = v.strip()
     return {'type': rtype, 'properties': props}
@@ -82,9 +119,10 @@ def build_tscn(root_spec, node_specs, script_map, connections, subresource_specs
     ext_resources = []
     ext_id_counter = 1
     script_ext_ids = {}  # node_name -> ext_resource_id
+    used_ids = set()
 
     for node_name, script_path in script_map.items():
-        rid = generate_id(str(ext_id_counter))
+        rid = generate_id(str(ext_id_counter), seed=f"Script:{script_path}", used=used_ids)
         ext_resources.append({
             'type': 'Script',
             'path': script_path,
@@ -157,41 +195,322 @@ def build_tscn(root_spec, node_specs, script_map, connections, subresource_specs
     return '\n'.join(lines) + '\n'
 
 
+def check_scene(root_spec, node_specs, script_map, connections, reference):
+    """
+    Validates node types and connection signals against the Godot class reference
+    (see godot-rag/scripts/class_reference.py). Returns a list of problem messages.
+    """
+    import class_reference  # only needed with --validate
+
+    root = parse_node_spec(root_spec)
+    nodes = [('.', root['type'], script_map.get(root['name']))]
+    for spec in node_specs:
+        node = parse_node_spec(spec)
+        parent = node['parent'] or '.'
+        path = node['name'] if parent == '.' else f"{parent}/{node['name']}"
+        nodes.append((path, node['type'], script_map.get(node['name'])))
+    signals = []
+    for spec in connections:
+        conn = parse_connection_spec(spec)
+        signals.append((conn['signal'], '.' if conn['from'] == root['name'] else conn['from']))
+    return class_reference.validate_scene(reference, nodes, signals, resolve_output_path)
+
+
+def resolve_output_path(output_path):
+    """Maps res:// and uid:// paths onto the project directory (relative to the CWD); None for an unknown uid."""
+    if output_path.startswith(("res://", "uid://")):
+        resolved = project_paths.resolve(output_path)
+        return os.path.relpath(resolved) if resolved is not None else None
+    return output_path
+
+
+def write_scene(output_path, content, incremental=False):
+    """
+    Write a scene file, creating its parent directory. Returns True if written.
+
+    With `incremental`, the file is left untouched (mtime included) when its
+    content hash already matches the rendered scene, so Godot doesn't re-import it.
+    """
+    data = content.encode('utf-8')
+    if incremental and os.path.exists(output_path) and os.path.getsize(output_path) == len(data):
+        with open(output_path, 'rb') as f:
+            if hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest():
+                return False
+    os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+    with open(output_path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def _as_spec_list(value, joiner, field):
+    """Manifest fields accept CLI-style spec strings or objects/pairs."""
+    if isinstance(value, dict):
+        value = [f"{k}{joiner}{v}" for k, v in value.items()]
+    return _string_list(value, field)
+
+
+def _string_list(value, field):
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise SceneSpecError(f"'{field}' must be a list of strings.")
+    return value
+
+
+def scene_from_definition(definition):
+    """
+    Turns a manifest scene definition into build_tscn() arguments.
+
+    {"output": "res://scenes/level_1.tscn", "root": "Level1:Node2D",
+     "nodes": ["Player:CharacterBody2D:."] or [{"name": ..., "type": ..., "parent": ...}],
+     "scripts": {"Player": "res://scripts/player.gd"}, "subresources": [...],
+     "connections": ["Player:died:.:_on_player_died"]}
+    """
+    if isinstance(definition, SceneSpecError):
+        raise definition  # an unreadable manifest entry, see iter_manifest()
+    if not isinstance(definition, dict):
+        raise SceneSpecError("Scene definition must be a JSON object.")
+    for field in ('output', 'root'):
+        if not definition.get(field):
+            raise SceneSpecError(f"Scene definition is missing '{field}'.")
+        if not isinstance(definition[field], str):
+            raise SceneSpecError(f"'{field}' must be a string.")
+
+    nodes = []
+    entries = definition.get('nodes') or []
+    if not isinstance(entries, list):
+        raise SceneSpecError("'nodes' must be a list.")
+    for node in entries:
+        if isinstance(node, dict):
+            fields = [node.get('name', ''), node.get('type', ''), node.get('parent') or '.']
+            if not all(isinstance(f, str) for f in fields):
+                raise SceneSpecError(f"Node {json.dumps(node)}: 'name', 'type' and 'parent' must be strings.")
+            node = ":".join(fields)
+        elif not isinstance(node, str):
+            raise SceneSpecError(f"Node {json.dumps(node)} must be a spec string or an object.")
+        nodes.append(node)
+
+    script_map = {}
+    for spec in _as_spec_list(definition.get('scripts'), '=', 'scripts'):
+        node_name, path = parse_script_spec(spec)
+        script_map[node_name] = path
+
+    return {
+        'output': definition['output'],
+        'root_spec': definition['root'],
+        'node_specs': nodes,
+        'script_map': script_map,
+        'connections': _string_list(definition.get('connections'), 'connections'),
+        'subresource_specs': _string_list(definition.get('subresources'), 'subresources'),
+    }
+
+
+def iter_manifest(stream):
+    """
+    Yields scene definitions from a JSON array, a {"scenes": [...]} object, a
+    single definition object, or NDJSON (one definition per line, read lazily).
+
+    A malformed NDJSON line is yielded as a SceneSpecError naming the line, so
+    build_scenes() reports it as failed and goes on with the next one. A
+    malformed JSON document raises SceneSpecError before anything is built.
+    """
+    first = ''
+    first_lineno = 0
+    for first_lineno, line in enumerate(stream, 1):
+        if line.strip():
+            first = line
+            break
+    if not first:
+        return
+    try:
+        head = json.loads(first)
+    except json.JSONDecodeError:
+        head = None
+    if isinstance(head, dict) and 'scenes' not in head:
+        # NDJSON: one scene per line
+        yield head
+        for lineno, line in enumerate(stream, first_lineno + 1):
+            if line.strip():
+                try:
+                    yield json.loads(line.strip())
+                except json.JSONDecodeError as e:
+                    yield SceneSpecError(f"Manifest line {lineno}: invalid JSON ({e.msg}, column {e.colno}).")
+        return
+    if head is None:
+        try:
+            document = json.loads(first + stream.read())
+        except json.JSONDecodeError as e:
+            raise SceneSpecError(f"Manifest line {e.lineno + first_lineno - 1}: invalid JSON "
+                                 f"({e.msg}, column {e.colno}).") from None
+    else:
+        document = head
+    if isinstance(document, dict):
+        # A pretty-printed single definition, or {"scenes": [...]}
+        scenes = document['scenes'] if 'scenes' in document else [document]
+    else:
+        scenes = document
+    if not isinstance(scenes, list):
+        raise SceneSpecError("Manifest must be a list of scene definitions.")
+    for definition in scenes:
+        yield definition
+
+
+def build_scenes(definitions, jobs=None, incremental=False, reference=None):
+    """
+    Builds every scene definition in-process and writes the files on a thread pool.
+
+    Importable entry point for generators: pass an iterable of definitions (see
+    scene_from_definition). With `incremental`, unchanged files are not rewritten.
+    With a class_reference.ClassReference, scenes that fail check_scene() are not written.
+    An entry whose output file an earlier entry already writes fails instead of
+    racing it on the pool.
+    Returns {'written': [paths], 'unchanged': [paths], 'failed': [(output, error)],
+    'nodes': total node count, 'seconds': elapsed}.
+    """
+    start = time.perf_counter()
+    written = []
+    unchanged = []
+    failed = []
+    node_count = 0
+    pending = []
+    claimed = {}  # normalized output file -> number of the entry writing it
+
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        # Writes overlap with rendering; 'write' only measures the wait for the remaining ones
+        with skill_trace.span('render') as s:
+            rendered_bytes = 0
+            for entry, definition in enumerate(definitions, 1):
+                output = definition.get('output') if isinstance(definition, dict) else None
+                try:
+                    scene = scene_from_definition(definition)
+                    content = build_tscn(scene['root_spec'], scene['node_specs'], scene['script_map'],
+                                         scene['connections'], scene['subresource_specs'])
+                    if reference is not None:
+                        problems = check_scene(scene['root_spec'], scene['node_specs'], scene['script_map'],
+                                               scene['connections'], reference)
+                        if problems:
+                            raise SceneSpecError('; '.join(problems))
+                except SceneSpecError as e:
+                    failed.append((output, str(e)))
+                    continue
+                output_path = resolve_output_path(scene['output'])
+                if output_path is None:
+                    failed.append((output, f"Unknown uid: {scene['output']}"))
+                    continue
+                key = os.path.normcase(os.path.abspath(output_path))
+                if key in claimed:
+                    failed.append((output, f"Entry {entry}: same output file as entry {claimed[key]}; not written."))
+                    continue
+                claimed[key] = entry
+                node_count += len(scene['node_specs']) + 1
+                rendered_bytes += len(content)
+                pending.append((output, output_path, pool.submit(write_scene, output_path, content, incremental)))
+            s.set(scenes=len(pending), nodes=node_count, bytes=rendered_bytes)
+
+        with skill_trace.span('write') as s:
+            for output, output_path, future in pending:
+                try:
+                    (written if future.result() else unchanged).append(output_path)
+                except OSError as e:
+                    failed.append((output, str(e)))
+            s.set(written=len(written), unchanged=len(unchanged))
+
+    return {
+        'written': written,
+        'unchanged': unchanged,
+        'failed': failed,
+        'nodes': node_count,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def run_manifest(source, jobs=None, incremental=False, reference=None):
+    try:
+        if source == '-':
+            summary = build_scenes(iter_manifest(sys.stdin), jobs, incremental, reference)
+        else:
+            with open(source, 'r') as f:
+                summary = build_scenes(iter_manifest(f), jobs, incremental, reference)
+    except (OSError, SceneSpecError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    for output, error in summary['failed']:
+        print(f"Error: {output or '<scene>'}: {error}")
+    print(f"Scenes written: {len(summary['written'])}")
+    print(f"  Unchanged: {len(summary['unchanged'])}")
+    print(f"  Failed: {len(summary['failed'])}")
+    print(f"  Nodes: {summary['nodes']}")
+    print(f"  Time: {summary['seconds']:.2f}s")
+    if summary['failed']:
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate a Godot .tscn scene file.')
-    parser.add_argument('--output', required=True, help='Output path for the .tscn file')
-    parser.add_argument('--root', required=True, help='Root node as "Name:Type"')
+    parser.add_argument('--output', help='Output path for the .tscn file')
+    parser.add_argument('--root', help='Root node as "Name:Type"')
     parser.add_argument('--nodes', nargs='*', default=[], help='Child nodes as "Name:Type:Parent"')
     parser.add_argument('--scripts', nargs='*', default=[], help='Script attachments as "NodeName=res://path.gd"')
     parser.add_argument('--subresources', nargs='*', default=[], help='Sub-resources as "Type:prop=val,prop2=val2"')
     parser.add_argument('--connections', nargs='*', default=[], help='Signal connections as "From:signal:To:method"')
+    parser.add_argument('--manifest', help='Build every scene in a JSON/NDJSON manifest (file, or - for stdin)')
+    parser.add_argument('--jobs', type=int, help='Writer threads for --manifest')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Skip writing scenes whose content is unchanged on disk')
+    parser.add_argument('--validate', action='store_true',
+                        help='Reject unknown node types and signals (needs the godot-docs class reference)')
+    parser.add_argument('--class-db', help='Class reference symbol table (default: found next to docs/godot-docs)')
+    skill_trace.add_arguments(parser)
 
     args = parser.parse_args()
+    skill_trace.setup('build_scene', args)
+
+    reference = None
+    if args.validate or args.class_db:
+        import class_reference
+        reference = class_reference.open_default(args.manifest or args.output, args.class_db)
+        if reference is None:
+            print("Warning: Godot class reference not found; skipping validation.", file=sys.stderr)
+
+    if args.manifest:
+        run_manifest(args.manifest, args.jobs, args.incremental, reference)
+        return
+    if not args.output or not args.root:
+        parser.error('--output and --root are required (or use --manifest)')
+
+    try:
+        # Parse scripts
+        script_map = {}
+        for s in args.scripts:
+            node_name, path = parse_script_spec(s)
+            script_map[node_name] = path
+
+        # Build
+        with skill_trace.span('render', nodes=len(args.nodes) + 1) as s:
+            content = build_tscn(args.root, args.nodes, script_map, args.connections, args.subresources)
+            s.set(bytes=len(content))
+        problems = []
+        if reference is not None:
+            problems = check_scene(args.root, args.nodes, script_map, args.connections, reference)
+    except SceneSpecError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if problems:
+        for problem in problems:
+            print(f"Error: {problem}")
+        sys.exit(1)
 
-    # Parse scripts
-    script_map = {}
-    for s in args.scripts:
-        node_name, path = parse_script_spec(s)
-        script_map[node_name] = path
-
-    # Build
-    content = build_tscn(args.root, args.nodes, script_map, args.connections, args.subresources)
-
-    # Resolve output path
-    output_path = args.output
-    if output_path.startswith("res://"):
-        output_path = output_path.replace("res://", "")
-        # Try to find the project root
-        if os.path.exists("project.godot"):
-            pass  # Already in project root
-        elif os.path.exists("godot-gemini-plugin/project.godot"):
-            output_path = os.path.join("godot-gemini-plugin", output_path)
-
-    # Ensure parent directory exists
-    os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
-
-    with open(output_path, 'w') as f:
-        f.write(content)
+    output_path = resolve_output_path(args.output)
+    if output_path is None:
+        print(f"Error: Unknown uid: {args.output}")
+        sys.exit(1)
+    with skill_trace.span('write', bytes=len(content)) as s:
+        changed = write_scene(output_path, content, args.incremental)
+        s.set(written=changed)
+    if not changed:
+        print(f"Scene unchanged: {output_path}")
+        return
 
     print(f"Scene written to: {output_path}")
     print(f"  Root: {args.root}")
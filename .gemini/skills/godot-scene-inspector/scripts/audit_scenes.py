@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Godot Scene Audit - Checks every scene of a project in parallel.
+
+Usage:
+  audit_scenes.py [paths ...] [--project <dir>] [--jobs N]
+
+Each .tscn is checked for:
+  - dangling_ext_resource / dangling_sub_resource: ExtResource("id") or
+    SubResource("id") references to ids the file never declares
+  - missing_file: [ext_resource]s whose path doesn't exist in the project and
+    whose uid (which Godot tries first) doesn't name an existing file either
+  - unresolved_parent: nodes whose parent= path doesn't resolve (dropped by build_tree)
+  - bad_connection: [connection] from/to paths that aren't nodes of the scene
+
+Issues are streamed as NDJSON on stdout while the audit runs; a summary goes to
+stderr. Exits 1 if any issue was found.
+
+The project's files and uids are indexed once (project_paths.py) and handed to
+the workers, so checking a reference is a set lookup rather than a stat().
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from multiprocessing import Pool
+
+from inspect_scene import Section, build_tree, iter_tscn
+from parse_cache import find_project_root
+from resource_graph import iter_project_files, to_res_path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-project-manager', 'scripts'))
+import project_paths  # noqa: E402
+
+EXT_REF_PATTERN = re.compile(r'ExtResource\(\s*"?([^")\s]+)"?\s*\)')
+SUB_REF_PATTERN = re.compile(r'SubResource\(\s*"?([^")\s]+)"?\s*\)')
+
+_project = None  # ProjectPaths of the audited project, set in each worker
+
+
+def _init_worker(project):
+    global _project
+    _project = project
+
+
+def _node_paths(root):
+    """Paths (relative to the scene root, root = '.') of every node reachable from root."""
+    paths = {'.': root}
+    stack = [(child, child['name']) for child in root['children']]
+    while stack:
+        node, path = stack.pop()
+        paths[path] = node
+        stack.extend((child, f"{path}/{child['name']}") for child in node['children'])
+    return paths
+
+
+def _under_instance(path, instanced):
+    """True if `path` points inside an instanced sub-scene, which can't be checked locally."""
+    return any(path == p or path.startswith(p + '/') for p in instanced)
+
+
+def _missing(attrs):
+    """Whether neither the uid nor the res:// path of an [ext_resource] names a project file."""
+    path = attrs.get('path', '')
+    uid = attrs.get('uid', '')
+    if not path.startswith('res://') and not uid.startswith('uid://'):
+        return False
+    return not any(ref and _project.exists(ref) for ref in (uid, path))
+
+
+def audit_scene(filepath):
+    """Audits one scene. Returns (path, issues). Runs in worker processes."""
+    issues = []
+
+    def issue(check, line, **detail):
+        issues.append(dict(check=check, line=line, **detail))
+
+    ext_ids = {}
+    sub_ids = set()
+    refs = []  # (kind, id, line)
+    nodes = []
+    connections = []
+
+    try:
+        for event in iter_tscn(filepath):
+            if isinstance(event, Section):
+                attrs = event.attrs
+                if event.tag == 'ext_resource':
+                    if 'id' in attrs:
+                        ext_ids[attrs['id']] = attrs.get('path')
+                    if _project is not None and _missing(attrs):
+                        issue('missing_file', event.line, path=attrs.get('path') or attrs.get('uid'))
+                elif event.tag == 'sub_resource':
+                    if 'id' in attrs:
+                        sub_ids.add(attrs['id'])
+                elif event.tag == 'node':
+                    nodes.append({
+                        'name': attrs.get('name', ''),
+                        'type': attrs.get('type'),
+                        'parent': attrs.get('parent', '.'),
+                        'instance': 'instance' in attrs,
+                        'line': event.line,
+                        'children': [],
+                    })
+                    if 'instance' in attrs:
+                        refs.extend(('ext', rid, event.line) for rid in EXT_REF_PATTERN.findall(attrs['instance']))
+                elif event.tag == 'connection':
+                    connections.append((attrs, event.line))
+            elif event.value:
+                refs.extend(('ext', rid, event.line) for rid in EXT_REF_PATTERN.findall(event.value))
+                refs.extend(('sub', rid, event.line) for rid in SUB_REF_PATTERN.findall(event.value))
+    except (OSError, UnicodeDecodeError) as e:
+        issue('unreadable', 0, error=str(e))
+        return filepath, issues
+
+    for kind, rid, line in refs:
+        if kind == 'ext' and rid not in ext_ids:
+            issue('dangling_ext_resource', line, id=rid)
+        elif kind == 'sub' and rid not in sub_ids:
+            issue('dangling_sub_resource', line, id=rid)
+
+    if not nodes:
+        return filepath, issues
+
+    unresolved = []
+    tree_root = build_tree(nodes, unresolved)
+    paths = _node_paths(tree_root)
+    instanced = [p for p, n in paths.items() if n['instance'] and p != '.']
+    for node in unresolved:
+        if not _under_instance(node['parent'], instanced):
+            issue('unresolved_parent', node['line'], node=node['name'], parent=node['parent'])
+
+    for attrs, line in connections:
+        for end in ('from', 'to'):
+            path = attrs.get(end)
+            if path is not None and path not in paths and not _under_instance(path, instanced):
+                issue('bad_connection', line, end=end, path=path, signal=attrs.get('signal'))
+
+    return filepath, issues
+
+
+def collect_scenes(root_dir, paths):
+    if not paths:
+        return [f for f in iter_project_files(root_dir) if f.endswith('.tscn')]
+    scenes = []
+    for path in paths:
+        if os.path.isdir(path):
+            scenes.extend(f for f in iter_project_files(path) if f.endswith('.tscn'))
+        else:
+            scenes.append(path)
+    return scenes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit Godot scenes for broken references')
+    parser.add_argument('paths', nargs='*', help='Scenes or directories (default: the whole project)')
+    parser.add_argument('--project', help='Project directory (default: search upwards from the CWD)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    args = parser.parse_args()
+
+    start = os.path.abspath(args.project) if args.project else os.getcwd()
+    root_dir = find_project_root(os.path.join(start, "project.godot"))
+    if root_dir is None and not args.paths:
+        print("Error: project.godot not found.")
+        sys.exit(1)
+
+    scenes = collect_scenes(root_dir, args.paths)
+    total = 0
+    out = sys.stdout
+
+    def report(filepath, issues):
+        nonlocal total
+        name = to_res_path(root_dir, os.path.abspath(filepath)) if root_dir else filepath
+        for item in issues:
+            out.write(json.dumps(dict(file=name, **item)) + '\n')
+        if issues:
+            out.flush()
+        total += len(issues)
+
+    project = project_paths.ProjectPaths(root_dir).load() if root_dir else None
+    if args.jobs <= 1 or len(scenes) < 2:
+        _init_worker(project)
+        for filepath, issues in map(audit_scene, scenes):
+            report(filepath, issues)
+    else:
+        with Pool(min(args.jobs, len(scenes)), _init_worker, (project,)) as pool:
+            chunksize = max(1, min(16, len(scenes) // (args.jobs * 4)))
+            for filepath, issues in pool.imap_unordered(audit_scene, scenes, chunksize):
+                report(filepath, issues)
+
+    print(f"Audited {len(scenes)} scenes: {total} issues.", file=sys.stderr)
+    if total:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
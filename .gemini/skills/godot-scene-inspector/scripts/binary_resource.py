@@ -0,0 +1,553 @@
+"""
+Reader for Godot's binary resource format (.scn, .res).
+
+  with BinaryResource('levels/world.scn') as res:
+      res.type, res.ext_resources, res.main_properties()
+
+The file is mapped with mmap and only what is asked for gets decoded: the
+header, string table and resource index when it is opened, and the main
+resource's properties on main_properties(). Sub-resources (meshes, tile data,
+animations) are never read. For scenes, the Variant list of the PackedScene
+bundle is only stepped over to index it, and single values are decoded on
+demand, so a large binary scene costs little more than its node array.
+
+Values come back in variant.py's types: Call for Vector2, NodePath,
+ExtResource("n") etc., StringName, and Packed for packed arrays (see
+to_variant()). ExtResource ids are the 1-based position in the file's ext
+resource list.
+
+parse_scn() returns a PackedScene in the shape inspect_scene's text parser
+uses: the (resources, nodes, editable) of parse_tscn_overrides(). Compressed
+files (RSCC) are not supported.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+from node_table import UNRESOLVED
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-project-manager', 'scripts'))
+from variant import Call, PackedArray, StringName, dumps  # noqa: E402
+
+MAGIC = b'RSRC'
+COMPRESSED_MAGIC = b'RSCC'
+BINARY_EXTENSIONS = ('.scn', '.res')
+
+FORMAT_FLAG_UIDS = 2
+FORMAT_FLAG_REAL_T_IS_DOUBLE = 4
+FORMAT_FLAG_HAS_SCRIPT_CLASS = 8
+RESERVED_FIELDS = 11
+FORMAT_VERSION_NO_NODEPATH_PROPERTY = 3
+
+# Variant tags of the binary format (not Variant::Type)
+NIL, BOOL, INT, FLOAT, STRING = 1, 2, 3, 4, 5
+VECTOR2, RECT2, VECTOR3, PLANE, QUATERNION, AABB, BASIS, TRANSFORM3D, TRANSFORM2D = range(10, 19)
+COLOR, NODE_PATH, RID, OBJECT, INPUT_EVENT, DICTIONARY = 20, 22, 23, 24, 25, 26
+ARRAY, PACKED_BYTE_ARRAY, PACKED_INT32_ARRAY, PACKED_FLOAT32_ARRAY, PACKED_STRING_ARRAY = range(30, 35)
+PACKED_VECTOR3_ARRAY, PACKED_COLOR_ARRAY, PACKED_VECTOR2_ARRAY = 35, 36, 37
+INT64, DOUBLE, CALLABLE, SIGNAL, STRING_NAME, VECTOR2I, RECT2I, VECTOR3I = range(40, 48)
+PACKED_INT64_ARRAY, PACKED_FLOAT64_ARRAY, VECTOR4, VECTOR4I, PROJECTION, PACKED_VECTOR4_ARRAY = range(48, 54)
+
+OBJECT_EMPTY, OBJECT_EXTERNAL_RESOURCE, OBJECT_INTERNAL_RESOURCE, OBJECT_EXTERNAL_RESOURCE_INDEX = range(4)
+
+# Fixed-size values: tag -> (constructor, components, format); 'r' is real_t
+FIXED = {
+    VECTOR2: ('Vector2', 2, 'r'), RECT2: ('Rect2', 4, 'r'), VECTOR3: ('Vector3', 3, 'r'),
+    PLANE: ('Plane', 4, 'r'), QUATERNION: ('Quaternion', 4, 'r'), AABB: ('AABB', 6, 'r'),
+    BASIS: ('Basis', 9, 'r'), TRANSFORM3D: ('Transform3D', 12, 'r'), TRANSFORM2D: ('Transform2D', 6, 'r'),
+    COLOR: ('Color', 4, 'f'), VECTOR4: ('Vector4', 4, 'r'), PROJECTION: ('Projection', 16, 'r'),
+    VECTOR2I: ('Vector2i', 2, 'i'), RECT2I: ('Rect2i', 4, 'i'), VECTOR3I: ('Vector3i', 3, 'i'),
+    VECTOR4I: ('Vector4i', 4, 'i'),
+}
+# Numeric packed arrays: tag -> (type, components per element, format)
+PACKED = {
+    PACKED_INT32_ARRAY: ('PackedInt32Array', 1, 'i'), PACKED_INT64_ARRAY: ('PackedInt64Array', 1, 'q'),
+    PACKED_FLOAT32_ARRAY: ('PackedFloat32Array', 1, 'f'), PACKED_FLOAT64_ARRAY: ('PackedFloat64Array', 1, 'd'),
+    PACKED_VECTOR2_ARRAY: ('PackedVector2Array', 2, 'r'), PACKED_VECTOR3_ARRAY: ('PackedVector3Array', 3, 'r'),
+    PACKED_VECTOR4_ARRAY: ('PackedVector4Array', 4, 'r'), PACKED_COLOR_ARRAY: ('PackedColorArray', 4, 'f'),
+}
+
+# SceneState bundle encoding
+NAME_INDEX_MASK = (1 << 18) - 1
+TYPE_INSTANTIATED = 0x7FFFFFFF
+FLAG_ID_IS_PATH = 1 << 30
+FLAG_INSTANCE_IS_PLACEHOLDER = 1 << 30
+FLAG_MASK = (1 << 24) - 1
+
+# A packed array as read: `values` is an array (bytes for PackedByteArray, a list for strings)
+Packed = namedtuple('Packed', ['type', 'values', 'width'])
+
+
+class BinaryResourceError(ValueError):
+    """Raised for files this reader can't make sense of."""
+
+
+class BinaryResource:
+    """One binary resource file, mapped read-only. Use as a context manager or call close()."""
+
+    def __init__(self, filepath):
+        self.path = filepath
+        with open(filepath, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise BinaryResourceError(f"{filepath}: empty file") from None
+        self.pos = 0
+        try:
+            self._read_header()
+        except (struct.error, UnicodeDecodeError, IndexError) as e:
+            self.close()
+            raise BinaryResourceError(f"{filepath}: truncated or corrupt header ({e})") from None
+        except BinaryResourceError:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    # -- Primitives ---------------------------------------------------------------
+
+    def _set_order(self, big_endian, real_double):
+        order = '>' if big_endian else '<'
+        self._order = order
+        self._swap = big_endian != (sys.byteorder == 'big')
+        self._u32s = struct.Struct(order + 'I')
+        self._i32s = struct.Struct(order + 'i')
+        self._u64s = struct.Struct(order + 'Q')
+        self.real = 'd' if real_double else 'f'
+
+    def _u32(self):
+        value, = self._u32s.unpack_from(self._map, self.pos)
+        self.pos += 4
+        return value
+
+    def _u64(self):
+        value, = self._u64s.unpack_from(self._map, self.pos)
+        self.pos += 8
+        return value
+
+    def _take(self, size):
+        end = self.pos + size
+        if end > len(self._map):
+            raise BinaryResourceError(f"{self.path}: truncated at offset {self.pos}")
+        data = self._map[self.pos:end]
+        self.pos = end
+        return data
+
+    def _numbers(self, fmt, count):
+        fmt = self.real if fmt == 'r' else fmt
+        values = array(fmt)
+        values.frombytes(self._take(values.itemsize * count))
+        if self._swap:
+            values.byteswap()
+        return values
+
+    def _string(self):
+        """A length-prefixed UTF-8 string (the length counts a trailing NUL)."""
+        data = self._take(self._u32())
+        return data.split(b'\0', 1)[0].decode('utf-8')
+
+    def _name(self):
+        """A StringName: an index into the string table, or inline if the top bit is set."""
+        sid = self._u32()
+        if sid & 0x80000000:
+            return self._take(sid & 0x7FFFFFFF).split(b'\0', 1)[0].decode('utf-8')
+        return self.strings[sid]
+
+    # -- Header -------------------------------------------------------------------
+
+    def _read_header(self):
+        magic = self._map[:4]
+        if magic == COMPRESSED_MAGIC:
+            raise BinaryResourceError(f"{self.path}: compressed binary resources (RSCC) are not supported")
+        if magic != MAGIC:
+            raise BinaryResourceError(f"{self.path}: not a binary Godot resource")
+        big_endian, = struct.unpack_from('<I', self._map, 4)
+        self._set_order(big_endian, False)
+        self.pos = 8
+        self._u32()  # "64 bits file", always 0
+        self.version = (self._u32(), self._u32())
+        self.format_version = self._u32()
+        self.type = self._string()
+        self._u64()  # offset of import metadata
+        flags = self._u32()
+        self._set_order(big_endian, flags & FORMAT_FLAG_REAL_T_IS_DOUBLE)
+        uid = self._u64()
+        self.uid = uid if flags & FORMAT_FLAG_UIDS else None
+        self.script_class = self._string() if flags & FORMAT_FLAG_HAS_SCRIPT_CLASS else None
+        self.pos += 4 * RESERVED_FIELDS
+        self.strings = [self._string() for _ in range(self._u32())]
+        self.ext_resources = []  # (type, path, uid or None)
+        for _ in range(self._u32()):
+            rtype = self._string()
+            path = self._string()
+            self.ext_resources.append((rtype, path, self._u64() if flags & FORMAT_FLAG_UIDS else None))
+        self.int_resources = []  # (path, offset); the last one is the main resource
+        for _ in range(self._u32()):
+            path = self._string()
+            self.int_resources.append((path, self._u64()))
+
+    # -- Values -------------------------------------------------------------------
+
+    def value(self):
+        """Reads the Variant at the current position."""
+        tag = self._u32()
+        if tag in FIXED:
+            name, count, fmt = FIXED[tag]
+            return Call(name, self._numbers(fmt, count).tolist())
+        if tag in PACKED:
+            name, width, fmt = PACKED[tag]
+            return Packed(name, self._numbers(fmt, self._u32() * width), width)
+        if tag == NIL or tag in (INPUT_EVENT, CALLABLE, SIGNAL):
+            return None
+        if tag == BOOL:
+            return bool(self._u32())
+        if tag == INT:
+            value, = self._i32s.unpack_from(self._map, self.pos)
+            self.pos += 4
+            return value
+        if tag in (INT64, FLOAT, DOUBLE):
+            return self._numbers({INT64: 'q', FLOAT: 'f', DOUBLE: 'd'}[tag], 1)[0]
+        if tag == STRING:
+            return self._string()
+        if tag == STRING_NAME:
+            return StringName(self._string())
+        if tag == NODE_PATH:
+            return Call('NodePath', [self._node_path()])
+        if tag == RID:
+            self._u32()
+            return Call('RID', [])
+        if tag == OBJECT:
+            return self._object()
+        if tag == DICTIONARY:
+            result = {}
+            for _ in range(self._u32() & 0x7FFFFFFF):
+                key = self.value()
+                result[key if _hashable(key) else dumps(to_variant(key))] = self.value()
+            return result
+        if tag == ARRAY:
+            return [self.value() for _ in range(self._u32() & 0x7FFFFFFF)]
+        if tag == PACKED_BYTE_ARRAY:
+            size = self._u32()
+            data = self._take(size)
+            self.pos += -size % 4
+            return Packed('PackedByteArray', data, 1)
+        if tag == PACKED_STRING_ARRAY:
+            return Packed('PackedStringArray', [self._string() for _ in range(self._u32())], 1)
+        raise BinaryResourceError(f"{self.path}: unsupported Variant tag {tag} at offset {self.pos - 4}")
+
+    def skip_value(self):
+        """Steps over the Variant at the current position without building it."""
+        tag = self._u32()
+        if tag in FIXED:
+            _, count, fmt = FIXED[tag]
+            self.pos += count * (8 if fmt == 'r' and self.real == 'd' else 4)
+        elif tag in PACKED:
+            _, width, fmt = PACKED[tag]
+            size = 8 if fmt in 'qd' or (fmt == 'r' and self.real == 'd') else 4
+            count = self._u32()
+            self.pos += count * width * size
+        elif tag in (BOOL, INT, FLOAT, RID):
+            self.pos += 4
+        elif tag in (INT64, DOUBLE):
+            self.pos += 8
+        elif tag in (STRING, STRING_NAME):
+            size = self._u32()
+            self.pos += size
+        elif tag == PACKED_BYTE_ARRAY:
+            size = self._u32()
+            self.pos += size + -size % 4
+        elif tag == PACKED_STRING_ARRAY:
+            for _ in range(self._u32()):
+                size = self._u32()
+                self.pos += size
+        elif tag in (OBJECT, NODE_PATH):
+            self.pos -= 4
+            self.value()  # small, and their encodings vary
+        elif tag in (DICTIONARY, ARRAY):
+            count = self._u32() & 0x7FFFFFFF
+            for _ in range(2 * count if tag == DICTIONARY else count):
+                self.skip_value()
+        elif not (tag == NIL or tag in (INPUT_EVENT, CALLABLE, SIGNAL)):
+            raise BinaryResourceError(f"{self.path}: unsupported Variant tag {tag} at offset {self.pos - 4}")
+
+    def _node_path(self):
+        name_count = self._u16()
+        sub_count = self._u16()
+        absolute = sub_count & 0x8000
+        sub_count &= 0x7FFF
+        if self.format_version < FORMAT_VERSION_NO_NODEPATH_PROPERTY:
+            sub_count += 1  # the old separate property field
+        names = [self._name() for _ in range(name_count)]
+        subnames = [self._name() for _ in range(sub_count)]
+        text = ('/' if absolute else '') + '/'.join(names)
+        if subnames:
+            text += ':' + ':'.join(s for s in subnames if s)
+        return text
+
+    def _u16(self):
+        value, = struct.unpack_from(self._order + 'H', self._map, self.pos)
+        self.pos += 2
+        return value
+
+    def _object(self):
+        kind = self._u32()
+        if kind == OBJECT_EMPTY:
+            return None
+        if kind == OBJECT_EXTERNAL_RESOURCE:
+            self._string()  # type
+            return Call('Resource', [self._string()])
+        if kind == OBJECT_INTERNAL_RESOURCE:
+            index = self._u32()
+            if index < len(self.int_resources) and self.int_resources[index][0].startswith('local://'):
+                return Call('SubResource', [self.int_resources[index][0][len('local://'):]])
+            return Call('SubResource', [str(index)])
+        if kind == OBJECT_EXTERNAL_RESOURCE_INDEX:
+            return Call('ExtResource', [str(self._u32() + 1)])
+        raise BinaryResourceError(f"{self.path}: unknown object encoding {kind} at offset {self.pos - 4}")
+
+    # -- Resources ----------------------------------------------------------------
+
+    def main_properties(self, lazy=()):
+        """
+        {name: value} of the main resource. Arrays under the property or
+        dictionary keys in `lazy` are only indexed: they come back as a
+        LazyArray that decodes one element at a time.
+        """
+        if not self.int_resources:
+            return {}
+        self.pos = self.int_resources[-1][1]
+        try:
+            self._string()  # type
+            properties = {}
+            for _ in range(self._u32()):
+                name = self._name()
+                properties[name] = self._lazy_value(lazy)
+            return properties
+        except (struct.error, UnicodeDecodeError, IndexError) as e:
+            raise BinaryResourceError(f"{self.path}: truncated or corrupt resource data ({e})") from None
+
+    def _lazy_value(self, lazy):
+        start = self.pos
+        tag = self._u32()
+        if tag != DICTIONARY:
+            self.pos = start
+            return self.value()
+        result = {}
+        for _ in range(self._u32() & 0x7FFFFFFF):
+            key = self.value()
+            element_start = self.pos
+            if key in lazy and self._u32() == ARRAY:
+                offsets = array('q')
+                for _ in range(self._u32() & 0x7FFFFFFF):
+                    offsets.append(self.pos)
+                    self.skip_value()
+                result[key] = LazyArray(self, offsets)
+            else:
+                self.pos = element_start
+                result[key] = self.value()
+        return result
+
+
+class LazyArray:
+    """An Array of a BinaryResource indexed by offset; elements are decoded when accessed."""
+
+    def __init__(self, resource, offsets):
+        self.resource = resource
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        resource = self.resource
+        resource.pos = self.offsets[index]
+        return resource.value()
+
+
+def _hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def to_variant(value):
+    """A value from BinaryResource in variant.py types, for variant.dumps()."""
+    if isinstance(value, Packed):
+        values = value.values
+        if value.type == 'PackedByteArray':
+            values = list(values)
+        elif value.width > 1:
+            values = [tuple(values[i:i + value.width]) for i in range(0, len(values), value.width)]
+        else:
+            values = list(values)
+        return PackedArray.from_values(value.type, values)
+    if isinstance(value, list):
+        return [to_variant(v) for v in value]
+    if isinstance(value, dict):
+        return {k: to_variant(v) for k, v in value.items()}
+    return value
+
+
+def is_binary_resource(filepath):
+    return os.path.splitext(filepath)[1].lower() in BINARY_EXTENSIONS
+
+
+def _decode_nodes(res, bundle):
+    """Yields (bundle index, name, type, parent index or path, instance value or None, instance flags, properties)."""
+    names = bundle['names'].values if isinstance(bundle.get('names'), Packed) else bundle.get('names', [])
+    data = bundle['nodes'].values
+    node_paths = bundle.get('node_paths') or []
+    idx = 0
+    for i in range(bundle.get('node_count', 0)):
+        parent, _owner, type_index, name_index, instance, prop_count = data[idx:idx + 6]
+        idx += 6
+        props = data[idx:idx + 2 * prop_count]
+        idx += 2 * prop_count
+        idx += 1 + data[idx]  # groups
+        if parent < 0 or parent == TYPE_INSTANTIATED:
+            parent = None
+        elif parent & FLAG_ID_IS_PATH:
+            path = node_paths[parent & FLAG_MASK]
+            parent = path.args[0] if isinstance(path, Call) else str(path)
+        else:
+            parent &= FLAG_MASK
+        node_type = None if type_index in (TYPE_INSTANTIATED, -1) else names[type_index]
+        properties = [(names[props[j] & FLAG_MASK], props[j + 1]) for j in range(0, len(props), 2)]
+        yield i, names[name_index & NAME_INDEX_MASK], node_type, parent, instance, properties
+
+
+def parse_scn(filepath, keep_overrides=False, table=None):
+    """
+    (resources, nodes, editable) of a binary scene, as parse_tscn_overrides()
+    returns them for text scenes (without keep_overrides, instance nodes carry
+    no 'overrides' and override-only nodes are left out, as in parse_tscn()).
+    With a NodeTable as `table`, nodes are appended to it instead of built as
+    dicts, and it takes the place of the node list.
+    """
+    with BinaryResource(filepath) as res:
+        resources = {str(i + 1): {'path': path, 'type': rtype}
+                     for i, (rtype, path, _) in enumerate(res.ext_resources)}
+        nodes = [] if table is None else table
+        if res.type != 'PackedScene':
+            return resources, nodes, []
+        bundle = res.main_properties(lazy=('variants',)).get('_bundled')
+        if not isinstance(bundle, dict) or not isinstance(bundle.get('nodes'), Packed):
+            raise BinaryResourceError(f"{filepath}: PackedScene without a node bundle")
+        variants = bundle.get('variants') or []
+
+        def resource_path(value):
+            if isinstance(value, Call) and value.name == 'ExtResource' and value.args[0] in resources:
+                return resources[value.args[0]]['path']
+            return None
+
+        def text(value):
+            return dumps(to_variant(value))
+
+        paths = []  # by bundle index, for resolving parents
+        rows = []   # by bundle index: table row, or None if the node isn't in the table
+        for i, name, node_type, parent, instance, properties in _decode_nodes(res, bundle):
+            if parent is None:
+                parent_path = '.'
+                paths.append('.')
+            else:
+                parent_path = parent if isinstance(parent, str) else paths[parent] if parent < len(paths) else None
+                paths.append(None if parent_path is None else name if parent_path == '.' else f'{parent_path}/{name}')
+            instance_path = None
+            if instance >= 0:
+                value = variants[instance & FLAG_MASK]
+                if instance & FLAG_INSTANCE_IS_PLACEHOLDER:
+                    instance_path = value
+                else:
+                    instance_path = resource_path(value) or text(value)
+            elif i == 0 and 'base_scene' in bundle:
+                instance_path = resource_path(variants[bundle['base_scene']])
+            script = None
+            overrides = {} if keep_overrides and (instance_path or node_type is None) else None
+            for key, value_index in properties:
+                if key == 'script' or overrides is not None:
+                    value = variants[value_index]
+                    if key == 'script':
+                        script = resource_path(value)
+                    if overrides is not None:
+                        overrides[key] = text(value)
+
+            if node_type is None and instance_path is None:
+                # Overrides properties of a node inside an instanced scene
+                if keep_overrides and table is None and i > 0 and parent_path is not None:
+                    nodes.append({'name': name, 'parent': parent_path, 'override': True, 'overrides': overrides})
+                rows.append(None)
+                continue
+            if table is not None:
+                parent_row = UNRESOLVED
+                if i == 0:
+                    parent_row = -1
+                elif isinstance(parent, int) and parent < len(rows) and rows[parent] is not None \
+                        and table.parent[rows[parent]] != UNRESOLVED:
+                    parent_row = rows[parent]  # children of unresolved nodes stay unresolved, as in text scenes
+                row = table.append(name, node_type, parent_row, instance_path, parent_path or '?')
+                if script is not None:
+                    table.set_script(row, script)
+                rows.append(row)
+                continue
+            node = {'name': name, 'type': node_type, 'parent': parent_path or '?', 'script': script,
+                    'instance': instance_path, 'children': []}
+            if overrides is not None:
+                node['overrides'] = overrides
+            nodes.append(node)
+            rows.append(None)
+
+        editable = []
+        for path in bundle.get('editable_instances') or []:
+            editable.append(path.args[0] if isinstance(path, Call) else str(path))
+        return resources, nodes, editable
+
+
+def scene_connections(filepath):
+    """(signal, from path) of every connection of a binary scene, like inspect_scene.scene_connections()."""
+    with BinaryResource(filepath) as res:
+        if res.type != 'PackedScene':
+            return []
+        bundle = res.main_properties(lazy=('variants',)).get('_bundled')
+        if not isinstance(bundle, dict) or 'conns' not in bundle:
+            return []
+        names = bundle['names'].values
+        paths = []
+        node_paths = bundle.get('node_paths') or []
+        for i, name, _, parent, _, _ in _decode_nodes(res, bundle):
+            if parent is None:
+                paths.append('.')
+            elif isinstance(parent, str):
+                paths.append(name if parent == '.' else f'{parent}/{name}')
+            else:
+                parent_path = paths[parent] if parent < len(paths) else None
+                paths.append(None if parent_path is None else name if parent_path == '.' else f'{parent_path}/{name}')
+        data = bundle['conns'].values
+        version = bundle.get('version', 1)
+        connections = []
+        idx = 0
+        for _ in range(bundle.get('conn_count', 0)):
+            source, _target, signal, _method, _flags, bind_count = data[idx:idx + 6]
+            idx += 6 + bind_count + (1 if version >= 3 else 0)
+            if source & FLAG_ID_IS_PATH:
+                path = node_paths[source & FLAG_MASK]
+                source_path = path.args[0] if isinstance(path, Call) else str(path)
+            else:
+                source_path = paths[source & FLAG_MASK] if (source & FLAG_MASK) < len(paths) else None
+            connections.append((names[signal], source_path))
+        return connections
@@ -1,173 +1,684 @@
+import argparse
+import io
+import json
 import sys
 import re
 import os
+import sqlite3
+from collections import namedtuple
 
-def parse_tscn(filepath):
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
+import binary_resource
+from node_table import UNRESOLVED, NodeTable, PathIndex
+from parse_cache import DEFAULT_MAX_BYTES, ParseCache, cached_parse, find_project_root
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-project-manager', 'scripts'))
+import project_paths  # noqa: E402
+import skill_trace  # noqa: E402
+import variant  # noqa: E402
+from variant import ValueScanner  # noqa: E402
+
+# class_reference (and with it doc_index) is imported where --validate needs it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-rag', 'scripts'))
+
+# Pieces are read with readline(READ_CHUNK), so a single huge line (e.g. tile data
+# packed onto one line) never has to be held in memory as a whole.
+READ_CHUNK = 1 << 16
+
+Section = namedtuple('Section', ['tag', 'attrs', 'line'])
+Property = namedtuple('Property', ['key', 'value', 'line'])
+
+PROPERTY_PATTERN = re.compile(r'([^\s=\[;]+)\s*=\s?')
+# Header attribute values: "quoted", Call("args", ...), ["array", ...] or a bare token
+_QUOTED = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+HEADER_ATTR_PATTERN = re.compile(
+    rf'\s(\w+)=({_QUOTED}|\w*\((?:[^()"]+|{_QUOTED})*\)|\[(?:[^\[\]"]+|{_QUOTED})*\]|[^\s\]]+)'
+)
+# Headers made only of plain "quoted" or bare values (the vast majority): the
+# lookbehind picks the quoted or the bare form, so dict(findall()) needs no unquoting
+SIMPLE_HEADER_ATTR_PATTERN = re.compile(r'\s(\w+)="?((?<=")[^"]*|[^\s\]"]*)')
+
+
+def _unquote(value):
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        value = value[1:-1]
+        if '\\' in value:
+            value = value.replace('\\"', '"').replace('\\\\', '\\')
+    return value
+
+
+def parse_section_header(text):
+    """
+    Parses '[node name="Player" type="CharacterBody2D" parent="."]' into
+    ('node', {'name': 'Player', 'type': 'CharacterBody2D', 'parent': '.'}).
+    Unquoted values such as load_steps=4 or instance=ExtResource("1") are kept raw.
+    """
+    text = text.strip()
+    if text.endswith(']'):
+        text = text[:-1]
+    body = text[1:]
+    tag = body.partition(' ')[0]
+    if '\\' not in body and '(' not in body and '[' not in body:
+        return tag, dict(SIMPLE_HEADER_ATTR_PATTERN.findall(body))
+    # Plain quoted values are sliced inline; only escaped ones go through _unquote
+    attrs = {key: value[1:-1] if value[0] == '"' and '\\' not in value else _unquote(value)
+             for key, value in HEADER_ATTR_PATTERN.findall(body)}
+    return tag, attrs
+
+
+def iter_tscn(filepath, keep_value=None):
+    """
+    Streams a .tscn/.tres file as Section and Property events.
+
+    Section(tag, attrs, line) is emitted for every [ext_resource], [sub_resource],
+    [node], [connection], ... header; Property(key, value, line) for every
+    property that follows it. Multi-line values are followed with a ValueScanner.
+    If `keep_value(tag, key)` returns False the value is scanned but not stored
+    (the event carries None), which keeps memory flat on huge tile/animation data.
+    """
+    tag = None
+    lineno = 0
+    mode = None  # None, 'header', 'value' or 'skip' (rest of a blank/comment line)
+    parts = []
+    prop_key = None
+    prop_line = 0
+    keep = True
+    scanner = None
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        readline = f.readline
+        starts_line = True
+        while True:
+            piece = readline(READ_CHUNK)
+            if not piece:
+                break
+            if starts_line:
+                lineno += 1
+            ends_line = starts_line = piece[-1] == '\n'
+
+            if mode is None:
+                if piece == '\n':
+                    continue
+                stripped = piece.lstrip()
+                if stripped[:1] == '[':
+                    if ends_line:
+                        # Fast path: a complete header line
+                        tag, attrs = parse_section_header(stripped)
+                        yield Section(tag, attrs, lineno)
+                        continue
+                    mode = 'header'
+                    prop_line = lineno
+                else:
+                    m = PROPERTY_PATTERN.match(stripped)
+                    if m and tag is not None:
+                        mode = 'value'
+                        prop_key = m.group(1)
+                        prop_line = lineno
+                        keep = keep_value is None or keep_value(tag, prop_key)
+                        scanner = ValueScanner()
+                        piece = stripped[m.end():]
+                    else:
+                        mode = 'skip'
+
+            if mode == 'header':
+                parts.append(piece)
+                if ends_line:
+                    tag, attrs = parse_section_header(''.join(parts))
+                    parts = []
+                    mode = None
+                    yield Section(tag, attrs, prop_line)
+            elif mode == 'value':
+                scanner.feed(piece)
+                if keep:
+                    parts.append(piece)
+                if ends_line and not scanner.is_open:
+                    value = ''.join(parts).strip() if keep else None
+                    parts = []
+                    mode = None
+                    yield Property(prop_key, value, prop_line)
+            elif ends_line:
+                mode = None
+
+    if mode == 'value':
+        yield Property(prop_key, ''.join(parts).strip() if keep else None, prop_line)
+    elif mode == 'header':
+        tag, attrs = parse_section_header(''.join(parts))
+        yield Section(tag, attrs, prop_line)
+
+
+def ext_resource_id(value):
+    """The id of an `ExtResource("id")` property value, or None for any other value."""
+    try:
+        value = variant.loads(value)
+    except variant.VariantError:
+        return None
+    if isinstance(value, variant.Call) and value.name == 'ExtResource' and value.args:
+        return str(value.args[0])
+    return None
 
-    resources = {} # id -> path
+
+def _parse_scene(filepath, keep_overrides):
+    if binary_resource.is_binary_resource(filepath):
+        return binary_resource.parse_scn(filepath, keep_overrides)
+    resources = {} # id -> {path, type}
     nodes = [] # list of dicts: {name, type, parent, ...}
+    editable = [] # [editable path="..."] instances whose children may be overridden
 
-    current_section = None
     current_node = None
+    current_props = None  # property values of an instanced or overriding node
 
-    # Regex for [ext_resource ...]
-    # [ext_resource type="Script" path="res://main.gd" id="2_fghij"]
-    ext_res_pattern = re.compile(r'\[ext_resource\s+.*?path="([^"]+)".*?id="?([^"]+)"?.*\]')
-
-    # Regex for [node ...]
-    # [node name="Main" type="Node2D"]
-    # [node name="Sprite2D" type="Sprite2D" parent="."]
-    node_pattern = re.compile(r'\[node\s+name="([^"]+)"\s+type="([^"]+)"(?:\s+parent="([^"]+)")?.*\]')
-
-    for line in lines:
-        line = line.strip()
-        if not line: continue
-
-        # Check for external resources
-        m_res = ext_res_pattern.match(line)
-        if m_res:
-            path = m_res.group(1)
-            rid = m_res.group(2)
-            # type might be useful too
-            type_match = re.search(r'type="([^"]+)"', line)
-            rtype = type_match.group(1) if type_match else "Resource"
-            resources[rid] = {'path': path, 'type': rtype}
-            continue
+    # Only the script reference is needed from node properties; everything else
+    # (tile data, animation tracks, ...) is scanned without being stored.
+    def keep_value(tag, key):
+        return current_props is not None or (tag == 'node' and key == 'script')
 
-        # Check for nodes
-        m_node = node_pattern.match(line)
-        if m_node:
-            name = m_node.group(1)
-            ntype = m_node.group(2)
-            parent = m_node.group(3)
-
-            # Parent "." means root of the scene (but usually root node has no parent attr in tscn)
-            # If parent is None, it's the root node (unless it's a sub-scene instance, handled differently)
-            if parent is None:
-                parent = "."
-            elif parent == ".":
-                # It is a child of the root node
-                # We need to identify the root node name to reconstruct path
-                pass
-
-            current_node = {
-                'name': name,
-                'type': ntype,
-                'parent': parent,
-                'script': None,
-                'children': []
-            }
-            nodes.append(current_node)
-            continue
+    for event in iter_tscn(filepath, keep_value):
+        if isinstance(event, Section):
+            current_node = current_props = None
+            attrs = event.attrs
+            if event.tag == 'ext_resource' and 'path' in attrs and 'id' in attrs:
+                resources[attrs['id']] = {'path': attrs['path'], 'type': attrs.get('type', 'Resource')}
+            elif event.tag == 'node' and 'name' in attrs:
+                instance = None
+                if 'instance' in attrs:
+                    rid = ext_resource_id(attrs['instance'])
+                    instance = resources[rid]['path'] if rid in resources else attrs['instance']
+                if 'type' not in attrs and instance is None:
+                    # Overrides properties of a node inside an instanced scene
+                    if not keep_overrides or 'parent' not in attrs:
+                        continue
+                    current_node = {'name': attrs['name'], 'parent': attrs['parent'], 'override': True}
+                else:
+                    # The root node has no parent attribute; treat it as "."
+                    current_node = {
+                        'name': attrs['name'],
+                        'type': attrs.get('type'),
+                        'parent': attrs.get('parent', '.'),
+                        'script': None,
+                        'instance': instance,
+                        'children': []
+                    }
+                if keep_overrides and (instance is not None or 'override' in current_node):
+                    current_props = current_node['overrides'] = {}
+                nodes.append(current_node)
+            elif event.tag == 'editable' and 'path' in attrs:
+                editable.append(attrs['path'])
+        elif current_node is not None:
+            if current_props is not None:
+                current_props[event.key] = event.value
+            if event.key == 'script':
+                # script = ExtResource("2_fghij")
+                rid = ext_resource_id(event.value)
+                if rid in resources:
+                    current_node['script'] = resources[rid]['path']
 
-        # Check for script attachment
-        # script = ExtResource("2_fghij")
-        if current_node and line.startswith("script = ExtResource"):
-             # extract ID
-             m_script = re.search(r'ExtResource\("?([^"]+)"?\)', line)
-             if m_script:
-                 rid = m_script.group(1)
-                 if rid in resources:
-                     current_node['script'] = resources[rid]['path']
+    return resources, nodes, editable
 
+
+def parse_tscn(filepath):
+    """
+    (resources, nodes) of a scene. Instanced scenes are nodes with type None
+    (unless the header names one) and their res:// path as 'instance'. Binary
+    .scn files are read with binary_resource.parse_scn().
+    """
+    resources, nodes, _ = _parse_scene(filepath, False)
     return resources, nodes
 
-def build_tree(nodes):
-    # Map name -> node
-    # But names are only unique within siblings.
-    # Also parent references are paths like "." or "Player" or "Player/Sprite"
 
-    # First find root
-    # Root node in tscn usually has parent="." implicitly or just no parent attribute?
-    # Actually, the *first* node declared is the root. It has no 'parent' attribute.
+def parse_tscn_compact(filepath):
+    """
+    Like parse_tscn(), with the nodes in a NodeTable instead of dicts: a small
+    fraction of the memory for scenes with millions of nodes. Override-only
+    nodes are skipped, as in parse_tscn().
+    """
+    if binary_resource.is_binary_resource(filepath):
+        resources, table, _ = binary_resource.parse_scn(filepath, table=NodeTable())
+        return resources, table
+    resources = {}
+    table = NodeTable()
+    # Godot saves nodes depth-first, so a parent is almost always on the path
+    # to the previous node; a map of every path is only built if one isn't
+    stack = []      # (path, row) from the root down to the last node
+    by_path = None
+    current = None  # row whose properties are being read
+
+    def keep_value(tag, key):
+        return tag == 'node' and key == 'script'
+
+    for event in iter_tscn(filepath, keep_value):
+        if isinstance(event, Section):
+            current = None
+            attrs = event.attrs
+            if event.tag == 'ext_resource' and 'path' in attrs and 'id' in attrs:
+                resources[attrs['id']] = {'path': attrs['path'], 'type': attrs.get('type', 'Resource')}
+            elif event.tag == 'node' and 'name' in attrs:
+                instance = None
+                if 'instance' in attrs:
+                    rid = ext_resource_id(attrs['instance'])
+                    instance = resources[rid]['path'] if rid in resources else attrs['instance']
+                if 'type' not in attrs and instance is None:
+                    continue
+                name = attrs['name']
+                if not len(table):
+                    current = table.append(name, attrs.get('type'), -1, instance)
+                    stack.append(('.', current))
+                    continue
+                parent = attrs.get('parent', '.')
+                while stack and stack[-1][0] != parent:
+                    stack.pop()
+                if stack:
+                    parent_row = stack[-1][1]
+                else:
+                    if by_path is None:
+                        by_path = PathIndex()
+                        for row in range(len(table)):
+                            if table.parent[row] != UNRESOLVED:
+                                by_path.add(table.path(row), row)
+                    parent_row = by_path.get(parent, UNRESOLVED)
+                current = table.append(name, attrs.get('type'), parent_row, instance, parent)
+                if parent_row != UNRESOLVED:
+                    path = name if parent == '.' else f"{parent}/{name}"
+                    stack.append((path, current))
+                    if by_path is not None:
+                        by_path.add(path, current)
+        elif current is not None and event.key == 'script':
+            rid = ext_resource_id(event.value)
+            if rid in resources:
+                table.set_script(current, resources[rid]['path'])
+
+    return resources, table
+
+
+def parse_tscn_overrides(filepath):
+    """
+    Like parse_tscn(), for expanding instances: instanced nodes carry their
+    property values as 'overrides', nodes that only override a node inside an
+    instance are kept with 'override': True, and the [editable] paths are
+    returned as well.
+    """
+    return _parse_scene(filepath, True)
+
+
+class InstanceExpander:
+    """
+    Replaces instanced scenes with their nodes, recursively.
+
+    Each scene file is parsed and expanded once per expander (the memo table)
+    however often it is instanced; every instance then only copies the expanded
+    nodes with its own parent paths. A scene that instances itself, directly or
+    through others, is reported in `warnings` and left unexpanded.
+    """
+
+    def __init__(self, project_root=None):
+        self.project_root = project_root
+        self.memo = {}      # real path -> (expanded nodes, their paths relative to that scene's root)
+        self.resources = {} # real path -> the scene's own ext_resources
+        self.targets = {}   # (instance path, instancing dir) -> real path, or None if missing
+        self.active = []    # scenes being expanded, outermost first
+        self.warnings = []
+        self.parsed = 0
+
+    def resolve(self, res_path, from_file):
+        if res_path.startswith('res://'):
+            root = self.project_root or find_project_root(from_file) or os.getcwd()
+            return os.path.join(root, res_path[len('res://'):])
+        return os.path.join(os.path.dirname(from_file), res_path)
+
+    def expand(self, filepath):
+        """The scene's nodes, in parse_tscn() form, with every instance expanded."""
+        return self._expanded(os.path.realpath(filepath))[0]
+
+    def _expanded(self, key):
+        if key not in self.memo:
+            self.active.append(key)
+            try:
+                self.memo[key] = self._expand(key)
+            finally:
+                self.active.pop()
+        return self.memo[key]
+
+    def _expand(self, filepath):
+        resources, nodes, editable = parse_tscn_overrides(filepath)
+        self.resources[filepath] = resources
+        self.parsed += 1
+        expanded = []
+        paths = []
+        by_path = {}
+        for i, n in enumerate(nodes):
+            path = '.' if i == 0 else node_path(n)
+            if n.get('override'):
+                target = by_path.get(path)
+                if target is None:
+                    self.warnings.append(f"{filepath}: override of missing node '{path}'")
+                else:
+                    target['overrides'] = dict(target.get('overrides') or {}, **n['overrides'])
+                continue
+            sub = self._instance(n, filepath)
+            if sub is None:
+                n.setdefault('overrides', {})
+                expanded.append(n)
+                paths.append(path)
+                by_path[path] = n
+                continue
+            sub_nodes, sub_paths = sub
+            # The instance node renames the sub-scene's root and may override it
+            root = sub_nodes[0]
+            copy = dict(root, name=n['name'], parent=n['parent'], instance=n['instance'],
+                        type=n['type'] or root['type'], script=n['script'] or root['script'],
+                        overrides=dict(root.get('overrides') or {}, **n['overrides']), children=[])
+            expanded.append(copy)
+            paths.append(path)
+            by_path[path] = copy
+            prefix = '' if path == '.' else path + '/'
+            for sub_node, sub_path in zip(sub_nodes[1:], sub_paths[1:]):
+                parent = sub_node['parent']
+                copy = dict(sub_node, parent=path if parent == '.' else prefix + parent, children=[])
+                expanded.append(copy)
+                paths.append(prefix + sub_path)
+                by_path[prefix + sub_path] = copy
+        for path in editable:
+            if path in by_path:
+                by_path[path]['editable'] = True
+        return expanded, paths
+
+    def _instance(self, node, filepath):
+        """(nodes, paths) of the scene `node` instances, or None if it can't be expanded."""
+        if node.get('instance') is None:
+            return None
+        lookup = (node['instance'], os.path.dirname(filepath))
+        if lookup not in self.targets:
+            target = self.resolve(node['instance'], filepath)
+            self.targets[lookup] = os.path.realpath(target) if os.path.isfile(target) else None
+        key = self.targets[lookup]
+        if key is None:
+            self.warnings.append(f"{filepath}: instanced scene {node['instance']} not found")
+            return None
+        if key in self.active:
+            chain = self.active[self.active.index(key):] + [key]
+            self.warnings.append("instance cycle: " + ' -> '.join(os.path.relpath(p) for p in chain))
+            return None
+        sub = self._expanded(key)
+        return sub if sub[0] else None
+
+
+def scene_connections(filepath):
+    """(signal, from path) of every [connection] in the scene; property values are not kept."""
+    if binary_resource.is_binary_resource(filepath):
+        return binary_resource.scene_connections(filepath)
+    return [(event.attrs.get('signal'), event.attrs.get('from'))
+            for event in iter_tscn(filepath, lambda tag, key: False)
+            if isinstance(event, Section) and event.tag == 'connection']
+
+
+def validate_nodes(filepath, nodes, reference):
+    """Checks node types and [connection] signals against the class reference; returns problem messages."""
+    import class_reference  # only needed with --validate
+
+    root_dir = find_project_root(filepath) or os.getcwd()
+
+    def resolve(res_path):
+        return os.path.join(root_dir, res_path[len('res://'):]) if res_path.startswith('res://') else None
+
+    records = [('.' if i == 0 else node_path(n), n['type'], n['script']) for i, n in enumerate(nodes)]
+    return class_reference.validate_scene(reference, records, scene_connections(filepath), resolve)
+
+
+def node_path(node):
+    """Path of a parsed node relative to the scene root ('.' for the root itself)."""
+    parent = node['parent']
+    if parent == '.':
+        return node['name']
+    return f"{parent}/{node['name']}"
+
+
+def select_nodes(nodes, subtree='.', max_depth=None):
+    """
+    Filters the flat node list down to the branch at `subtree` (a path relative
+    to the scene root), at most `max_depth` levels below it. The branch root comes
+    first, so the result can be passed straight to build_tree(..., root_path=subtree).
+    A NodeTable gives a NodeTable.
+    """
+    if isinstance(nodes, NodeTable):
+        return nodes.select(subtree, max_depth)
+    if not nodes:
+        return []
+    if subtree in ('.', '') and max_depth is None:
+        return nodes
+    base_depth = 0 if subtree in ('.', '') else subtree.count('/') + 1
+    prefix = '' if subtree in ('.', '') else subtree + '/'
+    selected = []
+    for i, n in enumerate(nodes):
+        path = '.' if i == 0 else node_path(n)
+        if prefix:
+            if path == subtree:
+                selected.insert(0, n)
+                continue
+            if not path.startswith(prefix):
+                continue
+        elif i == 0:
+            selected.append(n)
+            continue
+        if max_depth is not None and path.count('/') + 1 - base_depth > max_depth:
+            continue
+        selected.append(n)
+    if prefix and (not selected or node_path(selected[0]) != subtree):
+        return []
+    return selected
+
+
+def build_tree(nodes, unresolved=None, root_path='.'):
+    """
+    Links the flat node list into a tree and returns its root (nodes[0]).
+
+    Parent references are paths relative to the scene root: "." for direct children
+    of the root, "Player" or "Player/Sprite" deeper down. `root_path` is the path of
+    nodes[0] when building a branch from select_nodes(). If `unresolved` is a list,
+    nodes whose parent path never resolves are appended to it instead of being
+    dropped silently.
+    """
+    if isinstance(nodes, NodeTable):
+        return nodes.link(unresolved)
     if not nodes:
         return None
 
-    root = nodes[0] # The first one is invariably the root
-    # Initialize children list for all
+    root = nodes[0]
     for n in nodes:
         n['children'] = []
 
-    # We need a way to look up nodes by path
-    # Parent "." refers to root.
-    # Parent "NodeName" refers to direct child of root? No, parent matches the path relative to root?
-    # In .tscn, parent is a path relative to the scene root?
-    # If parent is ".", it means child of root.
-    # If parent is "Path/To/Node", it means child of that node.
-
-    # Store nodes by path?
-    # Path of root is "."
-    node_map = {".": root}
-
-    # We iterate and assign children
-    # Since nodes are usually ordered parent-first, we might find parent in node_map
-
-    for n in nodes[1:]: # Skip root
-        parent_path = n['parent']
-        # If parent_path is ".", parent is root
-        if parent_path == ".":
-             root['children'].append(n)
-             # Add to map. access path will be just name (relative to root)?
-             # Wait, in tscn parent="." means direct child of root.
-             node_map[n['name']] = n
-        else:
-             # parent_path might be "ParentNode" or "Parent/Child"
-             if parent_path in node_map:
-                 node_map[parent_path]['children'].append(n)
-                 # Add self to map
-                 my_path = f"{parent_path}/{n['name']}"
-                 node_map[my_path] = n
-             else:
-                 # Parent not found yet? Should not happen in standard tscn unless disordered
-                 # fallback
-                 pass
+    # Nodes are ordered parent-first in .tscn, so one pass resolves every parent
+    node_map = {root_path: root}
+    for n in nodes[1:]:
+        parent = node_map.get(n['parent'])
+        if parent is None:
+            if unresolved is not None:
+                unresolved.append(n)
+            continue
+        parent['children'].append(n)
+        node_map[node_path(n)] = n
 
     return root
 
-def print_tree(node, depth=0):
-    indent = "  " * depth
-    script_info = f" script={node['script']}" if node['script'] else ""
-    print(f"{indent}{node['name']} ({node['type']}){script_info}")
-    for child in node['children']:
-        print_tree(child, depth + 1)
+
+def iter_tree(root, root_path='.'):
+    """Yields (node, depth, path) in pre-order, without recursion."""
+    stack = [(root, 0, root_path)]
+    while stack:
+        node, depth, path = stack.pop()
+        yield node, depth, path
+        for child in reversed(node['children']):
+            child_path = child['name'] if path == '.' else f"{path}/{child['name']}"
+            stack.append((child, depth + 1, child_path))
+
+
+def _short(value, limit=40):
+    value = ' '.join(str(value).split())
+    return value if len(value) <= limit else value[:limit - 3] + '...'
+
+
+def print_tree(node, depth=0, out=None, root_path='.'):
+    out = out or sys.stdout
+    for n, d, _ in iter_tree(node, root_path):
+        indent = "  " * (depth + d)
+        info = f" script={n['script']}" if n['script'] else ""
+        if n.get('instance'):
+            info += f" instance={n['instance']}"
+        if n.get('editable'):
+            info += " [editable]"
+        if n.get('overrides'):
+            info += " {" + ', '.join(f"{k}={_short(v)}" for k, v in n['overrides'].items()) + "}"
+        out.write(f"{indent}{n['name']} ({n['type'] or 'Instance'}){info}\n")
+
+
+def node_record(node, depth, path):
+    record = {
+        'path': path,
+        'name': node['name'],
+        'type': node['type'],
+        'parent': None if path == '.' else node['parent'],
+        'script': node['script'],
+        'instance': node.get('instance'),
+        'depth': depth,
+    }
+    if 'overrides' in node:
+        record['overrides'] = node['overrides']
+        record['editable'] = bool(node.get('editable'))
+    return record
+
+
+def write_output(out, fmt, resources, root, root_path='.'):
+    """Writes the inspection result as 'text', 'json' or 'ndjson' to `out`."""
+    if fmt == 'text':
+        out.write("Resources:\n")
+        for rid, info in resources.items():
+            out.write(f"[{rid}] {info['path']} ({info['type']})\n")
+        out.write("\nNodes:\n")
+        if root:
+            print_tree(root, out=out, root_path=root_path)
+        else:
+            out.write("No nodes found.\n")
+    elif fmt == 'ndjson':
+        for rid, info in resources.items():
+            out.write(json.dumps({'kind': 'resource', 'id': rid, **info}) + "\n")
+        if root:
+            for n, d, path in iter_tree(root, root_path):
+                out.write(json.dumps({'kind': 'node', **node_record(n, d, path)}) + "\n")
+    else:
+        # Nodes are a flat list (with paths and depths) so deep scenes don't hit
+        # the JSON encoder's recursion limit, and the document is streamed.
+        out.write('{"resources": ' + json.dumps(resources) + ', "nodes": [')
+        if root:
+            for i, (n, d, path) in enumerate(iter_tree(root, root_path)):
+                out.write((",\n" if i else "\n") + json.dumps(node_record(n, d, path)))
+        out.write("\n]}\n")
+
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: inspect_scene.py [path_to_tscn]")
+    parser = argparse.ArgumentParser(description='Inspect a Godot scene file')
+    parser.add_argument('path', help='Path to the .tscn or binary .scn file (relative, res:// or uid://)')
+    parser.add_argument('--cache', action='store_true',
+                        help='Reuse parse results from .godot/ when the file is unchanged')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help='Size limit of the parse cache before LRU eviction')
+    parser.add_argument('--format', choices=['text', 'json', 'ndjson'], default='text',
+                        help='Output format (default: text)')
+    parser.add_argument('--subtree', default='.',
+                        help='Only show the branch at this node path (e.g. "Player" or "UI/HUD")')
+    parser.add_argument('--depth', type=int, help='Only show this many levels below the (sub)tree root')
+    parser.add_argument('--validate', action='store_true',
+                        help='Warn about unknown node types and signals (needs the godot-docs class reference)')
+    parser.add_argument('--class-db', help='Class reference symbol table (default: found next to docs/godot-docs)')
+    parser.add_argument('--expand-instances', action='store_true',
+                        help='Replace instanced scenes with their nodes, showing overrides and editable children')
+    parser.add_argument('--compact', action='store_true',
+                        help='Hold nodes in compact columns instead of dicts (for scenes with millions of nodes)')
+    skill_trace.add_arguments(parser)
+    args = parser.parse_args()
+    skill_trace.setup('inspect_scene', args)
+    if args.compact and args.expand_instances:
+        parser.error('--compact and --expand-instances cannot be combined')
+
+    path = project_paths.resolve(args.path)
+    if path is None:
+        print(f"Error: Unknown uid {args.path}.")
+        sys.exit(1)
+    if not os.path.exists(path):
+        print(f"Error: File {args.path} not found.")
         sys.exit(1)
 
-    path = sys.argv[1]
+    cache = None
+    if args.cache:
+        try:
+            cache = ParseCache.for_scene(path, int(args.cache_max_mb * 1024 * 1024))
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: parse cache unavailable ({e}).", file=sys.stderr)
 
-    # Resolve res://
-    if path.startswith("res://"):
-        path = path.replace("res://", "")
-        # assume running from project root
+    # Reading is streamed inside the parser, so 'parse' covers both
+    if cache and (args.expand_instances or args.compact):
+        cache.close()
+        cache = None
 
-    if not os.path.exists(path):
-        # Try finding it
-        if os.path.exists(f"godot-gemini-plugin/{path}"):
-            path = f"godot-gemini-plugin/{path}"
-        elif os.path.exists(f"../{path}"):
-             path = f"../{path}"
+    expander = None
+    with skill_trace.span('parse', bytes=os.path.getsize(path), cached=cache is not None) as s:
+        try:
+            if args.expand_instances:
+                # The memo table already parses each scene once; the cache covers flat parses
+                expander = InstanceExpander(find_project_root(path))
+                nodes = expander.expand(path)
+                resources = expander.resources[os.path.realpath(path)]
+                s.set(scenes=expander.parsed)
+            elif args.compact:
+                resources, nodes = parse_tscn_compact(path)
+            elif cache:
+                resources, nodes = cached_parse(path, parse_tscn, cache)
+                cache.close()
+            else:
+                resources, nodes = parse_tscn(path)
+        except binary_resource.BinaryResourceError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        s.set(nodes=len(nodes), resources=len(resources))
 
-    if not os.path.exists(path):
-         print(f"Error: File {path} not found.")
-         sys.exit(1)
+    problems = []
+    if args.validate or args.class_db:
+        import class_reference
+        reference = class_reference.open_default(path, args.class_db)
+        if reference is None:
+            print("Warning: Godot class reference not found; skipping validation.", file=sys.stderr)
+        else:
+            with skill_trace.span('transform', validate=True) as s, reference:
+                problems = validate_nodes(path, nodes, reference)
+                s.set(problems=len(problems))
 
-    resources, nodes = parse_tscn(path)
+    with skill_trace.span('transform') as s:
+        nodes = select_nodes(nodes, args.subtree, args.depth)
+        if args.subtree not in ('.', '') and not nodes:
+            print(f"Error: Node path '{args.subtree}' not found.")
+            sys.exit(1)
 
-    print("Resources:")
-    for rid, info in resources.items():
-        print(f"[{rid}] {info['path']} ({info['type']})")
-    print("\nNodes:")
+        unresolved = []
+        root = build_tree(nodes, unresolved, args.subtree or '.')
+        s.set(nodes=len(nodes), unresolved=len(unresolved))
 
-    root = build_tree(nodes)
-    if root:
-        print_tree(root)
-    else:
-        print("No nodes found.")
+    # One large buffer instead of a write per node
+    sys.stdout.flush()
+    try:
+        out = open(sys.stdout.fileno(), 'w', buffering=1 << 20, encoding='utf-8', closefd=False)
+    except (AttributeError, io.UnsupportedOperation):
+        out = None  # stdout is captured in memory (e.g. by skill_server.py)
+    with skill_trace.span('render', format=args.format, nodes=len(nodes)):
+        if out is None:
+            write_output(sys.stdout, args.format, resources, root, args.subtree or '.')
+        else:
+            with out:
+                write_output(out, args.format, resources, root, args.subtree or '.')
+
+    for n in unresolved:
+        print(f"Warning: node '{n['name']}' has unresolved parent '{n['parent']}'", file=sys.stderr)
+    for problem in problems:
+        print(f"Warning: {problem}", file=sys.stderr)
+    for warning in (expander.warnings if expander else ()):
+        print(f"Warning: {warning}", file=sys.stderr)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+"""
+Godot Node Store - Project-wide table of every node in every scene, with queries.
+
+Usage:
+  node_store.py build [--project <dir>] [--jobs N] [--full]
+  node_store.py query '<terms>' [--json] [--count] [--limit N] [--refresh]
+  node_store.py stats
+
+Query terms are field:glob pairs, all of which must match:
+  type:CharacterBody2D  script:scripts/enemies/*  name:Enemy*  instance:*.tscn
+  path:UI/*  parent:HUD  under:HUD  scene:res://levels/*
+`path` is the node path relative to the scene root ('.' for the root),
+`parent` the name of the direct parent and `under` the name of any ancestor.
+Globs use fnmatch syntax, and script/instance/scene globs may leave out the
+res:// prefix.
+
+The store is struct-of-arrays in .godot/node_store.bin: int32 columns for the
+name, type, script and instance string ids, the parent (an index local to the
+node's scene), the subtree size and the offset of the node's path in a path
+blob. Strings are interned into a second blob, and each string column has
+posting lists (the nodes holding each string id). The file is used in place
+through memoryviews, so loading it costs no per-node work.
+
+Nodes are stored depth-first, so a subtree is a contiguous run of nodes and
+under: narrows a query to ranges. A query is driven by its shortest posting
+list (or the children of its parent: nodes, or one regex over the path blob)
+and the other terms filter that, so the cost follows the smallest term rather
+than the number of nodes. Like resource_graph.py, rebuilding is incremental:
+unchanged scenes are copied over as column slices and only new or changed
+scenes are parsed.
+"""
+
+import argparse
+import json
+import os
+import re
+import shlex
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+from binary_resource import BinaryResourceError
+from inspect_scene import node_path, parse_tscn
+from parse_cache import find_project_root
+from resource_graph import POOL_THRESHOLD, iter_project_files, to_res_path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-project-manager', 'scripts'))
+import skill_trace  # noqa: E402
+
+STORE_VERSION = 1
+STORE_FILENAME = "node_store.bin"
+MAGIC = b'GDNODES\0'
+# Per-node int32 columns; string columns hold -1 for "none"
+STRING_COLUMNS = ('name', 'type', 'script', 'instance')
+NODE_COLUMNS = STRING_COLUMNS + ('parent', 'size', 'path_offset')
+FIELDS = ('type', 'script', 'name', 'instance', 'path', 'parent', 'under', 'scene')
+# Past this many node ranges, posting lists are filtered by a merge instead of sliced per range
+MAX_RANGE_SLICES = 64
+
+
+def scan_scene(root, filepath):
+    """
+    (res_path, mtime_ns, size, rows), rows being (name, type, script, instance,
+    parent index, subtree size) in depth-first order, so that every subtree is
+    a contiguous run of rows. Runs in workers.
+    """
+    st = os.stat(filepath)
+    _, nodes = parse_tscn(filepath)
+    rows = []
+    if nodes:
+        children = [[] for _ in nodes]
+        local = {'.': 0}
+        for i, n in enumerate(nodes[1:], 1):
+            parent = local.get(n['parent'])
+            if parent is None:
+                continue  # unresolved parent; build_tree drops these as well
+            children[parent].append(i)
+            local[node_path(n)] = i
+        stack = [(0, -1)]
+        while stack:
+            i, parent = stack.pop()
+            n = nodes[i]
+            stack.extend((c, len(rows)) for c in reversed(children[i]))
+            rows.append([n['name'], n['type'], n['script'], n.get('instance'), parent, 1])
+        # Descendants come after their node, so one backwards pass sums the sizes
+        for row in reversed(rows[1:]):
+            rows[row[4]][5] += row[5]
+    return to_res_path(root, filepath), st.st_mtime_ns, st.st_size, [tuple(r) for r in rows]
+
+
+def _scan_batch(root, filepaths):
+    results = []
+    for filepath in filepaths:
+        try:
+            results.append(scan_scene(root, filepath))
+        except (OSError, UnicodeDecodeError, BinaryResourceError) as e:
+            print(f"Warning: could not scan {filepath}: {e}", file=sys.stderr)
+    return results
+
+
+def glob_regex(pattern, segment=False):
+    """fnmatch-style glob as a regex fragment over one line; with `segment`, * doesn't cross '/'."""
+    star = '[^/\n]*' if segment else '[^\n]*'
+    out = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        i += 1
+        if c == '*':
+            out.append(star)
+        elif c == '?':
+            out.append('[^/\n]' if segment else '[^\n]')
+        elif c == '[':
+            j = pattern.find(']', i + 1 if pattern[i:i + 1] in ('!', ']') else i)
+            if j == -1:
+                out.append('\\[')
+                continue
+            body = pattern[i:j].replace('\\', '\\\\')
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append(f'[{body}]')
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+    return ''.join(out)
+
+
+def _has_magic(pattern):
+    return any(c in pattern for c in '*?[')
+
+
+class NodeStore:
+    """
+    The node table of a project. Node i belongs to the file whose
+    [first, first + count) range contains it; parent indices are local to that
+    range. Nodes are in depth-first order, so node i's subtree is
+    [i, i + size[i]).
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.files = []    # [res_path, mtime_ns, size, first, count, path_start]
+        self.count = 0
+        self.columns = {name: array('i') for name in NODE_COLUMNS}
+        self.string_offsets = array('i')
+        self.strings = bytearray(b'\n')  # '\n'-separated, with a leading '\n' so every string is delimited
+        self.paths = bytearray(b'\n')    # one line per node: its path relative to the scene root ('.' for the root)
+        self._postings = {}              # column -> (offsets, nodes), see postings()
+        self._interned = None
+        self._index_files()
+
+    def _index_files(self):
+        self._firsts = [f[3] for f in self.files]
+        self._starts = [f[5] for f in self.files]
+
+    @property
+    def store_path(self):
+        return os.path.join(self.root, ".godot", STORE_FILENAME)
+
+    # -- Loading and saving ---------------------------------------------------
+
+    @classmethod
+    def load(cls, root):
+        """The saved store, or an empty one if there is none (or it's outdated)."""
+        store = cls(root)
+        try:
+            with open(store.store_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return store
+        if data[:8] != MAGIC:
+            return store
+        header_len, = struct.unpack_from('<I', data, 8)
+        header = json.loads(data[12:12 + header_len])
+        if header.get('version') != STORE_VERSION or header.get('byteorder') != sys.byteorder:
+            return store
+        base = (12 + header_len + 3) & ~3
+        view = memoryview(data)
+
+        def section(name):
+            offset, nbytes = header['sections'][name]
+            return view[base + offset:base + offset + nbytes]
+
+        store.files = header['files']
+        store.count = header['nodes']
+        store.columns = {name: section(name).cast('i') for name in NODE_COLUMNS}
+        store.string_offsets = section('string_offsets').cast('i')
+        store.strings = section('strings').tobytes()
+        store.paths = section('paths').tobytes()
+        store._postings = {name: (section(name + '_offsets').cast('i'), section(name + '_postings').cast('i'))
+                           for name in STRING_COLUMNS}
+        store._index_files()
+        return store
+
+    def save(self):
+        sections = [(name, self.columns[name].tobytes()) for name in NODE_COLUMNS]
+        sections += [('string_offsets', self.string_offsets.tobytes()), ('strings', bytes(self.strings)),
+                     ('paths', bytes(self.paths))]
+        for name in STRING_COLUMNS:
+            offsets, nodes = self.postings(name)
+            sections += [(name + '_offsets', offsets.tobytes()), (name + '_postings', nodes.tobytes())]
+        # Section offsets are relative to the 4-byte aligned end of the header
+        layout = {}
+        offset = 0
+        for name, blob in sections:
+            layout[name] = [offset, len(blob)]
+            offset = (offset + len(blob) + 3) & ~3
+        header = json.dumps({'version': STORE_VERSION, 'byteorder': sys.byteorder, 'nodes': self.count,
+                             'files': self.files, 'sections': layout}, separators=(',', ':')).encode('utf-8')
+        head = MAGIC + struct.pack('<I', len(header)) + header
+
+        os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+        tmp_path = self.store_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(head + b'\0' * (-len(head) % 4))
+            for name, blob in sections:
+                f.write(blob + b'\0' * (-len(blob) % 4))
+        os.replace(tmp_path, self.store_path)
+
+    # -- Building ---------------------------------------------------------------
+
+    def refresh(self, jobs=None, full=False):
+        """Rescans new or changed scenes and drops deleted ones. Returns the number rescanned."""
+        known = {f[0]: i for i, f in enumerate(self.files)} if not full else {}
+        stale = []
+        current = []
+        for filepath in iter_project_files(self.root):
+            if not filepath.endswith(('.tscn', '.scn')):
+                continue
+            res_path = to_res_path(self.root, filepath)
+            current.append(res_path)
+            index = known.get(res_path)
+            if index is not None:
+                entry = self.files[index]
+                try:
+                    st = os.stat(filepath)
+                except OSError:
+                    continue
+                if entry[1] == st.st_mtime_ns and entry[2] == st.st_size:
+                    continue
+            stale.append(filepath)
+
+        if not stale and len(current) == len(self.files) and not full:
+            return 0
+
+        if len(stale) < POOL_THRESHOLD or jobs == 1:
+            results = _scan_batch(self.root, stale)
+        else:
+            jobs = jobs or os.cpu_count() or 1
+            batch_size = max(1, len(stale) // (jobs * 4))
+            batches = [stale[i:i + batch_size] for i in range(0, len(stale), batch_size)]
+            results = []
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                for batch in pool.map(_scan_batch, [self.root] * len(batches), batches):
+                    results.extend(batch)
+        scanned = {r[0]: r for r in results}
+
+        old = self
+        new = NodeStore(self.root)
+        if not full:
+            # Keep the string ids of the old store, so unchanged scenes copy over as-is
+            new.strings = bytearray(old.strings)
+            new.string_offsets = array('i', old.string_offsets)
+            new._interned = old._intern_table()
+        for res_path in sorted(current):
+            if res_path in scanned:
+                new._append_scene(*scanned[res_path])
+            elif res_path in known:
+                new._copy_scene(old, known[res_path])
+        new._index_files()
+        self.__dict__.update(new.__dict__)
+        return len(stale)
+
+    def _intern_table(self):
+        if self._interned is None:
+            names = bytes(self.strings[1:-1]).decode('utf-8').split('\n') if len(self.strings) > 1 else []
+            self._interned = {s: i for i, s in enumerate(names)}
+        return self._interned
+
+    def _intern(self, text):
+        if text is None:
+            return -1
+        table = self._intern_table()
+        sid = table.get(text)
+        if sid is None:
+            sid = table[text] = len(table)
+            self.string_offsets.append(len(self.strings))
+            self.strings += text.replace('\n', ' ').encode('utf-8') + b'\n'
+        return sid
+
+    def _append_scene(self, res_path, mtime_ns, size, rows):
+        first = self.count
+        path_start = len(self.paths)
+        cols = self.columns
+        paths = []
+        offset = 0
+        offsets = cols['path_offset']
+        for name, node_type, script, instance, parent, subtree in rows:
+            cols['name'].append(self._intern(name))
+            cols['type'].append(self._intern(node_type))
+            cols['script'].append(self._intern(script))
+            cols['instance'].append(self._intern(instance))
+            cols['parent'].append(parent)
+            cols['size'].append(subtree)
+            if parent == -1:
+                path = '.'
+            elif parent == 0:
+                path = name
+            else:
+                path = f'{paths[parent]}/{name}'
+            paths.append(path)
+            offsets.append(offset)
+            offset += len(path.encode('utf-8')) + 1
+        self.paths += ''.join(p + '\n' for p in paths).encode('utf-8')
+        self.files.append([res_path, mtime_ns, size, first, len(rows), path_start])
+        self.count += len(rows)
+
+    def _copy_scene(self, old, index):
+        """Appends file `index` of `old` as-is: its string ids are still valid, and parents and path offsets are local."""
+        res_path, mtime_ns, size, first, count, path_start = old.files[index]
+        for name in NODE_COLUMNS:
+            self.columns[name].frombytes(old.columns[name][first:first + count].tobytes())
+        path_end = old._starts[index + 1] if index + 1 < len(old.files) else len(old.paths)
+        self.files.append([res_path, mtime_ns, size, self.count, count, len(self.paths)])
+        self.paths += old.paths[path_start:path_end]
+        self.count += count
+
+    # -- Reading ----------------------------------------------------------------
+
+    def string(self, sid):
+        if sid < 0:
+            return None
+        start = self.string_offsets[sid]
+        return bytes(self.strings[start:self.strings.index(b'\n', start)]).decode('utf-8')
+
+    def file_of(self, i):
+        return bisect_right(self._firsts, i) - 1
+
+    def path_of(self, i):
+        """Path relative to the scene root (e.g. 'UI/HUD'), '.' for the root."""
+        entry = self.files[self.file_of(i)]
+        start = entry[5] + self.columns['path_offset'][i]
+        return bytes(self.paths[start:self.paths.index(b'\n', start)]).decode('utf-8')
+
+    def record(self, i):
+        entry = self.files[self.file_of(i)]
+        cols = self.columns
+        parent = cols['parent'][i]
+        return {
+            'scene': entry[0],
+            'path': self.path_of(i),
+            'name': self.string(cols['name'][i]),
+            'type': self.string(cols['type'][i]),
+            'script': self.string(cols['script'][i]),
+            'instance': self.string(cols['instance'][i]),
+            'parent': None if parent < 0 else self.string(cols['name'][entry[3] + parent]),
+        }
+
+    # -- Queries ----------------------------------------------------------------
+
+    def _string_ids(self, pattern):
+        """Ids of the interned strings matching a glob."""
+        if not _has_magic(pattern):
+            pos = self.strings.find(b'\n' + pattern.encode('utf-8') + b'\n')
+            return [] if pos < 0 else [bisect_left(self.string_offsets, pos + 1)]
+        regex = re.compile(('(?m)^' + glob_regex(pattern) + '$').encode('utf-8'))
+        return [bisect_left(self.string_offsets, m.start()) for m in regex.finditer(self.strings, 1, len(self.strings) - 1)]
+
+    def _scene_ranges(self, selected):
+        """Merged node ranges [lo, hi) of the selected file indices (every file for None)."""
+        if selected is None:
+            return [(0, self.count)] if self.count else []
+        ranges = []
+        for f in selected:
+            first, count = self.files[f][3], self.files[f][4]
+            if not count:
+                continue
+            if ranges and ranges[-1][1] == first:
+                ranges[-1] = (ranges[-1][0], first + count)
+            else:
+                ranges.append((first, first + count))
+        return ranges
+
+    def postings(self, column):
+        """(offsets, nodes): the nodes whose `column` holds string id s are nodes[offsets[s]:offsets[s + 1]], in order."""
+        index = self._postings.get(column)
+        if index is None:
+            col = self.columns[column]
+            counts = Counter(col)
+            offsets = array('i', [0])
+            total = 0
+            for sid in range(len(self.string_offsets)):
+                total += counts.get(sid, 0)
+                offsets.append(total)
+            order = sorted(range(self.count), key=col.__getitem__)  # stable, so node order within an id
+            index = self._postings[column] = (offsets, array('i', order[counts.get(-1, 0):]))
+        return index
+
+    def _count(self, column, ids):
+        offsets, _ = self.postings(column)
+        return sum(offsets[sid + 1] - offsets[sid] for sid in ids)
+
+    def _matches(self, column, ids, ranges):
+        """Sorted node indices in `ranges` whose `column` holds one of `ids`."""
+        offsets, nodes = self.postings(column)
+        parts = []
+        for sid in ids:
+            lo, hi = offsets[sid], offsets[sid + 1]
+            if len(ranges) > MAX_RANGE_SLICES:
+                parts.append(nodes[lo:hi])
+                continue
+            for a, b in ranges:
+                parts.append(nodes[bisect_left(nodes, a, lo, hi):bisect_left(nodes, b, lo, hi)])
+        # Each part is sorted, so sorting the concatenation is just a merge of runs
+        found = list(parts[0]) if len(parts) == 1 else sorted(chain.from_iterable(parts))
+        return _within(found, ranges) if len(ranges) > MAX_RANGE_SLICES else found
+
+    def _subtrees(self, ids, ranges):
+        """Merged ranges of the nodes strictly below a node in `ranges` named one of `ids`."""
+        sizes = self.columns['size']
+        found = []
+        for i in self._matches('name', ids, ranges):
+            if found and i < found[-1][1]:
+                continue  # below a match already taken
+            if sizes[i] > 1:
+                found.append((i + 1, i + sizes[i]))
+        return found
+
+    def _children(self, ids, ranges):
+        """Sorted node indices of the children of nodes in `ranges` named one of `ids`."""
+        sizes = self.columns['size']
+        found = []
+        for i in self._matches('name', ids, ranges):
+            child, end = i + 1, i + sizes[i]
+            while child < end:
+                found.append(child)
+                child += sizes[child]
+        found.sort()
+        return found
+
+    def _path_matches(self, regex, ranges):
+        """Sorted node indices in `ranges` whose path matches `regex`, which starts at the '\\n' before the line."""
+        offsets = self.columns['path_offset']
+        starts = self._starts
+        files = self.files
+        found = []
+        for lo, hi in ranges:
+            f = self.file_of(lo)
+            start = starts[f] + offsets[lo] - 1
+            end = len(self.paths) if hi == self.count else starts[self.file_of(hi)] + offsets[hi]
+            for m in regex.finditer(self.paths, start, end):
+                pos = m.start() + 1
+                while f + 1 < len(files) and starts[f + 1] <= pos:
+                    f += 1
+                first, count = files[f][3], files[f][4]
+                found.append(bisect_right(offsets, pos - starts[f], first, first + count) - 1)
+        return found
+
+    def query(self, text, limit=None):
+        """Node indices matching every term of a query, in project order."""
+        string_terms = []   # (column, ids)
+        parents = []        # name ids, one list per parent: term
+        unders = []         # name ids, one list per under: term
+        path_terms = []     # glob regexes over relative paths
+        selected = None     # file indices allowed by scene: terms
+        for field, pattern in parse_query(text):
+            if field in ('script', 'instance', 'scene') and not pattern.startswith(('res://', 'uid://', '*')):
+                pattern = 'res://' + pattern
+            if field in STRING_COLUMNS:
+                string_terms.append((field, self._string_ids(pattern)))
+            elif field == 'scene':
+                regex = re.compile(glob_regex(pattern) + r'\Z')
+                candidates = range(len(self.files)) if selected is None else selected
+                selected = [f for f in candidates if regex.match(self.files[f][0])]
+            elif field == 'path':
+                path_terms.append(glob_regex(pattern))
+            else:
+                (parents if field == 'parent' else unders).append(self._string_ids(pattern))
+        if not all(ids for _, ids in string_terms) or not all(parents) or not all(unders):
+            return []
+
+        # Narrow to node ranges first: scene: terms select files, under: terms subtrees
+        scene_ranges = self._scene_ranges(selected)
+        ranges = scene_ranges
+        for ids in unders:
+            if ranges:
+                ranges = _intersect(ranges, self._subtrees(ids, scene_ranges))
+        if not ranges:
+            return []
+        total = sum(hi - lo for lo, hi in ranges)
+
+        # Drive with the smallest posting list (or the children of the parent: term's
+        # nodes, or one regex over the path blob) and filter by the other terms
+        cols = self.columns
+        counts = sorted((self._count(column, ids), n) for n, (column, ids) in enumerate(string_terms))
+        parent_count = min(self._count('name', ids) for ids in parents) if parents else None
+        if counts and counts[0][0] <= total and (parent_count is None or counts[0][0] <= parent_count):
+            column, ids = string_terms.pop(counts[0][1])
+            candidates = self._matches(column, ids, ranges)
+        elif parents:
+            candidates = _within(self._children(parents.pop(), scene_ranges), ranges)
+        elif path_terms and not string_terms:
+            regex = re.compile(('\n(?:' + path_terms.pop() + ')(?=\n)').encode('utf-8'))
+            candidates = self._path_matches(regex, ranges)
+        else:
+            candidates = _iter_ranges(ranges)
+
+        for column, ids in string_terms:
+            col = cols[column]
+            ids = set(ids)
+            candidates = [i for i in candidates if col[i] in ids]
+        if parents:
+            names = cols['name']
+            parent_col = cols['parent']
+            firsts = self._firsts
+            for ids in parents:
+                ids = set(ids)
+                candidates = [i for i in candidates if parent_col[i] >= 0
+                              and names[firsts[bisect_right(firsts, i) - 1] + parent_col[i]] in ids]
+        for pattern in path_terms:
+            regex = re.compile('(?:' + pattern + r')\Z')
+            candidates = [i for i in candidates if regex.match(self.path_of(i))]
+        return list(islice(candidates, limit))
+
+
+def _iter_ranges(ranges):
+    return chain.from_iterable(range(lo, hi) for lo, hi in ranges)
+
+
+def _within(indices, ranges):
+    """The sorted `indices` that fall in one of the sorted, disjoint `ranges`."""
+    if len(ranges) == 1:
+        lo, hi = ranges[0]
+        return indices[bisect_left(indices, lo):bisect_left(indices, hi)]
+    found = []
+    r = 0
+    for i in indices:
+        while r < len(ranges) and ranges[r][1] <= i:
+            r += 1
+        if r == len(ranges):
+            break
+        if i >= ranges[r][0]:
+            found.append(i)
+    return found
+
+
+def _intersect(a, b):
+    """Intersection of two sorted lists of disjoint [lo, hi) ranges."""
+    found = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        lo, hi = max(a[i][0], b[j][0]), min(a[i][1], b[j][1])
+        if lo < hi:
+            found.append((lo, hi))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return found
+
+
+def parse_query(text):
+    """'type:Sprite2D under:HUD' -> [('type', 'Sprite2D'), ('under', 'HUD')]."""
+    terms = []
+    for word in shlex.split(text):
+        field, sep, pattern = word.partition(':')
+        if not sep or field not in FIELDS or not pattern:
+            raise ValueError(f"bad query term '{word}' (expected field:glob with field one of {', '.join(FIELDS)})")
+        terms.append((field, pattern))
+    return terms
+
+
+def format_record(r):
+    info = f" script={r['script']}" if r['script'] else ""
+    if r['instance']:
+        info += f" instance={r['instance']}"
+    return f"{r['scene']}:{r['path']} ({r['type'] or 'Instance'}){info}"
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--project', help='Project directory (default: search upwards from the CWD)')
+    common.add_argument('--jobs', type=int, help='Worker processes for scanning (default: all cores)')
+    skill_trace.add_arguments(common)
+
+    parser = argparse.ArgumentParser(description='Project-wide Godot node table and queries')
+    subparsers = parser.add_subparsers(dest='command')
+    build_parser = subparsers.add_parser('build', parents=[common], help='Build or incrementally update the store')
+    build_parser.add_argument('--full', action='store_true', help='Rescan every scene and compact the string table')
+    query_parser = subparsers.add_parser('query', parents=[common], help='Find nodes, e.g. "type:Label under:HUD"')
+    query_parser.add_argument('terms', help='field:glob terms (type, script, name, instance, path, parent, under, scene)')
+    query_parser.add_argument('--refresh', action='store_true', help='Rescan changed scenes before answering')
+    query_parser.add_argument('--json', action='store_true', help='Output JSON')
+    query_parser.add_argument('--count', action='store_true', help='Only print the number of matches')
+    query_parser.add_argument('--limit', type=int, help='Stop after this many matches')
+    subparsers.add_parser('stats', parents=[common], help='Sizes of the saved store')
+
+    args = parser.parse_args()
+    skill_trace.setup('node_store', args)
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    start = os.path.abspath(args.project) if args.project else os.getcwd()
+    root = find_project_root(os.path.join(start, "project.godot"))
+    if root is None:
+        print("Error: project.godot not found.")
+        sys.exit(1)
+
+    with skill_trace.span('read') as s:
+        store = NodeStore.load(root)
+        s.set(nodes=store.count, files=len(store.files))
+    if args.command == 'build' or getattr(args, 'refresh', False) or not store.files:
+        with skill_trace.span('parse') as s:
+            rescanned = store.refresh(args.jobs, full=getattr(args, 'full', False))
+            s.set(rescanned=rescanned, nodes=store.count)
+        if rescanned or args.command == 'build':
+            with skill_trace.span('write', nodes=store.count):
+                store.save()
+        if args.command == 'build':
+            print(f"Indexed {store.count} nodes in {len(store.files)} scenes ({rescanned} rescanned) "
+                  f"-> {store.store_path}")
+            return
+        store = NodeStore.load(root)
+
+    if args.command == 'stats':
+        print(f"{store.count} nodes in {len(store.files)} scenes, "
+              f"{len(store.string_offsets)} strings, {len(store.paths)} bytes of paths")
+        return
+
+    with skill_trace.span('transform') as s:
+        try:
+            matches = store.query(args.terms, None if args.count else args.limit)
+        except (ValueError, re.error) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        s.set(matches=len(matches))
+    with skill_trace.span('render', matches=len(matches)):
+        if args.count:
+            print(len(matches))
+        elif args.json:
+            print(json.dumps([store.record(i) for i in matches], indent=2))
+        else:
+            sys.stdout.write(''.join(format_record(store.record(i)) + '\n' for i in matches))
+    if not matches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
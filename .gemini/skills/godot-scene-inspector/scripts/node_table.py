@@ -0,0 +1,271 @@
+"""
+Compact node storage for very large scenes.
+
+parse_tscn() returns one dict per node, and with a children list and its own
+copies of the type and parent strings each node costs a few hundred bytes.
+NodeTable keeps the same nodes as parallel int32 columns instead: interned
+type/script/instance strings, names in one blob, the parent's row, and after
+link() first-child/next-sibling rows. That is around 30 bytes per node plus
+its name.
+
+Indexing a table gives NodeRow views that answer node['name'], node['type'],
+node['parent'], node['script'], node.get('instance') and node['children'] like
+the dicts do, so iter_tree(), print_tree(), node_record() and write_output()
+work on either. select_nodes() and build_tree() hand tables to select() and
+link().
+"""
+
+from array import array
+
+UNRESOLVED = -2  # parent row of a node whose parent path doesn't resolve
+
+FIELDS = ('name', 'type', 'parent', 'script', 'instance', 'children')
+
+
+class NodeRow:
+    """Read-only dict-like view of one row of a NodeTable."""
+
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, key):
+        return self.table.field(self.row, key)
+
+    def get(self, key, default=None):
+        return self.table.field(self.row, key) if key in FIELDS else default
+
+    def __contains__(self, key):
+        return key in FIELDS
+
+    def __repr__(self):
+        return f"NodeRow({self.table.name(self.row)!r}, row={self.row})"
+
+
+class PathIndex:
+    """
+    A path -> row map as an open-addressing table of (path hash, row) in two
+    arrays: about 20 bytes per node, where a dict of path strings costs ten
+    times that. Paths are told apart by their 64-bit hash alone.
+    """
+
+    def __init__(self, capacity=1024):
+        self.mask = capacity - 1
+        self.hashes = array('q', [0]) * capacity
+        self.rows = array('i', [-1]) * capacity
+        self.used = 0
+
+    def _slot(self, h):
+        hashes, rows, mask = self.hashes, self.rows, self.mask
+        i = h & mask
+        while rows[i] >= 0 and hashes[i] != h:
+            i = (i + 1) & mask
+        return i
+
+    def _grow(self):
+        hashes, rows, used = self.hashes, self.rows, self.used
+        self.__init__(2 * (self.mask + 1))
+        for h, row in zip(hashes, rows):
+            if row >= 0:
+                i = self._slot(h)
+                self.hashes[i] = h
+                self.rows[i] = row
+        self.used = used
+
+    def add(self, path, row):
+        if 2 * (self.used + 1) > self.mask + 1:
+            self._grow()
+        h = hash(path)
+        i = self._slot(h)
+        if self.rows[i] < 0:
+            self.used += 1
+        self.hashes[i] = h
+        self.rows[i] = row
+
+    def get(self, path, default=None):
+        row = self.rows[self._slot(hash(path))]
+        return default if row < 0 else row
+
+
+class NodeTable:
+    """
+    The nodes of a scene in file order, as columns. Row 0 is the root (or, for
+    a table from select(), the branch root at `base`). Parents always come
+    before their children.
+    """
+
+    def __init__(self, strings=None, base='.'):
+        self.strings = strings if strings is not None else {}  # interned string -> id
+        self.by_id = list(self.strings)
+        self.base = base
+        self.names = bytearray()
+        self.name_ends = array('i')
+        self.type = array('i')
+        self.script = array('i')
+        self.instance = array('i')
+        self.parent = array('i')       # row, -1 for row 0, UNRESOLVED if the path didn't resolve
+        self.unresolved = {}           # row -> parent path as written, for UNRESOLVED rows
+        self.first_child = None        # rows, filled in by link(); -1 for none
+        self.next_sibling = None
+
+    def __len__(self):
+        return len(self.parent)
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self.parent)
+        if not 0 <= row < len(self.parent):
+            raise IndexError('node row out of range')
+        return NodeRow(self, row)
+
+    def __iter__(self):
+        return (NodeRow(self, row) for row in range(len(self.parent)))
+
+    def intern(self, text):
+        if text is None:
+            return -1
+        sid = self.strings.get(text)
+        if sid is None:
+            sid = self.strings[text] = len(self.by_id)
+            self.by_id.append(text)
+        return sid
+
+    def string(self, sid):
+        return None if sid < 0 else self.by_id[sid]
+
+    def append(self, name, type, parent, instance=None, unresolved_path=None):
+        """Adds a node and returns its row; `parent` is a row (or UNRESOLVED, with the path as written)."""
+        row = len(self.parent)
+        self.names += name.encode('utf-8')
+        self.name_ends.append(len(self.names))
+        self.type.append(self.intern(type))
+        self.script.append(-1)
+        self.instance.append(self.intern(instance))
+        self.parent.append(parent)
+        if parent == UNRESOLVED:
+            self.unresolved[row] = unresolved_path
+        return row
+
+    def set_script(self, row, script):
+        self.script[row] = self.intern(script)
+
+    def name(self, row):
+        start = self.name_ends[row - 1] if row else 0
+        return self.names[start:self.name_ends[row]].decode('utf-8')
+
+    def path(self, row):
+        """Path of a row relative to the scene root, like node_path() ('.' for the root)."""
+        parents = self.parent
+        if row == 0:
+            return self.base
+        if parents[row] == UNRESOLVED:
+            parent = self.unresolved[row]
+            return self.name(row) if parent == '.' else f"{parent}/{self.name(row)}"
+        names = []
+        while row > 0:
+            names.append(self.name(row))
+            row = parents[row]
+        if self.base != '.':
+            names.append(self.base)
+        return '/'.join(reversed(names))
+
+    def field(self, row, key):
+        if key == 'name':
+            return self.name(row)
+        if key == 'type':
+            return self.string(self.type[row])
+        if key == 'script':
+            return self.string(self.script[row])
+        if key == 'instance':
+            return self.string(self.instance[row])
+        if key == 'parent':
+            parent = self.parent[row]
+            if parent == UNRESOLVED:
+                return self.unresolved[row]
+            return '.' if parent < 0 else self.path(parent)
+        if key == 'children':
+            children = []
+            if self.first_child is not None:
+                child = self.first_child[row]
+                while child >= 0:
+                    children.append(NodeRow(self, child))
+                    child = self.next_sibling[child]
+            return children
+        raise KeyError(key)
+
+    def find(self, path):
+        """Row of the node at a path relative to row 0, or None."""
+        row = 0
+        parents = self.parent
+        for segment in path.split('/'):
+            for child in range(row + 1, len(parents)):
+                if parents[child] == row and self.name(child) == segment:
+                    row = child
+                    break
+            else:
+                return None
+        return row
+
+    def select(self, subtree='.', max_depth=None):
+        """The table of the branch at `subtree`, at most `max_depth` levels deep (see select_nodes())."""
+        count = len(self.parent)
+        whole = subtree in ('.', '')
+        if not count or (whole and max_depth is None):
+            return self
+        top = 0 if whole else self.find(subtree)
+        if top is None:
+            return NodeTable(self.strings, subtree)
+        parents = self.parent
+        depth = array('i', [-1]) * count  # levels below `top`, -1 outside the branch
+        depth[top] = 0
+        rows = [top]
+        for row in range(top + 1, count):
+            parent = parents[row]
+            if parent >= 0 and depth[parent] >= 0:
+                if max_depth is None or depth[parent] < max_depth:
+                    depth[row] = depth[parent] + 1
+                    rows.append(row)
+            elif parent == UNRESOLVED and whole:
+                # Kept so that link() reports it, as build_tree() does
+                if max_depth is None or self.path(row).count('/') < max_depth:
+                    rows.append(row)
+        return self.subset(rows, '.' if whole else subtree)
+
+    def subset(self, rows, base):
+        """A table of the given rows (parents before children), re-rooted at rows[0]."""
+        table = NodeTable(self.strings, base)
+        table.by_id = self.by_id
+        new_row = array('i', [-1]) * len(self.parent)
+        for row in rows:
+            parent = self.parent[row]
+            if parent == UNRESOLVED:
+                new_parent, path = UNRESOLVED, self.unresolved[row]
+            else:
+                new_parent, path = (new_row[parent] if parent >= 0 else -1), None
+            new_row[row] = table.append(self.name(row), None, new_parent, None, path)
+            table.type[-1] = self.type[row]
+            table.script[-1] = self.script[row]
+            table.instance[-1] = self.instance[row]
+        return table
+
+    def link(self, unresolved=None):
+        """Fills in the child links and returns the root row (see build_tree())."""
+        count = len(self.parent)
+        if not count:
+            return None
+        first_child = array('i', [-1]) * count
+        next_sibling = array('i', [-1]) * count
+        parents = self.parent
+        # Backwards, so that every child list ends up in file order
+        for row in range(count - 1, 0, -1):
+            parent = parents[row]
+            if parent >= 0:
+                next_sibling[row] = first_child[parent]
+                first_child[parent] = row
+        self.first_child = first_child
+        self.next_sibling = next_sibling
+        if unresolved is not None:
+            unresolved.extend(NodeRow(self, row) for row in sorted(self.unresolved))
+        return NodeRow(self, 0)
@@ -0,0 +1,162 @@
+"""
+Persistent, opt-in cache for parsed scene files.
+
+Results are stored in a single SQLite file under the project's .godot/ folder,
+keyed by absolute path and validated against mtime, size and a content hash.
+The cache is size-bounded and evicts least-recently-used entries.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+
+# Bump when the shape of cached parse results changes
+CACHE_VERSION = 2
+CACHE_FILENAME = "inspect_scene_cache.sqlite"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+HASH_CHUNK = 1 << 20
+
+
+def find_project_root(path):
+    """Walks up from `path` to the directory containing project.godot, or None."""
+    current = os.path.dirname(os.path.abspath(path))
+    while True:
+        if os.path.exists(os.path.join(current, "project.godot")):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def file_digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """
+    LRU cache of JSON-serializable parse results.
+
+    A lookup whose mtime and size match the stored entry is a hit without reading
+    the file. If only the mtime changed (e.g. after a touch or checkout), the content
+    hash decides, so unchanged content is still served from the cache.
+    """
+
+    def __init__(self, db_path, max_bytes=DEFAULT_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=10)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS entries")
+            self.conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, digest TEXT,"
+            " data BLOB, nbytes INTEGER, last_used REAL)"
+        )
+        self.conn.commit()
+        self._touched = {}
+
+    @classmethod
+    def for_scene(cls, scene_path, max_bytes=DEFAULT_MAX_BYTES):
+        """Opens the cache of the project containing `scene_path` (or of the CWD)."""
+        root = find_project_root(scene_path) or os.getcwd()
+        return cls(os.path.join(root, ".godot", CACHE_FILENAME), max_bytes)
+
+    def get(self, path):
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        row = self.conn.execute(
+            "SELECT mtime_ns, size, digest, data FROM entries WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        mtime_ns, size, digest, data = row
+        if size != st.st_size:
+            return None
+        if mtime_ns != st.st_mtime_ns and file_digest(path) != digest:
+            return None
+        # Hits stay read-only; recency and refreshed mtimes are written by the next put() or close()
+        self._touched[path] = (st.st_mtime_ns, time.time())
+        return json.loads(zlib.decompress(data))
+
+    def put(self, path, result, st, digest):
+        """
+        Stores `result` under the stat and digest taken *before* parsing, so a file
+        rewritten mid-parse never gets its old contents recorded as current.
+        """
+        path = os.path.abspath(path)
+        self._touched.pop(path, None)
+        self._flush()
+        data = zlib.compress(json.dumps(result, separators=(',', ':')).encode('utf-8'))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, st.st_mtime_ns, st.st_size, digest, data, len(data), time.time()),
+        )
+        self._evict()
+        self.conn.commit()
+
+    def _flush(self):
+        if not self._touched:
+            return
+        self.conn.executemany(
+            "UPDATE entries SET mtime_ns = ?, last_used = ? WHERE path = ?",
+            [(mtime_ns, used, path) for path, (mtime_ns, used) in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for path, nbytes in self.conn.execute(
+                "SELECT path, nbytes FROM entries ORDER BY last_used").fetchall():
+            self.conn.execute("DELETE FROM entries WHERE path = ?", (path,))
+            total -= nbytes
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        try:
+            self._flush()
+            self.conn.commit()
+        except sqlite3.Error as e:
+            # Only recency is lost; cached entries themselves are untouched
+            print(f"Warning: could not update parse cache ({e}).", file=sys.stderr)
+        finally:
+            self.conn.close()
+
+
+def cached_parse(path, parse, cache):
+    """
+    Returns parse(path), served from `cache` when the file is unchanged.
+    Cache errors (locked or read-only database, ...) fall back to a plain parse.
+    """
+    try:
+        hit = cache.get(path)
+    except sqlite3.Error as e:
+        print(f"Warning: parse cache unavailable ({e}).", file=sys.stderr)
+        return parse(path)
+    if hit is not None:
+        return hit
+    try:
+        st = os.stat(path)
+        digest = file_digest(path)
+    except OSError:
+        return parse(path)
+    result = parse(path)
+    try:
+        cache.put(path, result, st, digest)
+    except sqlite3.Error as e:
+        print(f"Warning: could not update parse cache ({e}).", file=sys.stderr)
+    return result
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Godot Resource Graph - Project-wide dependency index for scenes, resources and scripts.
+
+Usage:
+  resource_graph.py build [--project <dir>] [--jobs N]
+  resource_graph.py deps <res://path> [--transitive]
+  resource_graph.py rdeps <res://path> [--transitive]
+  resource_graph.py missing
+
+Every .tscn/.tres/.gd file is scanned (in a process pool) for [ext_resource]
+paths and preload()/load() strings, every .gdshader/.gdshaderinc for its
+#includes, and every binary .scn/.res file for the ext resources in its
+header. uid:// references are resolved to res:// paths through project_paths.py;
+a uid the project doesn't know is kept as-is and retried on the next refresh.
+The graph is persisted to .godot/resource_graph.json and rebuilt
+incrementally: only files whose mtime or size changed are rescanned.
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from binary_resource import BinaryResource, BinaryResourceError, is_binary_resource
+from inspect_scene import Section, iter_tscn
+from parse_cache import find_project_root
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-project-manager', 'scripts'))
+import project_paths  # noqa: E402
+
+INDEX_VERSION = 3
+INDEX_FILENAME = "resource_graph.json"
+SCANNED_EXTENSIONS = ('.tscn', '.tres', '.gd', '.scn', '.res', '.gdshader', '.gdshaderinc')
+SHADER_EXTENSIONS = ('.gdshader', '.gdshaderinc')
+# Below this many files to scan, a process pool costs more than it saves
+POOL_THRESHOLD = 64
+
+# Not `<expr>.load(...)` (ConfigFile, Image, ...), which takes filesystem paths
+LOAD_PATTERN = re.compile(r'(?<![\w.])(?:preload|load|ResourceLoader\.load)\(\s*"([^"]+)"')
+SCHEME_PATTERN = re.compile(r'^[A-Za-z][\w+.-]*://')
+EXTENDS_PATTERN = re.compile(r'^\s*extends\s+"([^"]+)"', re.MULTILINE)
+INCLUDE_PATTERN = re.compile(r'^\s*#include\s+"([^"]+)"', re.MULTILINE)
+
+
+def to_res_path(root, filepath):
+    return "res://" + os.path.relpath(filepath, root).replace(os.sep, "/")
+
+
+def from_res_path(root, res_path):
+    return os.path.join(root, res_path[len("res://"):].replace("/", os.sep))
+
+
+def normalize_ref(ref, source_res_path):
+    """
+    Resolves a reference found in `source_res_path` to a res:// path (uid:// is
+    kept; ResourceGraph.resolve_uids() maps those). Returns None for other
+    schemes (user://, http://, ...).
+    """
+    if ref.startswith(("res://", "uid://")):
+        return ref
+    if SCHEME_PATTERN.match(ref):
+        return None
+    # Relative paths are relative to the referencing file
+    base = posixpath.dirname(source_res_path[len("res://"):])
+    return "res://" + posixpath.normpath(posixpath.join(base, ref))
+
+
+def scan_file(root, filepath):
+    """Returns (res_path, mtime_ns, size, deps) for one file. Runs in worker processes."""
+    res_path = to_res_path(root, filepath)
+    st = os.stat(filepath)
+    deps = []
+    if filepath.endswith('.gd'):
+        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        deps.extend(EXTENDS_PATTERN.findall(text))
+        deps.extend(LOAD_PATTERN.findall(text))
+    elif filepath.endswith(SHADER_EXTENSIONS):
+        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+            deps.extend(INCLUDE_PATTERN.findall(f.read()))
+    elif is_binary_resource(filepath):
+        with BinaryResource(filepath) as res:
+            deps.extend(path for _, path, _ in res.ext_resources)
+    else:
+        # Godot writes every [ext_resource] before sub-resources and nodes, so the
+        # rest of the file (often the bulk of it) doesn't need to be scanned.
+        for event in iter_tscn(filepath, keep_value=lambda tag, key: False):
+            if isinstance(event, Section):
+                if event.tag == 'ext_resource':
+                    if 'path' in event.attrs:
+                        deps.append(event.attrs['path'])
+                elif event.tag not in ('gd_scene', 'gd_resource'):
+                    break
+    seen = set()
+    unique = []
+    for dep in deps:
+        dep = normalize_ref(dep, res_path)
+        if dep is not None and dep not in seen:
+            seen.add(dep)
+            unique.append(dep)
+    return res_path, st.st_mtime_ns, st.st_size, unique
+
+
+def _scan_batch(root, filepaths):
+    results = []
+    for filepath in filepaths:
+        try:
+            results.append(scan_file(root, filepath))
+        except (OSError, UnicodeDecodeError, BinaryResourceError) as e:
+            print(f"Warning: could not scan {filepath}: {e}", file=sys.stderr)
+    return results
+
+
+def iter_project_files(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Skip .godot/, .git/, .import/ and other hidden folders
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for filename in filenames:
+            if filename.endswith(SCANNED_EXTENSIONS):
+                yield os.path.join(dirpath, filename)
+
+
+class ResourceGraph:
+    """Forward (file -> deps) and reverse (dep -> files) maps over a whole project."""
+
+    def __init__(self, root, files=None):
+        self.root = root
+        self.files = files or {}  # res_path -> {'mtime_ns', 'size', 'deps'}
+        self._reverse = None
+
+    @property
+    def index_path(self):
+        return os.path.join(self.root, ".godot", INDEX_FILENAME)
+
+    @classmethod
+    def load(cls, root):
+        graph = cls(root)
+        try:
+            with open(graph.index_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return graph
+        if data.get('version') == INDEX_VERSION:
+            graph.files = data['files']
+        return graph
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self, jobs=None):
+        """Rescans new or changed files and drops deleted ones. Returns the number rescanned."""
+        stale = []
+        current = set()
+        for filepath in iter_project_files(self.root):
+            res_path = to_res_path(self.root, filepath)
+            current.add(res_path)
+            entry = self.files.get(res_path)
+            if entry is not None:
+                try:
+                    st = os.stat(filepath)
+                except OSError:
+                    continue
+                if entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                    continue
+            stale.append(filepath)
+
+        for res_path in [p for p in self.files if p not in current]:
+            del self.files[res_path]
+
+        if len(stale) < POOL_THRESHOLD or jobs == 1:
+            results = _scan_batch(self.root, stale)
+        else:
+            jobs = jobs or os.cpu_count() or 1
+            batch_size = max(1, len(stale) // (jobs * 4))
+            batches = [stale[i:i + batch_size] for i in range(0, len(stale), batch_size)]
+            results = []
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                for batch in pool.map(_scan_batch, [self.root] * len(batches), batches):
+                    results.extend(batch)
+
+        for res_path, mtime_ns, size, deps in results:
+            self.files[res_path] = {'mtime_ns': mtime_ns, 'size': size, 'deps': deps}
+        self.resolve_uids()
+        self._reverse = None
+        return len(stale)
+
+    def resolve_uids(self):
+        """
+        Rewrites uid:// deps to the res:// paths the project's uid table maps them
+        to. Unknown uids stay as they are; they are retried on every refresh, since
+        the uid table can learn them without the referencing file changing.
+        """
+        paths = None
+        for entry in self.files.values():
+            deps = entry['deps']
+            if not any(dep.startswith(project_paths.UID_PREFIX) for dep in deps):
+                continue
+            if paths is None:
+                paths = project_paths.ProjectPaths(self.root)
+            seen = set()
+            resolved = []
+            for dep in deps:
+                if dep.startswith(project_paths.UID_PREFIX):
+                    dep = paths.uid_path(dep) or dep
+                if dep not in seen:
+                    seen.add(dep)
+                    resolved.append(dep)
+            entry['deps'] = resolved
+
+    @property
+    def reverse(self):
+        if self._reverse is None:
+            self._reverse = {}
+            for res_path, entry in self.files.items():
+                for dep in entry['deps']:
+                    self._reverse.setdefault(dep, []).append(res_path)
+        return self._reverse
+
+    def deps(self, res_path):
+        entry = self.files.get(res_path)
+        return list(entry['deps']) if entry else []
+
+    def rdeps(self, res_path):
+        return list(self.reverse.get(res_path, []))
+
+    def closure(self, res_path, edges):
+        """Breadth-first transitive closure of `edges(path)`, excluding `res_path` itself."""
+        seen = {res_path}
+        order = []
+        queue = deque([res_path])
+        while queue:
+            for nxt in edges(queue.popleft()):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    order.append(nxt)
+                    queue.append(nxt)
+        return order
+
+    def missing(self):
+        """Returns {missing res:// path: [files referencing it]}."""
+        result = {}
+        exists = {}
+        for dep, sources in self.reverse.items():
+            if not dep.startswith("res://"):
+                continue  # a uid the project doesn't know has no path to check
+            if dep not in exists:
+                exists[dep] = dep in self.files or os.path.exists(from_res_path(self.root, dep))
+            if not exists[dep]:
+                result[dep] = sorted(sources)
+        return result
+
+
+def normalize_query(root, path):
+    """Accepts res:// and uid:// paths, or file paths relative to the CWD."""
+    if path.startswith(project_paths.UID_PREFIX):
+        return project_paths.ProjectPaths(root).uid_path(path) or path
+    if path.startswith("res://"):
+        return path
+    return to_res_path(root, os.path.abspath(path))
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--project', help='Project directory (default: search upwards from the CWD)')
+    common.add_argument('--jobs', type=int, help='Worker processes for scanning (default: all cores)')
+    common.add_argument('--refresh', action='store_true', help='Rescan changed files before answering')
+    common.add_argument('--json', action='store_true', help='Output JSON')
+
+    parser = argparse.ArgumentParser(description='Project-wide Godot resource dependency graph')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('build', parents=[common], help='Build or incrementally update the index')
+    for name, help_text in (('deps', 'What a file pulls in'), ('rdeps', 'What depends on a file')):
+        sub = subparsers.add_parser(name, parents=[common], help=help_text)
+        sub.add_argument('path', help='res:// path or file path')
+        sub.add_argument('--transitive', action='store_true', help='Follow the graph recursively')
+    subparsers.add_parser('missing', parents=[common], help='References to paths that do not exist')
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    start = os.path.abspath(args.project) if args.project else os.getcwd()
+    root = find_project_root(os.path.join(start, "project.godot"))
+    if root is None:
+        print("Error: project.godot not found.")
+        sys.exit(1)
+
+    graph = ResourceGraph.load(root)
+    if args.command == 'build' or args.refresh or not graph.files:
+        rescanned = graph.refresh(args.jobs)
+        graph.save()
+        if args.command == 'build':
+            print(f"Indexed {len(graph.files)} files ({rescanned} rescanned) -> {graph.index_path}")
+            return
+
+    if args.command in ('deps', 'rdeps'):
+        target = normalize_query(root, args.path)
+        edges = graph.deps if args.command == 'deps' else graph.rdeps
+        result = graph.closure(target, edges) if args.transitive else edges(target)
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            for path in result:
+                print(path)
+    elif args.command == 'missing':
+        result = graph.missing()
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            for dep, sources in sorted(result.items()):
+                print(f"{dep}")
+                for source in sources:
+                    print(f"  <- {source}")
+        if result:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Godot Scene Diff - Structural diff of two .tscn files.
+
+Usage:
+  scene_diff.py <old.tscn> <new.tscn> [--format text|json]
+
+Reports node adds, removes, moves, type/instance/script/groups/index changes,
+property changes and added or removed [connection]s. Nodes inside instanced
+sub-scenes (overrides, and children added under them) are diffed at their
+path; the nodes between them and the instance stand in for the sub-scene's
+own. Resource ids are replaced by what they point to (ExtResource by its path,
+SubResource by a digest of its contents), so regenerated ids and reordered
+sections don't show up as changes.
+
+A move is only detected when the node keeps its name: either the whole
+subtree is unchanged, or exactly one removed and one added node share name
+and type. A node that is renamed and moved at once is reported as a remove
+plus an add.
+
+Every node gets a Merkle hash of its own attributes and its children's hashes,
+built bottom-up in one pass. The diff then only descends into subtrees whose
+hashes differ; an unchanged subtree costs one comparison however big it is.
+Sibling order is not part of the hash. Exits 1 if the scenes differ.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from audit_scenes import EXT_REF_PATTERN, SUB_REF_PATTERN
+from inspect_scene import Section, iter_tscn
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-project-manager', 'scripts'))
+import skill_trace  # noqa: E402
+
+
+# Header attributes compared besides name and parent
+FIELDS = ('type', 'instance', 'script', 'groups', 'index', 'instance_placeholder')
+
+
+class SceneNode:
+    __slots__ = FIELDS + ('name', 'props', 'children', 'own', 'hash', 'size', 'synthetic')
+
+    def __init__(self, name, type, instance, groups=None, index=None, instance_placeholder=None,
+                 synthetic=False):
+        self.name = name
+        self.type = type
+        self.instance = instance
+        self.script = None
+        self.groups = groups
+        self.index = index
+        self.instance_placeholder = instance_placeholder
+        self.synthetic = synthetic  # stands in for a node of an instanced sub-scene
+        self.props = {}
+        self.children = {}  # name -> SceneNode
+        self.own = None     # digest of FIELDS and properties
+        self.hash = None    # digest of name, own and the children's hashes
+        self.size = 1       # nodes in this subtree
+
+
+def _digest(parts):
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=16).digest()
+
+
+def _join(path, name):
+    return name if path == '.' else f'{path}/{name}'
+
+
+def _normalize(value, ext, subs):
+    """Replaces resource ids in a property value with what they refer to."""
+    if 'Resource(' not in value:
+        return value
+    value = EXT_REF_PATTERN.sub(lambda m: f'ExtResource("{ext.get(m.group(1), m.group(1))}")', value)
+    return SUB_REF_PATTERN.sub(lambda m: subs.get(m.group(1), m.group(0)), value)
+
+
+def _resource_path(value, ext):
+    """'res://x.gd' for an ExtResource("id") value, else the value unchanged."""
+    m = EXT_REF_PATTERN.fullmatch(value.strip())
+    return ext.get(m.group(1), value) if m else value
+
+
+def load_scene(filepath):
+    """
+    Parses a scene into (root SceneNode, connections, warnings), with every
+    node hashed. Connections are a set of (signal, from, to, method) tuples.
+    """
+    ext = {}    # ext_resource id -> path
+    subs = {}   # sub_resource id -> 'SubResource(Type:digest)'
+    sub = None  # [id, type, {property: value}] of the sub_resource being read
+    node = None
+    nodes = []  # (node, parent path or None for the root), in file order
+    connections = set()
+
+    def finish_sub():
+        sid, stype, props = sub
+        digest = _digest([stype] + [f'{k}={v}' for k, v in sorted(props.items())]).hex()[:12]
+        subs[sid] = f'SubResource({stype}:{digest})'
+
+    for event in iter_tscn(filepath):
+        if isinstance(event, Section):
+            if sub is not None:
+                finish_sub()
+                sub = None
+            node = None
+            attrs = event.attrs
+            if event.tag == 'ext_resource' and 'id' in attrs:
+                ext[attrs['id']] = attrs.get('path') or attrs.get('uid', '')
+            elif event.tag == 'sub_resource' and 'id' in attrs:
+                sub = [attrs['id'], attrs.get('type', 'Resource'), {}]
+            elif event.tag == 'node' and 'name' in attrs:
+                instance = attrs.get('instance')
+                node = SceneNode(attrs['name'], attrs.get('type'),
+                                 _resource_path(instance, ext) if instance else None,
+                                 attrs.get('groups'), attrs.get('index'), attrs.get('instance_placeholder'))
+                nodes.append((node, attrs.get('parent')))
+            elif event.tag == 'connection':
+                connections.add((attrs.get('signal'), attrs.get('from'), attrs.get('to'), attrs.get('method')))
+        elif node is not None:
+            if event.key == 'script':
+                node.script = _resource_path(event.value, ext)
+            else:
+                node.props[event.key] = _normalize(event.value, ext, subs)
+        elif sub is not None:
+            sub[2][event.key] = _normalize(event.value, ext, subs)
+    if sub is not None:
+        finish_sub()
+
+    warnings = []
+    if not nodes:
+        return None, connections, warnings
+    root = nodes[0][0]
+    by_path = {'.': root}
+    linked = [root]
+    for n, parent in nodes[1:]:
+        parent_node = _parent_node(by_path, linked, parent) if parent is not None else None
+        if parent_node is None:
+            warnings.append(f"{filepath}: node '{n.name}' has unresolved parent '{parent}'")
+            continue
+        path = _join(parent, n.name)
+        stand_in = by_path.get(path)
+        if stand_in is not None and stand_in.synthetic:
+            # Created for a deeper node before this override of it
+            n.children = stand_in.children
+            linked[linked.index(stand_in)] = n
+        else:
+            linked.append(n)
+        parent_node.children[n.name] = n
+        by_path[path] = n
+
+    # Parents are linked before their children, so reversed order is bottom-up
+    for n in reversed(linked):
+        n.own = _digest([getattr(n, field) or '' for field in FIELDS]
+                        + [f'{k}={v}' for k, v in sorted(n.props.items())])
+        parts = [n.name, n.own.hex()]
+        for name in sorted(n.children):
+            child = n.children[name]
+            parts.append(child.hash.hex())
+            n.size += child.size
+        n.hash = _digest(parts)
+    return root, connections, warnings
+
+
+def _parent_node(by_path, linked, parent):
+    """
+    The node at `parent`. A path that leads into an instanced sub-scene gets
+    synthetic nodes for the missing steps (InstanceExpander-style), since the
+    sub-scene's own nodes aren't in this file. None if the path doesn't resolve.
+    """
+    node = by_path.get(parent)
+    if node is not None:
+        return node
+    parts = parent.split('/')
+    depth = len(parts) - 1
+    while depth > 0 and '/'.join(parts[:depth]) not in by_path:
+        depth -= 1
+    if depth == 0:
+        return None
+    path = '/'.join(parts[:depth])
+    node = by_path[path]
+    if not (node.instance or node.synthetic):
+        return None
+    for name in parts[depth:]:
+        child = SceneNode(name, None, None, synthetic=True)
+        node.children[name] = child
+        path = _join(path, name)
+        by_path[path] = child
+        linked.append(child)
+        node = child
+    return node
+
+
+def _compare_own(a, b, path, changes):
+    for field in FIELDS:
+        old, new = getattr(a, field), getattr(b, field)
+        if old != new:
+            changes.append({'change': field, 'path': path, 'old': old, 'new': new})
+    for key in sorted(a.props.keys() | b.props.keys()):
+        old, new = a.props.get(key), b.props.get(key)
+        if old != new:
+            changes.append({'change': 'property', 'path': path, 'key': key, 'old': old, 'new': new})
+
+
+def diff_trees(old_root, new_root):
+    """Changes between two hashed trees, as a list of dicts (see the module docstring)."""
+    changes = []
+    removed = {}  # path -> SceneNode, subtree roots only
+    added = {}
+    stack = [(old_root, new_root, '.', '.')]
+    while stack:
+        while stack:
+            a, b, a_path, b_path = stack.pop()
+            if a.hash == b.hash:
+                continue
+            if a.own != b.own:
+                _compare_own(a, b, b_path, changes)
+            for name, child in a.children.items():
+                other = b.children.get(name)
+                if other is None:
+                    removed[_join(a_path, name)] = child
+                elif other.hash != child.hash:
+                    stack.append((child, other, _join(a_path, name), _join(b_path, name)))
+            for name, child in b.children.items():
+                if name not in a.children:
+                    added[_join(b_path, name)] = child
+
+        # Moves: an added subtree identical to a removed one, then a unique
+        # match on name and type (whose contents are diffed as well)
+        by_hash = {}
+        for path, n in removed.items():
+            by_hash.setdefault(n.hash, []).append(path)
+        for path, n in list(added.items()):
+            candidates = by_hash.get(n.hash)
+            if candidates:
+                old_path = candidates.pop(0)
+                del removed[old_path], added[path]
+                changes.append({'change': 'moved', 'path': old_path, 'to': path})
+
+        by_kind = {}
+        for path, n in removed.items():
+            by_kind.setdefault((n.name, n.type), []).append(path)
+        added_kinds = {}
+        for n in added.values():
+            added_kinds[n.name, n.type] = added_kinds.get((n.name, n.type), 0) + 1
+        for path, n in list(added.items()):
+            candidates = by_kind.get((n.name, n.type))
+            if candidates and len(candidates) == 1 and added_kinds[n.name, n.type] == 1:
+                old_path = candidates.pop()
+                stack.append((removed.pop(old_path), added.pop(path), old_path, path))
+                changes.append({'change': 'moved', 'path': old_path, 'to': path})
+
+    for path, n in removed.items():
+        changes.append({'change': 'removed', 'path': path, 'type': n.type, 'nodes': n.size})
+    for path, n in added.items():
+        changes.append({'change': 'added', 'path': path, 'type': n.type, 'nodes': n.size})
+    return changes
+
+
+def diff_scenes(old_path, new_path):
+    """(changes, warnings) between two scene files."""
+    with skill_trace.span('parse', bytes=os.path.getsize(old_path) + os.path.getsize(new_path)) as s:
+        old_root, old_connections, warnings = load_scene(old_path)
+        new_root, new_connections, new_warnings = load_scene(new_path)
+        warnings += new_warnings
+        s.set(nodes=(old_root.size if old_root else 0) + (new_root.size if new_root else 0))
+
+    with skill_trace.span('transform') as s:
+        if old_root is None or new_root is None:
+            changes = []
+            if old_root is not None:
+                changes.append({'change': 'removed', 'path': '.', 'type': old_root.type, 'nodes': old_root.size})
+            if new_root is not None:
+                changes.append({'change': 'added', 'path': '.', 'type': new_root.type, 'nodes': new_root.size})
+        else:
+            changes = diff_trees(old_root, new_root)
+            if old_root.name != new_root.name:
+                changes.append({'change': 'renamed', 'path': '.', 'old': old_root.name, 'new': new_root.name})
+        for change, connections in (('connection_removed', old_connections - new_connections),
+                                    ('connection_added', new_connections - old_connections)):
+            for signal, source, target, method in sorted(connections, key=str):
+                changes.append({'change': change, 'signal': signal, 'from': source, 'to': target,
+                                'method': method})
+        changes.sort(key=lambda c: ('path' not in c, c.get('path', ''), c['change']))
+        s.set(changes=len(changes))
+    return changes, warnings
+
+
+def _short(value, limit=60):
+    if value is None:
+        return '(unset)'
+    value = ' '.join(str(value).split())
+    return value if len(value) <= limit else value[:limit - 3] + '...'
+
+
+def format_change(c):
+    kind = c['change']
+    if kind in ('added', 'removed'):
+        extra = f", {c['nodes']} nodes" if c['nodes'] > 1 else ''
+        return f"{'+' if kind == 'added' else '-'} {c['path']} ({c['type'] or 'Instance'}{extra})"
+    if kind == 'moved':
+        return f"> {c['path']} -> {c['to']}"
+    if kind == 'property':
+        return f"~ {c['path']}: {c['key']} {_short(c['old'])} -> {_short(c['new'])}"
+    if kind.startswith('connection'):
+        sign = '+' if kind == 'connection_added' else '-'
+        return f"{sign} connection {c['signal']}: {c['from']} -> {c['to']} ({c['method']})"
+    return f"~ {c['path']}: {kind} {_short(c['old'])} -> {_short(c['new'])}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Structural diff of two Godot scene files')
+    parser.add_argument('old', help='Old .tscn file')
+    parser.add_argument('new', help='New .tscn file')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format (default: text)')
+    skill_trace.add_arguments(parser)
+    args = parser.parse_args()
+    skill_trace.setup('scene_diff', args)
+
+    for path in (args.old, args.new):
+        if not os.path.exists(path):
+            print(f"Error: File {path} not found.")
+            sys.exit(2)
+
+    changes, warnings = diff_scenes(args.old, args.new)
+    with skill_trace.span('render', format=args.format, changes=len(changes)):
+        if args.format == 'json':
+            print(json.dumps(changes, indent=2))
+        elif changes:
+            print('\n'.join(format_change(c) for c in changes))
+        else:
+            print("No differences.")
+    for warning in warnings:
+        print(f"Warning: {warning}", file=sys.stderr)
+    if changes:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Godot Project Watch - Keeps an in-memory index of a project's files in step with the disk.
+
+Usage:
+  project_watch.py [--project <dir>] [--poll] [--interval SECONDS]
+
+Prints one JSON line per change ({"kind": "added|modified|removed", "path": "res://..."})
+until interrupted. skill_server.py start --watch uses ProjectWatcher to keep its
+parsed scenes and project settings fresh without re-checking files per request.
+
+The project is walked once at start. After that, changes come from inotify on
+Linux (a watch per directory, drained without blocking on every sync()), or
+from a thread that re-stats the project every `interval` seconds elsewhere, or
+when inotify watches run out. Like resource_graph.py, hidden directories
+(.godot/, .git/, ...) are skipped.
+
+  watcher = ProjectWatcher(root)
+  watcher.subscribe(lambda changes: ...)   # [(kind, abspath)], called from sync()
+  watcher.start()
+  watcher.sync()                           # apply pending changes, notify subscribers
+  watcher.resolve('res://player.gd')       # -> absolute path or None, from the index
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'godot-scene-inspector', 'scripts'))
+from parse_cache import find_project_root  # noqa: E402
+from resource_graph import to_res_path  # noqa: E402
+
+DEFAULT_INTERVAL = 1.0
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+
+def _stat_key(st):
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def walk_files(directory):
+    """{abspath: stat key} of every file below `directory`, skipping hidden directories."""
+    found = {}
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith('.'):
+                        stack.append(entry.path)
+                elif entry.is_file():
+                    found[entry.path] = _stat_key(entry.stat())
+            except OSError:
+                continue
+    return found
+
+
+class InotifyUnavailable(OSError):
+    """inotify can't be used here (not Linux, or out of watches)."""
+
+
+class _Inotify:
+    """A non-blocking inotify descriptor with one watch per directory."""
+
+    def __init__(self):
+        name = ctypes.util.find_library('c')
+        try:
+            libc = ctypes.CDLL(name, use_errno=True)
+            self._add_watch = libc.inotify_add_watch
+        except (OSError, AttributeError, TypeError):
+            raise InotifyUnavailable('inotify is not available on this platform') from None
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise InotifyUnavailable(os.strerror(ctypes.get_errno()))
+        self.dirs = {}  # watch descriptor -> directory
+
+    def watch(self, directory):
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise InotifyUnavailable('out of inotify watches (fs.inotify.max_user_watches)')
+            return  # the directory went away meanwhile
+        self.dirs[wd] = directory
+
+    def read(self):
+        """Pending (directory, mask, name) events; an empty name is about the directory itself."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, size = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + size].rstrip(b'\0'))
+                offset += size
+                directory = self.dirs.get(wd)
+                if mask & IN_IGNORED:
+                    self.dirs.pop(wd, None)
+                elif directory is not None or mask & IN_Q_OVERFLOW:
+                    events.append((directory, mask, name))
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ProjectWatcher:
+    """
+    The files of a project as {abspath: (mtime_ns, size, inode)}, kept current by
+    inotify or polling. `exact` is true with inotify: then a file that sync()
+    reports no change for is known to be unchanged, without a stat.
+    """
+
+    def __init__(self, root, backend='auto', interval=DEFAULT_INTERVAL):
+        self.root = os.path.abspath(root)
+        self.backend = backend
+        self.interval = interval
+        self.files = {}
+        self.listeners = []
+        self.inotify = None
+        self.events = 0
+        self.changes = 0
+        self._lock = threading.Lock()
+        self._pending = {}  # abspath -> stat key or None, found by the poll thread
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def exact(self):
+        return self.inotify is not None
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def start(self):
+        if self.backend in ('auto', 'inotify'):
+            try:
+                self.inotify = _Inotify()
+                self._watch_tree(self.root)
+            except InotifyUnavailable:
+                if self.inotify is not None:
+                    self.inotify.close()
+                    self.inotify = None
+                if self.backend == 'inotify':
+                    raise
+        self.files = walk_files(self.root)
+        if self.inotify is None:
+            self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def covers(self, path):
+        """Whether changes to `path` are tracked (inside the project and not in a hidden directory)."""
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel == os.curdir or rel.startswith(os.pardir):
+            return False
+        return not any(part.startswith('.') for part in rel.split(os.sep)[:-1])
+
+    def resolve(self, res_path):
+        """Absolute path of an existing res:// file, or None; answered from the index alone."""
+        if not res_path.startswith('res://'):
+            return None
+        path = os.path.join(self.root, res_path[len('res://'):].replace('/', os.sep))
+        return path if os.path.normpath(path) in self.files else None
+
+    def stats(self):
+        return {'root': self.root, 'backend': 'inotify' if self.exact else 'poll',
+                'files': len(self.files), 'events': self.events, 'changes': self.changes}
+
+    # -- Updates --------------------------------------------------------------------
+
+    def sync(self):
+        """Applies changes seen since the last call and passes them to the subscribers."""
+        if self.inotify is not None:
+            found = self._read_inotify()
+        else:
+            with self._lock:
+                found, self._pending = self._pending, {}
+        changes = []
+        with self._lock:
+            for path, key in found.items():
+                old = self.files.get(path)
+                if key is None:
+                    if old is not None:
+                        del self.files[path]
+                        changes.append(('removed', path))
+                elif old != key:
+                    self.files[path] = key
+                    changes.append(('added' if old is None else 'modified', path))
+        if changes:
+            self.changes += len(changes)
+            for listener in self.listeners:
+                listener(changes)
+        return changes
+
+    def _read_inotify(self):
+        """{abspath: stat key or None} for the paths touched by pending events."""
+        found = {}
+        for directory, mask, name in self.inotify.read():
+            self.events += 1
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: compare a fresh walk with the index
+                current = walk_files(self.root)
+                found.update((path, None) for path in self.files if path not in current)
+                found.update(current)
+                continue
+            if not name:
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    self._forget_tree(directory, found)
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if name.startswith('.'):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files can land in it before its watch exists, so walk it once
+                    self._watch_tree(path)
+                    found.update(walk_files(path))
+                elif mask & IN_MOVED_FROM:
+                    self._forget_tree(path, found)
+                continue
+            try:
+                found[path] = _stat_key(os.stat(path))
+            except OSError:
+                found[path] = None
+        return found
+
+    def _watch_tree(self, directory):
+        self.inotify.watch(directory)
+        for dirpath, dirnames, _ in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for d in dirnames:
+                self.inotify.watch(os.path.join(dirpath, d))
+
+    def _forget_tree(self, directory, found):
+        prefix = os.path.join(directory, '')
+        found.update((path, None) for path in self.files if path.startswith(prefix))
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.interval):
+            current = walk_files(self.root)
+            with self._lock:
+                # Compared against the index plus what the last polls already queued
+                known = dict(self.files, **self._pending)
+                for path, key in current.items():
+                    if known.get(path) != key:
+                        self._pending[path] = key
+                for path, key in known.items():
+                    if key is not None and path not in current:
+                        self._pending[path] = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print changes to the files of a Godot project')
+    parser.add_argument('--project', help='Project directory (default: found from the working directory)')
+    parser.add_argument('--poll', action='store_true', help='Poll with stat() instead of using inotify')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help='Seconds between polls (and between checks for inotify events)')
+    args = parser.parse_args()
+
+    root = args.project or find_project_root(os.path.join(os.getcwd(), 'project.godot'))
+    if not root:
+        print("Error: project.godot not found.")
+        sys.exit(1)
+
+    watcher = ProjectWatcher(root, 'poll' if args.poll else 'auto', args.interval)
+
+    def report(changes):
+        for kind, path in changes:
+            print(json.dumps({'kind': kind, 'path': to_res_path(watcher.root, path)}), flush=True)
+
+    watcher.subscribe(report)
+    with watcher:
+        print(f"Watching {len(watcher.files)} files in {watcher.root} ({watcher.stats()['backend']})",
+              file=sys.stderr, flush=True)
+        try:
+            while True:
+                if watcher.inotify is not None:
+                    select.select([watcher.inotify.fd], [], [], args.interval)
+                else:
+                    time.sleep(args.interval)
+                watcher.sync()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
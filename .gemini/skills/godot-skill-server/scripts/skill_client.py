@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Godot Skill Client - Runs skill scripts through a warm skill_server.py.
+
+Usage:
+  skill_client.py <script> [args ...]          e.g. skill_client.py manage_project.py get application/config/name
+  skill_client.py --call <method> [--params JSON]
+
+Behaves exactly like running the script directly (same output and exit code).
+If no server is listening, the script is run locally instead, so callers never
+need to know whether the server is up.
+
+Long-running callers should import SkillClient and keep one connection open;
+each call is then a single round trip on a Unix socket.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import socket
+import sys
+import tempfile
+
+SKILLS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+# Script name -> path relative to the skills directory
+SCRIPTS = {
+    'manage_project': 'godot-project-manager/scripts/manage_project.py',
+    'manage_inputs': 'godot-input-manager/scripts/manage_inputs.py',
+    'inspect_scene': 'godot-scene-inspector/scripts/inspect_scene.py',
+    'build_scene': 'godot-scene-builder/scripts/build_scene.py',
+    'setup_layers': 'godot-physics-setup/scripts/setup_layers.py',
+}
+
+
+class SkillServerError(Exception):
+    """A JSON-RPC error returned by the server."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def default_socket_path():
+    """$GODOT_SKILLS_SOCKET, or a per-user socket in the temp directory."""
+    path = os.environ.get('GODOT_SKILLS_SOCKET')
+    if path:
+        return path
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(tempfile.gettempdir(), f"godot-skills-{uid}.sock")
+
+
+def script_name(script):
+    """Accepts 'manage_project', 'manage_project.py' or a path to the script."""
+    name = os.path.basename(script)
+    return name[:-3] if name.endswith('.py') else name
+
+
+class SkillClient:
+    """Persistent JSON-RPC connection to skill_server.py."""
+
+    def __init__(self, socket_path=None, timeout=None):
+        self.socket_path = socket_path or default_socket_path()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(self.socket_path)
+        self.reader = self.sock.makefile('rb')
+        self.ids = itertools.count(1)
+
+    def call(self, method, **params):
+        request = {'jsonrpc': '2.0', 'id': next(self.ids), 'method': method, 'params': params}
+        self.sock.sendall(json.dumps(request, separators=(',', ':')).encode('utf-8') + b'\n')
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("skill server closed the connection")
+        response = json.loads(line)
+        if 'error' in response:
+            raise SkillServerError(response['error']['code'], response['error']['message'])
+        return response['result']
+
+    def run(self, script, argv, cwd=None, stdin=None):
+        """Runs a script's CLI in the server. Returns {'exit_code', 'stdout', 'stderr'}."""
+        return self.call('run', script=script_name(script), argv=list(argv),
+                         cwd=cwd or os.getcwd(), stdin=stdin)
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_locally(name, argv):
+    """Replaces this process with the script itself (the no-server fallback)."""
+    path = os.path.join(SKILLS_DIR, SCRIPTS[name])
+    sys.stdout.flush()
+    os.execv(sys.executable, [sys.executable, path] + argv)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run Godot skill scripts through the warm skill server')
+    parser.add_argument('--socket', help='Server socket (default: $GODOT_SKILLS_SOCKET or a per-user temp path)')
+    parser.add_argument('--call', metavar='METHOD', help='Call a JSON-RPC method directly and print the result')
+    parser.add_argument('--params', default='{}', help='JSON object of parameters for --call')
+    parser.add_argument('script', nargs='?', help=f"One of: {', '.join(sorted(SCRIPTS))}")
+    parser.add_argument('args', nargs=argparse.REMAINDER, help='Arguments for the script')
+    args = parser.parse_args()
+
+    if args.call:
+        with SkillClient(args.socket) as client:
+            try:
+                result = client.call(args.call, **json.loads(args.params))
+            except SkillServerError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+        print(json.dumps(result, indent=2))
+        return
+
+    if not args.script:
+        parser.print_help()
+        sys.exit(1)
+    name = script_name(args.script)
+    if name not in SCRIPTS:
+        print(f"Error: unknown script '{args.script}'. Known: {', '.join(sorted(SCRIPTS))}")
+        sys.exit(1)
+
+    try:
+        client = SkillClient(args.socket)
+    except OSError:
+        run_locally(name, args.args)
+    # Only forward stdin when the script is told to read it ('--from -', '--manifest -')
+    stdin = sys.stdin.read() if '-' in args.args else None
+    with client:
+        result = client.run(name, args.args, stdin=stdin)
+    sys.stdout.write(result['stdout'])
+    sys.stderr.write(result['stderr'])
+    sys.exit(result['exit_code'])
+
+
+if __name__ == "__main__":
+    main()
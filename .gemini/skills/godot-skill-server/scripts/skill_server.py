@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Godot Skill Server - Keeps the skill scripts loaded and their parsed state warm.
+
+Usage:
+  skill_server.py start [--socket PATH] [--idle-timeout SECONDS] [--watch [DIR]] [--poll]
+  skill_server.py status [--socket PATH]
+  skill_server.py stop [--socket PATH]
+
+Serves newline-delimited JSON-RPC 2.0 on a Unix socket. The `run` method runs
+any script of skill_client.SCRIPTS in-process with the given argv/cwd/stdin and
+returns its stdout, stderr and exit code, so skill_client.py is a drop-in for
+the CLIs. Parsed scenes and project.godot documents are cached in memory and
+reloaded when the file's mtime, size or inode changes.
+
+With --watch, a project_watch.ProjectWatcher follows the project's files
+(inotify, or stat polling with --poll or where inotify isn't available).
+Before each request, the files changed since the last one are dropped from the
+caches, so only those get reparsed. With inotify, cached entries are then
+trusted without a stat, and res:// paths resolve from the watcher's index.
+uid:// paths are looked up in project_paths.py's uid table.
+
+Methods:
+  ping                                  -> server info and cache statistics
+  run {script, argv, cwd, stdin}        -> {exit_code, stdout, stderr}
+  project.get {project, keys}           -> {key: value or null}
+  project.dump {project}                -> {key: value}
+  project.set {project, settings}       -> {updated, added}
+  inputs.list {project}                 -> [action names]
+  inputs.apply {project, manifest}      -> {added, updated}
+  scene.parse {path}                    -> {resources, nodes}
+  project.resolve {path}                -> absolute path of a res:// or uid:// file, or null
+  scene.build {definitions, incremental, cwd} -> build_scenes() summary
+  shutdown                              -> stops the server
+"""
+
+import argparse
+import contextlib
+import importlib
+import inspect
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+
+from project_watch import DEFAULT_INTERVAL, ProjectWatcher, find_project_root
+from skill_client import SCRIPTS, SKILLS_DIR, SkillClient, SkillServerError, default_socket_path
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class FileMemo:
+    """
+    Caches `load(path)` per file until its mtime, size or inode changes.
+    Atomic rewrites (temp file + rename) change the inode, so they are always seen.
+    With an exact (inotify) `watcher` that has discard() subscribed, entries for
+    files it covers are current until dropped, and are returned without a stat.
+    """
+
+    def __init__(self, load, max_entries=256, watcher=None):
+        self.load = load
+        self.max_entries = max_entries
+        self.watcher = watcher
+        self.entries = OrderedDict()  # abspath -> (stat key, value)
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, path):
+        abspath = os.path.abspath(path)
+        watcher = self.watcher
+        if watcher is not None and watcher.exact and abspath in self.entries and watcher.covers(abspath):
+            watcher.sync()  # one non-blocking read; drops the entry if the file just changed
+            if abspath in self.entries:
+                self.entries.move_to_end(abspath)
+                self.hits += 1
+                return self.entries[abspath][1]
+        st = os.stat(abspath)
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        entry = self.entries.get(abspath)
+        if entry is not None and entry[0] == key:
+            self.entries.move_to_end(abspath)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = self.load(path)
+        self.entries[abspath] = (key, value)
+        self.entries.move_to_end(abspath)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return value
+
+    def discard(self, changes):
+        """Drops the entries of changed files; a ProjectWatcher listener."""
+        for _, path in changes:
+            self.entries.pop(path, None)
+
+    def stats(self):
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class SkillHost:
+    """Imports the skill scripts once and dispatches JSON-RPC calls to them."""
+
+    def __init__(self, watch=None, backend='auto', interval=DEFAULT_INTERVAL):
+        self.started = time.time()
+        self.requests = 0
+        self.lock = threading.Lock()  # scripts use process-wide cwd/stdout, so calls run one at a time
+        self.modules = {}
+        for name, relpath in SCRIPTS.items():
+            directory = os.path.dirname(os.path.join(SKILLS_DIR, relpath))
+            if directory not in sys.path:
+                sys.path.insert(0, directory)
+            self.modules[name] = importlib.import_module(name)
+
+        self.trace = importlib.import_module('skill_trace')  # on sys.path via the project manager dir
+        self.paths = importlib.import_module('project_paths')
+        self.watcher = ProjectWatcher(watch, backend, interval).start() if watch else None
+        inspect_scene = self.modules['inspect_scene']
+        # inspect_scene.main() looks parse_tscn up at call time, so the CLI gets the warm cache too.
+        # Parsed node dicts are safe to share: build_tree() resets their children on every call.
+        self.scenes = FileMemo(inspect_scene.parse_tscn, watcher=self.watcher)
+        inspect_scene.parse_tscn = self.scenes
+        # Documents in this cache are only read; writes always start from a fresh load
+        manage_project = self.modules['manage_project']
+        self.projects = FileMemo(manage_project.ProjectDocument.load, watcher=self.watcher)
+        manage_project.read_document = self.projects  # read-only CLI commands share it via run
+        if self.watcher is not None:
+            self.watcher.subscribe(self.scenes.discard)
+            self.watcher.subscribe(self.projects.discard)
+            self.watcher.subscribe(self._forget_paths)
+
+        self.methods = {
+            'ping': self.ping,
+            'run': self.run,
+            'project.get': self.project_get,
+            'project.dump': self.project_dump,
+            'project.set': self.project_set,
+            'inputs.list': self.inputs_list,
+            'inputs.apply': self.inputs_apply,
+            'scene.parse': self.scene_parse,
+            'scene.build': self.scene_build,
+            'project.resolve': self.project_resolve,
+        }
+
+    def dispatch(self, method, params):
+        handler = self.methods.get(method)
+        if handler is None:
+            raise RpcError(METHOD_NOT_FOUND, f"Unknown method '{method}'")
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "params must be an object")
+        # Only a mismatch with the handler's signature is the caller's fault; a TypeError
+        # raised inside the handler is a server bug and goes out as SERVER_ERROR
+        try:
+            inspect.signature(handler).bind(**params)
+        except TypeError as e:
+            raise RpcError(INVALID_PARAMS, f"{method}: {e}")
+        with self.lock:
+            self.requests += 1
+            if self.watcher is not None:
+                self.watcher.sync()
+            else:
+                # Nothing tells us when files or uids come and go, so start over per request
+                self.paths.clear_cache()
+            return handler(**params)
+
+    def ping(self):
+        return {
+            'pid': os.getpid(),
+            'uptime': time.time() - self.started,
+            'requests': self.requests,
+            'scripts': sorted(self.modules),
+            'scene_cache': self.scenes.stats(),
+            'project_cache': self.projects.stats(),
+            'watch': self.watcher.stats() if self.watcher is not None else None,
+        }
+
+    def run(self, script, argv=(), cwd=None, stdin=None):
+        module = self.modules.get(script)
+        if module is None:
+            raise RpcError(INVALID_PARAMS, f"Unknown script '{script}'")
+        out = io.StringIO()
+        err = io.StringIO()
+        exit_code = 0
+        saved = (sys.argv, sys.stdin, os.getcwd())
+        try:
+            if cwd:
+                os.chdir(cwd)
+            sys.argv = [os.path.join(SKILLS_DIR, SCRIPTS[script])] + list(argv)
+            sys.stdin = io.StringIO(stdin or '')
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                try:
+                    module.main()
+                except SystemExit as e:
+                    if isinstance(e.code, int):
+                        exit_code = e.code
+                    elif e.code is not None:
+                        print(e.code, file=sys.stderr)
+                        exit_code = 1
+                except Exception:
+                    traceback.print_exc()
+                    exit_code = 1
+                finally:
+                    # Flush this run's trace/profile now; atexit only fires when the server exits
+                    self.trace.finish()
+        finally:
+            sys.argv, sys.stdin = saved[0], saved[1]
+            os.chdir(saved[2])
+        return {'exit_code': exit_code, 'stdout': out.getvalue(), 'stderr': err.getvalue()}
+
+    def project_get(self, project, keys):
+        doc = self.projects(project)
+        return {key: doc.get(key) for key in keys}
+
+    def project_dump(self, project):
+        return self.projects(project).to_dict()
+
+    def project_set(self, project, settings):
+        doc = self.modules['manage_project'].ProjectDocument.load(project)
+        updated = added = 0
+        for key, value in settings.items():
+            try:
+                existed = doc.set(key, value)
+            except ValueError as e:
+                raise RpcError(INVALID_PARAMS, f"{key}: {e}")
+            if existed:
+                updated += 1
+            else:
+                added += 1
+        doc.save(project)
+        return {'updated': updated, 'added': added}
+
+    def inputs_list(self, project):
+        txn = self.modules['manage_inputs'].InputMapTransaction(project)
+        return [block for block in txn.blocks if block in txn.actions]
+
+    def inputs_apply(self, project, manifest):
+        manage_inputs = self.modules['manage_inputs']
+        try:
+            added, updated = manage_inputs.apply_manifest(project, manifest)
+        except ValueError as e:
+            raise RpcError(INVALID_PARAMS, str(e))
+        return {'added': added, 'updated': updated}
+
+    def scene_parse(self, path):
+        resources, nodes = self.scenes(path)
+        return {
+            'resources': resources,
+            'nodes': [{k: n[k] for k in ('name', 'type', 'parent', 'script')} for n in nodes],
+        }
+
+    def _forget_paths(self, changes):
+        # The project_paths tables only go stale when files appear or vanish, or a uid changes
+        if any(kind != 'modified' or path.endswith(self.paths.UID_SIDECAR) for kind, path in changes):
+            self.paths.clear_cache()
+
+    def project_resolve(self, path):
+        if self.watcher is not None:
+            if path.startswith(self.paths.UID_PREFIX):
+                path = self.paths.project_for(self.watcher.root).uid_path(path) or ''
+            return self.watcher.resolve(path)
+        paths = self.paths.project_for()
+        filepath = paths.to_file(path) if paths is not None else None
+        return filepath if filepath is not None and os.path.isfile(filepath) else None
+
+    def scene_build(self, definitions, incremental=False, cwd=None, jobs=None):
+        # Output paths are resolved against the caller's working directory
+        saved = os.getcwd()
+        try:
+            if cwd:
+                os.chdir(cwd)
+            return self.modules['build_scene'].build_scenes(definitions, jobs, incremental)
+        finally:
+            os.chdir(saved)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """One JSON-RPC request per line; a connection can carry any number of them."""
+
+    def handle(self):
+        host = self.server.host
+        for line in self.rfile:
+            self.server.last_activity = time.monotonic()
+            if not line.strip():
+                continue
+            request_id = None
+            try:
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    raise RpcError(PARSE_ERROR, f"Invalid JSON: {e}")
+                if not isinstance(request, dict):
+                    raise RpcError(PARSE_ERROR, "Request must be a JSON object")
+                request_id = request.get('id')
+                method = request.get('method')
+                if method == 'shutdown':
+                    response = {'jsonrpc': '2.0', 'id': request_id, 'result': True}
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                else:
+                    result = host.dispatch(method, request.get('params') or {})
+                    response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+            except RpcError as e:
+                response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': e.code, 'message': str(e)}}
+            except Exception as e:
+                trace = traceback.format_exc()
+                sys.__stderr__.write(trace)  # a concurrent run() may have sys.stderr redirected
+                response = {'jsonrpc': '2.0', 'id': request_id,
+                            'error': {'code': SERVER_ERROR, 'message': f"{type(e).__name__}: {e}",
+                                      'data': {'traceback': trace}}}
+            self.wfile.write(json.dumps(response, separators=(',', ':')).encode('utf-8') + b'\n')
+
+
+class SkillServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, host):
+        self.host = host
+        self.last_activity = time.monotonic()
+        super().__init__(socket_path, RequestHandler)
+
+
+def server_running(socket_path):
+    try:
+        with SkillClient(socket_path, timeout=2) as client:
+            return client.call('ping')
+    except (OSError, ValueError, SkillServerError):
+        return None
+
+
+def serve(socket_path, idle_timeout=None, watch=None, backend='auto', interval=DEFAULT_INTERVAL):
+    if os.path.exists(socket_path):
+        if server_running(socket_path):
+            print(f"Error: a skill server is already listening on {socket_path}")
+            sys.exit(1)
+        os.unlink(socket_path)  # left behind by a server that died
+
+    host = SkillHost(watch, backend, interval)
+    server = SkillServer(socket_path, host)
+    os.chmod(socket_path, 0o600)
+
+    if idle_timeout:
+        def watchdog():
+            while True:
+                time.sleep(min(idle_timeout, 5))
+                if time.monotonic() - server.last_activity > idle_timeout:
+                    server.shutdown()
+                    return
+        threading.Thread(target=watchdog, daemon=True).start()
+
+    print(f"Skill server {os.getpid()} listening on {socket_path}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if host.watcher is not None:
+            host.watcher.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--socket', help='Socket path (default: $GODOT_SKILLS_SOCKET or a per-user temp path)')
+
+    parser = argparse.ArgumentParser(description='Warm JSON-RPC server for the Godot skill scripts')
+    subparsers = parser.add_subparsers(dest='command')
+    start_parser = subparsers.add_parser('start', parents=[common], help='Run the server in the foreground')
+    start_parser.add_argument('--idle-timeout', type=float,
+                              help='Exit after this many seconds without requests')
+    start_parser.add_argument('--watch', nargs='?', const='', metavar='DIR',
+                              help='Follow file changes in this project (default: the one around the working directory)')
+    start_parser.add_argument('--poll', action='store_true', help='With --watch, poll with stat() instead of inotify')
+    start_parser.add_argument('--poll-interval', type=float, default=DEFAULT_INTERVAL,
+                              help='Seconds between polls')
+    subparsers.add_parser('status', parents=[common], help='Show whether a server is running')
+    subparsers.add_parser('stop', parents=[common], help='Ask a running server to exit')
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    socket_path = args.socket or default_socket_path()
+    if args.command == 'start':
+        watch = args.watch
+        if watch == '':
+            watch = find_project_root(os.path.join(os.getcwd(), 'project.godot'))
+            if watch is None:
+                print("Error: --watch: project.godot not found; pass the project directory.")
+                sys.exit(1)
+        serve(socket_path, args.idle_timeout, watch, 'poll' if args.poll else 'auto', args.poll_interval)
+    elif args.command == 'status':
+        info = server_running(socket_path)
+        if info is None:
+            print(f"No skill server on {socket_path}")
+            sys.exit(1)
+        print(json.dumps(info, indent=2))
+    elif args.command == 'stop':
+        try:
+            with SkillClient(socket_path, timeout=5) as client:
+                client.call('shutdown')
+        except (OSError, SkillServerError):
+            print(f"No skill server on {socket_path}")
+            sys.exit(1)
+        print("Stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Peak memory of inspect_scene's two node representations on one large scene.
+
+Usage:
+  node_memory.py [--nodes 1000000] [--depth 12] [--seed 0] [--workdir DIR]
+                 [--output results.json] [--min-ratio 10]
+
+Generates one scene (synthetic_project.py) and, each in a fresh interpreter,
+parses it with parse_tscn() (a dict per node) and parse_tscn_compact() (a
+NodeTable) and links it with build_tree(). Reports the peak RSS of each above
+that of an interpreter that only imported the modules. Peak RSS comes from
+getrusage(), so this needs a Unix. With --min-ratio, exits 1 if the dict
+version doesn't use at least that many times the memory of the compact one.
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_project import scene_text
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.gemini', 'skills',
+                           'godot-scene-inspector', 'scripts')
+VARIANTS = ('baseline', 'dict', 'compact')
+
+
+def measure(variant, scene):
+    """Runs in the child: parses and links `scene`, returns peak RSS in bytes and the time taken."""
+    sys.path.insert(0, SCRIPTS_DIR)
+    import inspect_scene
+
+    start = time.perf_counter()
+    nodes = []
+    if variant == 'dict':
+        _, nodes = inspect_scene.parse_tscn(scene)
+    elif variant == 'compact':
+        _, nodes = inspect_scene.parse_tscn_compact(scene)
+    if nodes:
+        inspect_scene.build_tree(nodes)
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return {'peak': peak if sys.platform == 'darwin' else peak * 1024, 'nodes': len(nodes), 'seconds': seconds}
+
+
+def generate(scene, nodes, depth, seed):
+    with open(scene + '.tmp', 'w', newline='\n') as f:
+        f.write(scene_text(random.Random(seed), 0, nodes, depth, 1))
+    os.replace(scene + '.tmp', scene)
+
+
+def run_child(*args):
+    # Children start out with the peak RSS of their parent on Linux, so the
+    # parent never holds anything big, not even the scene text
+    result = subprocess.run([sys.executable, os.path.abspath(__file__)] + [str(a) for a in args],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout) if result.stdout else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Peak RSS of dict vs compact scene nodes')
+    parser.add_argument('--nodes', type=int, default=1_000_000, help='Nodes in the generated scene')
+    parser.add_argument('--depth', type=int, default=12, help='Maximum tree depth')
+    parser.add_argument('--seed', type=int, default=0, help='Generator seed')
+    parser.add_argument('--workdir', help='Keep the generated scene here and reuse it (default: a temp dir)')
+    parser.add_argument('--output', help='Write the results as JSON')
+    parser.add_argument('--min-ratio', type=float, help='Fail unless dict uses this many times the compact memory')
+    parser.add_argument('--measure', nargs=2, metavar=('VARIANT', 'SCENE'), help=argparse.SUPPRESS)
+    parser.add_argument('--generate', metavar='SCENE', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return
+    if args.generate:
+        generate(args.generate, args.nodes, args.depth, args.seed)
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='godot-node-memory-')
+    try:
+        os.makedirs(workdir, exist_ok=True)
+        scene = os.path.join(workdir, f"memory_{args.nodes}_{args.depth}_{args.seed}.tscn")
+        if not os.path.exists(scene):
+            run_child('--generate', scene, '--nodes', args.nodes, '--depth', args.depth, '--seed', args.seed)
+        print(f"{args.nodes} nodes, {os.path.getsize(scene) / 1e6:.1f} MB scene")
+
+        results = {variant: run_child('--measure', variant, scene) for variant in VARIANTS}
+        base = results['baseline']['peak']
+        print(f"{'baseline':<10} peak {base / 1e6:8.1f} MB")
+        for variant in VARIANTS[1:]:
+            r = results[variant]
+            r['net'] = max(0, r['peak'] - base)
+            print(f"{variant:<10} peak +{r['net'] / 1e6:7.1f} MB  {r['net'] / max(1, r['nodes']):7.1f} bytes/node"
+                  f"  parse+link {r['seconds']:.2f}s")
+        ratio = results['dict']['net'] / max(1, results['compact']['net'])
+        print(f"dict/compact: {ratio:.1f}x")
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'nodes': args.nodes, 'depth': args.depth, 'seed': args.seed, 'ratio': ratio,
+                       'results': results}, f, indent=2)
+    if args.min_ratio is not None and ratio < args.min_ratio:
+        print(f"FAIL: ratio {ratio:.1f}x is below {args.min_ratio}x")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
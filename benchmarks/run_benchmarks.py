@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the hot paths of the skill scripts on synthetic projects.
+
+Usage:
+  run_benchmarks.py [--sizes small,medium] [--filter REGEX] [--output results.json]
+                    [--baseline baseline.json] [--threshold 0.2] [--threshold-for PATTERN=FRACTION]
+  run_benchmarks.py --scenes 30 --nodes 2000 --depth 10 --actions 50 --settings 300
+
+Each size generates a seeded project (synthetic_project.py) and times every
+benchmark with timeit: the loop count is calibrated to at least 0.2s, then
+repeated --repeat times. Per-call min and median are reported and written as
+JSON. Given a --baseline (a previous --output), the run fails (exit 1) if any
+benchmark got slower than its threshold allows. Runs offline, standard library only.
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+from synthetic_project import generate_project
+
+SKILLS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.gemini', 'skills')
+for _skill in ('godot-scene-inspector', 'godot-project-manager', 'godot-input-manager',
+               'godot-scene-builder', 'godot-physics-setup', 'godot-export-manager'):
+    sys.path.insert(0, os.path.join(SKILLS_DIR, _skill, 'scripts'))
+
+import audit_scenes  # noqa: E402
+import build_scene  # noqa: E402
+import export_reachability  # noqa: E402
+import inspect_scene  # noqa: E402
+import manage_inputs  # noqa: E402
+import manage_project  # noqa: E402
+import node_store  # noqa: E402
+import project_paths  # noqa: E402
+import resource_graph  # noqa: E402
+import scene_diff  # noqa: E402
+import setup_layers  # noqa: E402
+import variant  # noqa: E402
+
+RESULTS_VERSION = 1
+
+SIZES = {
+    'small': {'scenes': 10, 'nodes': 100, 'depth': 5, 'actions': 20, 'settings': 50},
+    'medium': {'scenes': 40, 'nodes': 1000, 'depth': 8, 'actions': 100, 'settings': 500},
+    'large': {'scenes': 100, 'nodes': 5000, 'depth': 12, 'actions': 400, 'settings': 2000},
+}
+
+
+class Context:
+    """A generated project and the paths benchmarks work on."""
+
+    def __init__(self, root, sizes, scratch):
+        self.root = root
+        self.sizes = sizes
+        self.scratch = scratch  # per-run directory for benchmarks that write files
+        self.project_file = os.path.join(root, 'project.godot')
+        self.scene = os.path.join(root, 'scenes', f"scene_{max(0, sizes['scenes'] - 1)}.tscn")
+        with open(self.project_file, 'r', newline='') as f:
+            self.project_text = f.read()
+
+    def scratch_project(self):
+        path = os.path.join(self.scratch, 'project.godot')
+        shutil.copyfile(self.project_file, path)
+        return path
+
+
+# Each benchmark takes a Context and returns the zero-argument callable to time.
+
+def bench_parse_tscn(ctx):
+    return lambda: inspect_scene.parse_tscn(ctx.scene)
+
+
+def bench_parse_tscn_compact(ctx):
+    return lambda: inspect_scene.parse_tscn_compact(ctx.scene)
+
+
+def bench_build_tree(ctx):
+    _, nodes = inspect_scene.parse_tscn(ctx.scene)
+    return lambda: inspect_scene.build_tree(nodes)
+
+
+def bench_write_json(ctx):
+    resources, nodes = inspect_scene.parse_tscn(ctx.scene)
+    root = inspect_scene.build_tree(nodes)
+    return lambda: inspect_scene.write_output(io.StringIO(), 'json', resources, root)
+
+
+def bench_project_parse(ctx):
+    return lambda: manage_project.ProjectDocument(ctx.project_text)
+
+
+def bench_project_get_all(ctx):
+    doc = manage_project.ProjectDocument(ctx.project_text)
+    keys = doc.keys()
+    return lambda: [doc.get(k) for k in keys]
+
+
+def bench_project_set_render(ctx):
+    def run():
+        doc = manage_project.ProjectDocument(ctx.project_text)
+        doc.set('display/window/size/viewport_width', 1280)
+        doc.set('benchmark/new_section/value', '"x"')
+        return doc.render()
+    return run
+
+
+def bench_input_transaction(ctx):
+    def run():
+        txn = manage_inputs.InputMapTransaction(ctx.project_file, ctx.project_text)
+        txn.set_action('bench_jump', [manage_inputs.make_key_event('Space')])
+        return txn.render()
+    return run
+
+
+def bench_add_action(ctx):
+    path = ctx.scratch_project()
+    events = [manage_inputs.make_key_event('Space')]
+
+    def run():
+        # The full CLI path: read, edit, locked atomic write (fsync included)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manage_inputs.add_action(path, 'bench_jump', events)
+    return run
+
+
+def bench_input_conflicts(ctx):
+    def run():
+        txn = manage_inputs.InputMapTransaction(ctx.project_file, ctx.project_text)
+        return manage_inputs.InputMap.from_transaction(txn).conflicts()
+    return run
+
+
+def _action_values(ctx):
+    txn = manage_inputs.InputMapTransaction(ctx.project_file, ctx.project_text)
+    return [text.split('=', 1)[1] for text in txn.actions.values()]
+
+
+def bench_variant_loads(ctx):
+    values = _action_values(ctx)
+    return lambda: [variant.loads(v) for v in values]
+
+
+def bench_variant_dumps(ctx):
+    values = [variant.loads(v) for v in _action_values(ctx)]
+    return lambda: [variant.dumps(v) for v in values]
+
+
+def bench_expand_instances(ctx):
+    # A level instancing each of 10 prefabs many times; every prefab is parsed once per run
+    root = os.path.join(ctx.scratch, 'instances')
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, 'project.godot'), 'w') as f:
+        f.write('config_version=5\n')
+    for p in range(10):
+        lines = ['[gd_scene format=3]', '', f'[node name="Prefab{p}" type="Node2D"]']
+        lines += [f'[node name="Part{i}" type="Sprite2D" parent="."]' for i in range(ctx.sizes['depth'] * 3)]
+        with open(os.path.join(root, f'prefab_{p}.tscn'), 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+    lines = ['[gd_scene format=3]', '']
+    lines += [f'[ext_resource type="PackedScene" path="res://prefab_{p}.tscn" id="{p}"]' for p in range(10)]
+    lines += ['', '[node name="Level" type="Node2D"]']
+    for i in range(ctx.sizes['nodes']):
+        lines += [f'[node name="Instance{i}" parent="." instance=ExtResource("{i % 10}")]',
+                  f'position = Vector2({i}, 0)']
+    level = os.path.join(root, 'level.tscn')
+    with open(level, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    return lambda: inspect_scene.InstanceExpander(root).expand(level)
+
+
+def bench_scene_diff(ctx):
+    # The same scene with one property changed and its ext_resource ids renamed
+    with open(ctx.scene, 'r') as f:
+        text = f.read()
+    edited = os.path.join(ctx.scratch, 'edited.tscn')
+    with open(edited, 'w') as f:
+        f.write(text.replace('id="1_', 'id="9_').replace('ExtResource("1_', 'ExtResource("9_')
+                .replace('position = Vector2(', 'position = Vector2(1', 1))
+    return lambda: scene_diff.diff_scenes(ctx.scene, edited)
+
+
+def bench_build_tscn(ctx):
+    count = ctx.sizes['nodes']
+    node_specs = [f"N{i}:Node2D:{'.' if i < 10 else f'N{i % 10}'}" for i in range(1, count)]
+    scripts = {'Root': 'res://scripts/script_0.gd'}
+    return lambda: build_scene.build_tscn('Root:Node2D', node_specs, scripts, [], [])
+
+
+def bench_add_layer_names(ctx):
+    return lambda: setup_layers.add_layer_names(ctx.project_text, setup_layers.LAYER_NAMES_2D)
+
+
+def bench_resource_graph(ctx):
+    return lambda: resource_graph.ResourceGraph(ctx.root).refresh(jobs=1)
+
+
+def bench_node_store_query(ctx):
+    store = node_store.NodeStore(ctx.root)
+    store.refresh(jobs=1)
+    return lambda: store.query('type:Sprite2D under:N1*')
+
+
+def bench_export_reachability(ctx):
+    export_reachability.ExportReachability(ctx.root, jobs=1).run()  # builds the resource graph index
+    return lambda: export_reachability.ExportReachability(ctx.root, jobs=1).run().unused()
+
+
+def bench_audit_scene(ctx):
+    audit_scenes._init_worker(project_paths.ProjectPaths(ctx.root).load())
+    return lambda: audit_scenes.audit_scene(ctx.scene)
+
+
+BENCHMARKS = {
+    'inspect_scene.parse_tscn': bench_parse_tscn,
+    'inspect_scene.parse_tscn_compact': bench_parse_tscn_compact,
+    'inspect_scene.build_tree': bench_build_tree,
+    'inspect_scene.write_output_json': bench_write_json,
+    'inspect_scene.expand_instances': bench_expand_instances,
+    'scene_diff.diff_scenes': bench_scene_diff,
+    'manage_project.parse': bench_project_parse,
+    'manage_project.get_all': bench_project_get_all,
+    'manage_project.set_render': bench_project_set_render,
+    'manage_inputs.transaction': bench_input_transaction,
+    'manage_inputs.add_action': bench_add_action,
+    'manage_inputs.conflicts': bench_input_conflicts,
+    'variant.loads_input_map': bench_variant_loads,
+    'variant.dumps_input_map': bench_variant_dumps,
+    'build_scene.build_tscn': bench_build_tscn,
+    'setup_layers.add_layer_names': bench_add_layer_names,
+    'resource_graph.refresh': bench_resource_graph,
+    'node_store.query': bench_node_store_query,
+    'audit_scenes.audit_scene': bench_audit_scene,
+    'export_reachability.run': bench_export_reachability,
+}
+
+
+def project_for(workdir, size_name, sizes, seed):
+    """Generates the project for these sizes once per workdir; later runs reuse it."""
+    key = hashlib.blake2b(json.dumps([sizes, seed], sort_keys=True).encode(), digest_size=6).hexdigest()
+    root = os.path.join(workdir, f"{size_name}-{key}")
+    marker = os.path.join(root, '.generated')
+    if not os.path.exists(marker):
+        shutil.rmtree(root, ignore_errors=True)
+        generate_project(root, seed, **sizes)
+        open(marker, 'w').close()
+    return root
+
+
+def time_benchmark(fn, repeat):
+    """Returns (number, [per-call seconds for each repeat])."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return number, [t / number for t in timer.repeat(repeat, number)]
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(size_plan, selected, seed, repeat, workdir):
+    results = []
+    for size_name, sizes in size_plan:
+        start = time.perf_counter()
+        root = project_for(workdir, size_name, sizes, seed)
+        print(f"[{size_name}] project ready in {time.perf_counter() - start:.1f}s: {sizes}", file=sys.stderr)
+        scratch = tempfile.mkdtemp(prefix='bench-scratch-', dir=workdir)
+        ctx = Context(root, sizes, scratch)
+        try:
+            for name in selected:
+                fn = BENCHMARKS[name](ctx)
+                number, per_call = time_benchmark(fn, repeat)
+                result = {
+                    'size': size_name,
+                    'benchmark': name,
+                    'params': sizes,
+                    'number': number,
+                    'min': min(per_call),
+                    'median': statistics.median(per_call),
+                }
+                results.append(result)
+                print(f"[{size_name}] {name:<34} {format_seconds(result['min']):>10} min "
+                      f"{format_seconds(result['median']):>10} median", file=sys.stderr)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+    return results
+
+
+def format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+def threshold_for(name, default, overrides):
+    """The last matching --threshold-for pattern wins."""
+    threshold = default
+    for pattern, value in overrides:
+        if fnmatch.fnmatch(name, pattern):
+            threshold = value
+    return threshold
+
+
+def compare(results, baseline, metric, default_threshold, overrides):
+    """Prints a comparison table; returns the names of regressed benchmarks."""
+    base = {f"{r['size']}/{r['benchmark']}": r for r in baseline.get('results', [])}
+    regressions = []
+    print(f"{'benchmark':<48} {'baseline':>10} {'current':>10} {'change':>8}  status")
+    for r in results:
+        name = f"{r['size']}/{r['benchmark']}"
+        old = base.get(name)
+        if old is None:
+            print(f"{name:<48} {'-':>10} {format_seconds(r[metric]):>10} {'':>8}  new")
+            continue
+        if old.get('params') != r['params']:
+            print(f"{name:<48} {'-':>10} {format_seconds(r[metric]):>10} {'':>8}  sizes differ, skipped")
+            continue
+        change = r[metric] / old[metric] - 1 if old[metric] else 0.0
+        threshold = threshold_for(name, default_threshold, overrides)
+        status = 'ok'
+        if change > threshold:
+            status = f"REGRESSION (> {threshold:+.0%})"
+            regressions.append(name)
+        elif change < -threshold:
+            status = 'faster'
+        print(f"{name:<48} {format_seconds(old[metric]):>10} {format_seconds(r[metric]):>10} "
+              f"{change:>+8.1%}  {status}")
+    return regressions
+
+
+def parse_override(text):
+    pattern, sep, value = text.rpartition('=')
+    if not sep or not pattern:
+        raise argparse.ArgumentTypeError(f"expected PATTERN=FRACTION, got '{text}'")
+    return pattern, float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the skill scripts on synthetic projects')
+    parser.add_argument('--sizes', default='small,medium',
+                        help=f"Comma-separated presets: {', '.join(SIZES)} (default: small,medium)")
+    for key in ('scenes', 'nodes', 'depth', 'actions', 'settings'):
+        parser.add_argument(f'--{key}', type=int, help=f'Custom size: {key} (replaces --sizes)')
+    parser.add_argument('--seed', type=int, default=0, help='Generator seed')
+    parser.add_argument('--filter', help='Only run benchmarks whose name matches this regex')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repeats per benchmark')
+    parser.add_argument('--workdir', help='Keep generated projects here and reuse them (default: temp dir)')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='Results JSON from an earlier run to compare against')
+    parser.add_argument('--metric', choices=['min', 'median'], default='min', help='Value compared to the baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed slowdown before a benchmark counts as regressed (0.2 = 20%%)')
+    parser.add_argument('--threshold-for', type=parse_override, action='append', default=[],
+                        metavar='PATTERN=FRACTION',
+                        help='Per-benchmark threshold, glob over "size/benchmark" (repeatable)')
+    parser.add_argument('--list', action='store_true', help='List benchmarks and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return
+
+    selected = [n for n in BENCHMARKS if not args.filter or re.search(args.filter, n)]
+    if not selected:
+        print(f"Error: no benchmark matches '{args.filter}'.")
+        sys.exit(1)
+
+    custom = {k: getattr(args, k) for k in ('scenes', 'nodes', 'depth', 'actions', 'settings')
+              if getattr(args, k) is not None}
+    if custom:
+        size_plan = [('custom', dict(SIZES['small'], **custom))]
+    else:
+        size_plan = []
+        for name in args.sizes.split(','):
+            if name.strip() not in SIZES:
+                print(f"Error: unknown size '{name}'. Known: {', '.join(SIZES)}")
+                sys.exit(1)
+            size_plan.append((name.strip(), SIZES[name.strip()]))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='godot-bench-')
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        results = run(size_plan, selected, args.seed, args.repeat, workdir)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'revision': git_revision(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.metric, args.threshold, args.threshold_for)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
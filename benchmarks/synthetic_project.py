@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Seeded generator for synthetic Godot 4 projects, used by run_benchmarks.py.
+
+Usage:
+  synthetic_project.py <output_dir> [--seed N] [--scenes N] [--nodes N] [--depth N]
+                       [--actions N] [--settings N]
+
+The same seed and sizes always produce byte-identical projects, so timings are
+comparable across runs and machines. Scenes reference generated scripts,
+placeholder textures, sub-resources, instanced sibling scenes and signal
+connections, like scenes saved by the editor.
+"""
+
+import argparse
+import os
+import random
+
+NODE_TYPES = [
+    'Node2D', 'Sprite2D', 'CollisionShape2D', 'Area2D', 'CharacterBody2D', 'AnimationPlayer',
+    'Timer', 'Label', 'Control', 'Marker2D', 'AudioStreamPlayer2D', 'Camera2D',
+]
+SIGNALS = ['body_entered', 'timeout', 'pressed', 'animation_finished', 'area_entered']
+SETTING_SECTIONS = ['application', 'display', 'rendering', 'physics', 'audio', 'gui', 'debug']
+TEXTURE_COUNT = 50
+KEYCODES = [65 + i for i in range(26)] + [32, 4194305, 4194309, 4194319, 4194320, 4194321, 4194322]
+
+DEFAULT_SIZES = {'scenes': 20, 'nodes': 200, 'depth': 6, 'actions': 30, 'settings': 100}
+
+
+def _key_event(keycode):
+    return (
+        f'Object(InputEventKey,"resource_local_to_scene":false,"resource_name":"",'
+        f'"device":-1,"window_id":0,"alt_pressed":false,"shift_pressed":false,'
+        f'"ctrl_pressed":false,"meta_pressed":false,"pressed":false,"keycode":0,'
+        f'"physical_keycode":{keycode},"key_label":0,"unicode":0,"location":0,'
+        f'"echo":false,"script":null)'
+    )
+
+
+def project_text(rng, actions, settings, scenes):
+    """project.godot with `settings` extra keys spread over sections and `actions` input actions."""
+    by_section = {name: [] for name in SETTING_SECTIONS}
+    for i in range(settings):
+        section = rng.choice(SETTING_SECTIONS)
+        value = rng.choice([str(rng.randint(0, 4096)), 'true', 'false', f'"value_{i}"',
+                            f'Vector2({rng.randint(0, 64)}, {rng.randint(0, 64)})'])
+        by_section[section].append(f"group_{i % 7}/setting_{i}={value}")
+
+    lines = ['; Engine configuration file.', '', 'config_version=5', '', '[application]', '',
+             'config/name="Synthetic"']
+    if scenes:
+        lines.append('run/main_scene="res://scenes/scene_0.tscn"')
+    lines.extend(by_section.pop('application'))
+    lines.extend(['', '[autoload]', '', 'Events="*res://scripts/script_0.gd"'])
+    for section, entries in by_section.items():
+        if entries:
+            lines.extend(['', f'[{section}]', ''] + entries)
+
+    lines.extend(['', '[input]', ''])
+    for i in range(actions):
+        events = ', '.join(_key_event(rng.choice(KEYCODES)) for _ in range(rng.randint(1, 3)))
+        lines.append(f'action_{i}={{\n"deadzone": 0.2,\n"events": [{events}\n]\n}}')
+    lines.extend(['', '[layer_names]', '', '2d_physics/layer_1="World"', ''])
+    return '\n'.join(lines)
+
+
+def scene_text(rng, index, nodes, depth, script_count):
+    """One .tscn with `nodes` nodes in a tree at most `depth` levels deep."""
+    ext = []
+    script_id = f"1_s{index}"
+    ext.append(f'[ext_resource type="Script" path="res://scripts/script_{rng.randrange(script_count)}.gd" id="{script_id}"]')
+    textures = []
+    for t in range(3):
+        tid = f"{t + 2}_t{index}"
+        textures.append(tid)
+        ext.append(f'[ext_resource type="Texture2D" path="res://assets/texture_{rng.randrange(TEXTURE_COUNT)}.png" id="{tid}"]')
+    instance_id = None
+    if index > 0:
+        instance_id = f"5_i{index}"
+        ext.append(f'[ext_resource type="PackedScene" path="res://scenes/scene_{rng.randrange(index)}.tscn" id="{instance_id}"]')
+
+    subs = []
+    for s in range(2):
+        subs.append(f'[sub_resource type="RectangleShape2D" id="Shape_{index}_{s}"]\n'
+                    f'size = Vector2({rng.randint(4, 64)}, {rng.randint(4, 64)})\n')
+
+    body = [f'[node name="Root" type="Node2D"]\nscript = ExtResource("{script_id}")\n']
+    paths = [('.', 0)]  # (path, depth) of nodes that can take children
+    for n in range(1, nodes):
+        parent, parent_depth = rng.choice(paths)
+        name = f"N{n}"
+        path = name if parent == '.' else f"{parent}/{name}"
+        if instance_id is not None and n % 50 == 0:
+            body.append(f'[node name="{name}" parent="{parent}" instance=ExtResource("{instance_id}")]\n')
+            continue
+        node_type = rng.choice(NODE_TYPES)
+        props = [f'position = Vector2({rng.randint(-500, 500)}, {rng.randint(-500, 500)})']
+        if node_type == 'Sprite2D':
+            props.append(f'texture = ExtResource("{rng.choice(textures)}")')
+        elif node_type == 'CollisionShape2D':
+            props.append(f'shape = SubResource("Shape_{index}_{rng.randrange(2)}")')
+        elif node_type == 'Label':
+            props.append(f'text = "Label {n} \\"quoted\\""')
+        body.append(f'[node name="{name}" type="{node_type}" parent="{parent}"]\n' + '\n'.join(props) + '\n')
+        if parent_depth + 1 < depth:
+            paths.append((path, parent_depth + 1))
+
+    connections = []
+    for c in range(max(1, nodes // 40)):
+        source = rng.choice(paths)[0]
+        connections.append(f'[connection signal="{rng.choice(SIGNALS)}" from="{source}" to="." method="_on_signal_{c}"]')
+
+    header = f'[gd_scene load_steps={len(ext) + len(subs) + 1} format=3 uid="uid://synthetic{index}"]\n'
+    parts = [header, '\n'.join(ext) + '\n', '\n'.join(subs), '\n'.join(body), '\n'.join(connections) + '\n']
+    return '\n'.join(parts)
+
+
+def script_text(rng, index):
+    lines = ['extends Node2D', '']
+    if index > 0:
+        lines.append(f'const Helper = preload("res://scripts/script_{rng.randrange(index)}.gd")')
+    lines.append(f'var scene = load("res://scenes/scene_{index}.tscn")')
+    lines.extend(['', 'func _ready() -> void:', '\tpass', ''])
+    return '\n'.join(lines)
+
+
+def generate_project(root, seed=0, scenes=None, nodes=None, depth=None, actions=None, settings=None):
+    """
+    Writes a synthetic project into `root` (created if needed). Unset sizes use
+    DEFAULT_SIZES. Returns a dict describing what was generated.
+    """
+    sizes = dict(DEFAULT_SIZES)
+    for key, value in (('scenes', scenes), ('nodes', nodes), ('depth', depth),
+                       ('actions', actions), ('settings', settings)):
+        if value is not None:
+            sizes[key] = value
+    rng = random.Random(seed)
+    script_count = max(1, sizes['scenes'])
+
+    os.makedirs(os.path.join(root, 'scenes'), exist_ok=True)
+    os.makedirs(os.path.join(root, 'scripts'), exist_ok=True)
+    os.makedirs(os.path.join(root, 'assets'), exist_ok=True)
+    with open(os.path.join(root, 'project.godot'), 'w', newline='\n') as f:
+        f.write(project_text(rng, sizes['actions'], sizes['settings'], sizes['scenes']))
+    for i in range(script_count):
+        with open(os.path.join(root, 'scripts', f'script_{i}.gd'), 'w', newline='\n') as f:
+            f.write(script_text(rng, i))
+    for i in range(TEXTURE_COUNT):
+        # Placeholder files: only their paths matter to the scripts
+        open(os.path.join(root, 'assets', f'texture_{i}.png'), 'wb').close()
+    for i in range(sizes['scenes']):
+        with open(os.path.join(root, 'scenes', f'scene_{i}.tscn'), 'w', newline='\n') as f:
+            f.write(scene_text(rng, i, sizes['nodes'], sizes['depth'], script_count))
+    return dict(sizes, seed=seed, root=root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic Godot project')
+    parser.add_argument('output', help='Directory to write the project into')
+    parser.add_argument('--seed', type=int, default=0)
+    for key, value in DEFAULT_SIZES.items():
+        parser.add_argument(f'--{key}', type=int, default=value)
+    args = parser.parse_args()
+    info = generate_project(args.output, args.seed, args.scenes, args.nodes, args.depth,
+                            args.actions, args.settings)
+    print(f"Generated {info['scenes']} scenes x {info['nodes']} nodes, {info['actions']} actions, "
+          f"{info['settings']} settings in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Regression cases for build_scene.py. Run with: python3 -m unittest discover tests"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '.gemini', 'skills', 'godot-scene-builder', 'scripts'))
+import build_scene  # noqa: E402
+
+
+class ManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def build(self, text):
+        return build_scene.build_scenes(build_scene.iter_manifest(io.StringIO(text)), jobs=4)
+
+    def test_duplicate_output_is_reported_per_entry(self):
+        summary = self.build('{"output": "a.tscn", "root": "A:Node2D"}\n'
+                             '{"output": "b.tscn", "root": "B:Node2D"}\n'
+                             '{"output": "./a.tscn", "root": "C:Node3D"}\n')
+        self.assertEqual(summary['written'], ['a.tscn', 'b.tscn'])
+        self.assertEqual(len(summary['failed']), 1)
+        output, error = summary['failed'][0]
+        self.assertEqual(output, './a.tscn')
+        self.assertIn('entry 1', error)
+        with open('a.tscn') as f:
+            self.assertIn('[node name="A" type="Node2D"]', f.read())
+
+    def test_bad_ndjson_line(self):
+        summary = self.build('{"output": "a.tscn", "root": "A:Node2D"}\n{"output": \n')
+        self.assertEqual(summary['written'], ['a.tscn'])
+        self.assertIn('line 2', summary['failed'][0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
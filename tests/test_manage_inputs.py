@@ -0,0 +1,46 @@
+"""Regression cases for manage_inputs.py. Run with: python3 -m unittest discover tests"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '.gemini', 'skills', 'godot-input-manager', 'scripts'))
+import manage_inputs  # noqa: E402
+
+
+def key(name, **modifiers):
+    event = manage_inputs.make_key_event(name)
+    for prop in modifiers:
+        event.properties[f'{prop}_pressed'] = True
+    return event
+
+
+def input_map(**actions):
+    return manage_inputs.InputMap({name: {'deadzone': 0.5, 'events': events}
+                                   for name, events in actions.items()})
+
+
+class ConflictsTest(unittest.TestCase):
+
+    def test_modifier_superset_conflicts(self):
+        bindings = input_map(save=[key('S', ctrl=True)], crouch=[key('S')])
+        self.assertEqual(bindings.conflicts(), [('Ctrl+S', ['save', 'crouch'])])
+
+    def test_disjoint_modifiers_conflict_on_their_union(self):
+        bindings = input_map(save=[key('S', ctrl=True)], select=[key('S', shift=True)])
+        self.assertEqual(bindings.conflicts(), [('Ctrl+Shift+S', ['save', 'select'])])
+
+    def test_union_of_three_modifier_sets(self):
+        bindings = input_map(a=[key('S', ctrl=True)], b=[key('S', shift=True)], c=[key('S', alt=True)])
+        self.assertEqual(bindings.conflicts(), [('Ctrl+Shift+S', ['a', 'b']), ('Ctrl+Alt+S', ['a', 'c']),
+                                                ('Shift+Alt+S', ['b', 'c']), ('Ctrl+Shift+Alt+S', ['a', 'b', 'c'])])
+
+    def test_exact_duplicates(self):
+        bindings = input_map(jump=[key('Space')], accept=[key('Space')], save=[key('Space', ctrl=True)])
+        self.assertEqual(bindings.conflicts(), [('Space', ['jump', 'accept']),
+                                                ('Ctrl+Space', ['jump', 'accept', 'save'])])
+
+
+if __name__ == '__main__':
+    unittest.main()
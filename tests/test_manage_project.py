@@ -0,0 +1,46 @@
+"""Regression cases for manage_project.py. Run with: python3 -m unittest discover tests"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '.gemini', 'skills', 'godot-project-manager', 'scripts'))
+import manage_project  # noqa: E402
+
+format_value = manage_project.format_value
+
+
+class FormatValueTest(unittest.TestCase):
+
+    def test_variant_text_is_written_as_is(self):
+        for text in ('1280', '-0.5', '"My Game"', 'Vector2i(1280, 720)', '[1, 2]', '{"a": 1}'):
+            self.assertEqual(format_value(text), text)
+
+    def test_surrounding_whitespace(self):
+        self.assertEqual(format_value(' 1280 '), '1280')
+        self.assertEqual(format_value('true '), 'true')
+
+    def test_keywords_are_written_as_is(self):
+        for word in ('true', 'false', 'null', 'inf', 'nan'):
+            self.assertEqual(format_value(word), word)
+
+    def test_plain_text_is_quoted(self):
+        self.assertEqual(format_value('My Game'), '"My Game"')
+
+    def test_raw_skips_validation(self):
+        self.assertEqual(format_value(' Foo(1 ', raw=True), 'Foo(1')
+
+    def test_json_values(self):
+        self.assertEqual(format_value(True), 'true')
+        self.assertEqual(format_value(None), 'null')
+
+    def test_raw_edit_is_replayed_raw(self):
+        doc = manage_project.ProjectDocument('config_version=5\n')
+        doc.set('application/run/low_processor_mode', 'true', raw=True)
+        replayed = manage_project.ProjectDocument(doc._replay('config_version=5\n'))
+        self.assertEqual(replayed.get_raw('application/run/low_processor_mode'), 'true')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Regression cases for parse_cache.py. Run with: python3 -m unittest discover tests"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '.gemini', 'skills', 'godot-scene-inspector', 'scripts'))
+import parse_cache  # noqa: E402
+
+
+class ParseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'a.tscn')
+        self.write('one')
+        self.cache = parse_cache.ParseCache(os.path.join(self.tmp.name, 'cache.sqlite'))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def write(self, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_hit(self):
+        self.assertEqual(parse_cache.cached_parse(self.path, self.read, self.cache), 'one')
+        calls = []
+        self.assertEqual(parse_cache.cached_parse(self.path, calls.append, self.cache), 'one')
+        self.assertEqual(calls, [])
+
+    def test_rewrite_during_parse_is_not_cached_as_current(self):
+        def parse(path):
+            text = self.read(path)
+            self.write('two')
+            os.utime(path, ns=(1, 1))
+            return text
+
+        self.assertEqual(parse_cache.cached_parse(self.path, parse, self.cache), 'one')
+        self.assertEqual(parse_cache.cached_parse(self.path, self.read, self.cache), 'two')
+
+    def test_hit_does_not_write(self):
+        parse_cache.cached_parse(self.path, self.read, self.cache)
+        changes = self.cache.conn.total_changes
+        parse_cache.cached_parse(self.path, self.read, self.cache)
+        self.assertEqual(self.cache.conn.total_changes, changes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Concurrent project.godot edits through project_io.py. Run with: python3 -m unittest discover tests
+
+Several processes edit one project.godot at once through the real code paths
+(manage_project.py settings, manage_inputs.py actions and setup_layers.py layer
+names). Half of the settings go to a section shared by all workers (replayed on
+conflict) and half to a per-worker section (merged). Every edit must survive.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+SKILLS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.gemini', 'skills')
+sys.path.insert(0, os.path.join(SKILLS_DIR, 'godot-project-manager', 'scripts'))
+sys.path.insert(0, os.path.join(SKILLS_DIR, 'godot-input-manager', 'scripts'))
+sys.path.insert(0, os.path.join(SKILLS_DIR, 'godot-physics-setup', 'scripts'))
+from manage_project import ProjectDocument  # noqa: E402
+from manage_inputs import InputMapTransaction, make_key_event  # noqa: E402
+from setup_layers import LAYER_NAMES_2D, setup_layers  # noqa: E402
+
+WORKERS = 4
+EDITS = 5
+
+INITIAL_PROJECT = """; Engine configuration file.
+
+config_version=5
+
+[application]
+
+config/name="Stress"
+
+[input]
+
+"""
+
+
+def worker(args):
+    """Applies `edits` rounds of settings and input actions for one worker."""
+    project_file, index, edits, start_at = args
+    time.sleep(max(0.0, start_at - time.time()))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for j in range(edits):
+            doc = ProjectDocument.load(project_file)
+            doc.set(f"stress/shared/w{index}_{j}", j)
+            doc.set(f"stress_{index}/value_{j}", f"w{index}")
+            doc.save(project_file)
+
+            txn = InputMapTransaction(project_file)
+            txn.set_action(f"stress_w{index}_{j}", [make_key_event('A')])
+            txn.commit()
+
+            if j == 0 and index % 2 == 0:
+                setup_layers(project_file, '2d')
+    return index
+
+
+class ConcurrentEditsTest(unittest.TestCase):
+
+    def test_no_edit_is_lost(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            project_file = os.path.join(tmp, 'project.godot')
+            with open(project_file, 'w') as f:
+                f.write(INITIAL_PROJECT)
+            start_at = time.time() + 0.3  # line the workers up so their edits really overlap
+            with multiprocessing.Pool(WORKERS) as pool:
+                pool.map(worker, [(project_file, i, EDITS, start_at) for i in range(WORKERS)])
+
+            doc = ProjectDocument.load(project_file)
+            txn = InputMapTransaction(project_file)
+            missing = []
+            for index in range(WORKERS):
+                for j in range(EDITS):
+                    if doc.get(f"stress/shared/w{index}_{j}") != str(j):
+                        missing.append(f"stress/shared/w{index}_{j}")
+                    if doc.get(f"stress_{index}/value_{j}") != f"w{index}":
+                        missing.append(f"stress_{index}/value_{j}")
+                    if f"stress_w{index}_{j}" not in txn:
+                        missing.append(f"input/stress_w{index}_{j}")
+            for key, name in LAYER_NAMES_2D.items():
+                if doc.get(f"layer_names/{key}") != name:
+                    missing.append(f"layer_names/{key}")
+            if doc.get("application/config/name") != "Stress":
+                missing.append("application/config/name")
+            self.assertEqual(missing, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Regression cases for resource_graph.py. Run with: python3 -m unittest discover tests"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '.gemini', 'skills', 'godot-scene-inspector', 'scripts'))
+import resource_graph  # noqa: E402
+
+
+class UidReferenceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.write('project.godot', 'config_version=5\n')
+        self.write('x.gd', 'extends Node\n')
+        self.write('x.gd.uid', 'uid://b1x2\n')
+        self.write('a.gd', 'extends Node\nconst X = preload("uid://b1x2")\nconst Y = preload("uid://nope")\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        with open(os.path.join(self.tmp.name, name), 'w') as f:
+            f.write(text)
+
+    def test_uid_resolves_to_res_path(self):
+        graph = resource_graph.ResourceGraph(self.tmp.name)
+        graph.refresh(jobs=1)
+        self.assertEqual(graph.rdeps('res://x.gd'), ['res://a.gd'])
+        self.assertEqual(graph.deps('res://a.gd'), ['res://x.gd', 'uid://nope'])
+
+    def test_unknown_uid_is_retried_on_refresh(self):
+        graph = resource_graph.ResourceGraph(self.tmp.name)
+        graph.refresh(jobs=1)
+        self.write('a.gd.uid', 'uid://nope\n')
+        graph.refresh(jobs=1)
+        self.assertEqual(graph.deps('res://a.gd'), ['res://x.gd', 'res://a.gd'])
+
+
+if __name__ == '__main__':
+    unittest.main()
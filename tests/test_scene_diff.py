@@ -0,0 +1,69 @@
+"""Regression cases for scene_diff.py. Run with: python3 -m unittest discover tests"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '.gemini', 'skills', 'godot-scene-inspector', 'scripts'))
+import scene_diff  # noqa: E402
+
+BASE = '''[gd_scene load_steps=2 format=3]
+
+[ext_resource type="PackedScene" path="res://enemy.tscn" id="1"]
+
+[node name="Level" type="Node2D"]
+
+[node name="Guard" type="Node2D" parent="."{groups}]
+
+[node name="B1" parent="." instance=ExtResource("1")]
+
+[node name="Sprite" parent="B1/Body"]
+modulate = Color(1, 1, 1, {alpha})
+{extra}'''
+
+
+def scene(alpha=1, groups='', extra=''):
+    return BASE.format(alpha=alpha, groups=groups, extra=extra)
+
+
+class SceneDiffTest(unittest.TestCase):
+
+    def diff(self, old, new):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name, text in (('old.tscn', old), ('new.tscn', new)):
+                path = os.path.join(tmp, name)
+                with open(path, 'w') as f:
+                    f.write(text)
+                paths.append(path)
+            return scene_diff.diff_scenes(*paths)
+
+    def test_unchanged_overrides(self):
+        self.assertEqual(self.diff(scene(), scene()), ([], []))
+
+    def test_override_inside_instance(self):
+        changes, warnings = self.diff(scene(), scene(alpha=0.5))
+        self.assertEqual(warnings, [])
+        self.assertEqual(changes, [{'change': 'property', 'path': 'B1/Body/Sprite', 'key': 'modulate',
+                                    'old': 'Color(1, 1, 1, 1)', 'new': 'Color(1, 1, 1, 0.5)'}])
+
+    def test_groups(self):
+        changes, _ = self.diff(scene(), scene(groups=' groups=["enemies"]'))
+        self.assertEqual(changes, [{'change': 'groups', 'path': 'Guard', 'old': None, 'new': '["enemies"]'}])
+
+    def test_child_added_under_instance(self):
+        extra = '\n[node name="Light" type="PointLight2D" parent="B1/Body"]\n'
+        changes, warnings = self.diff(scene(), scene(extra=extra))
+        self.assertEqual(warnings, [])
+        self.assertEqual(changes, [{'change': 'added', 'path': 'B1/Body/Light', 'type': 'PointLight2D', 'nodes': 1}])
+
+    def test_unresolved_parent_outside_instances(self):
+        extra = '\n[node name="Lost" type="Node" parent="Guard/Missing"]\n'
+        _, warnings = self.diff(scene(), scene(extra=extra))
+        self.assertEqual(len(warnings), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Regression cases for skill_server.py. Run with: python3 -m unittest discover tests"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '.gemini', 'skills', 'godot-skill-server', 'scripts'))
+import skill_server  # noqa: E402
+
+
+class DispatchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.host = skill_server.SkillHost()
+
+    def test_unknown_param_is_invalid_params(self):
+        with self.assertRaises(skill_server.RpcError) as ctx:
+            self.host.dispatch('scene.parse', {'file': 'a.tscn'})
+        self.assertEqual(ctx.exception.code, skill_server.INVALID_PARAMS)
+
+    def test_missing_param_is_invalid_params(self):
+        with self.assertRaises(skill_server.RpcError) as ctx:
+            self.host.dispatch('project.resolve', {})
+        self.assertEqual(ctx.exception.code, skill_server.INVALID_PARAMS)
+
+    def test_type_error_inside_handler_is_not_invalid_params(self):
+        def broken():
+            return len(None)
+
+        self.host.methods['test.broken'] = broken
+        try:
+            with self.assertRaises(TypeError):
+                self.host.dispatch('test.broken', {})
+        finally:
+            del self.host.methods['test.broken']
+
+
+class RunTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.host = skill_server.SkillHost()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.project = os.path.join(self.tmp.name, 'project.godot')
+        with open(self.project, 'w') as f:
+            f.write('config_version=5\n\n[application]\n\nconfig/name="Demo"\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def manage_project(self, *argv):
+        return self.host.dispatch('run', {'script': 'manage_project', 'cwd': self.tmp.name, 'argv': list(argv)})
+
+    def test_reads_share_the_warm_document(self):
+        self.assertEqual(self.manage_project('get', 'application/config/name')['stdout'], 'Demo\n')
+        hits, misses = self.host.projects.hits, self.host.projects.misses
+        self.assertEqual(self.manage_project('get', 'application/config/name')['stdout'], 'Demo\n')
+        self.assertEqual((self.host.projects.hits, self.host.projects.misses), (hits + 1, misses))
+
+    def test_reads_see_writes(self):
+        self.manage_project('get', 'application/config/name')
+        self.assertEqual(self.manage_project('set', 'application/config/name', 'Other')['exit_code'], 0)
+        self.assertEqual(self.manage_project('get', 'application/config/name')['stdout'], 'Other\n')
+
+
+if __name__ == '__main__':
+    unittest.main()